@@ -0,0 +1,84 @@
+"""
+Per-request cost of JWT authentication and role checks.
+
+Sends requests straight to the ASGI callable of an app with an unauthenticated endpoint,
+one behind JwtClientDep and one behind AdminJwtClientDep, and reports the overhead
+of each dependency over the open endpoint, with the verified-token cache on and off.
+
+Run: python -m benchmarks.auth_overhead [requests]
+"""
+import asyncio
+import logging
+import sys
+import time
+
+from fastapi import FastAPI
+from jose import jwt
+
+from src.core.cache import TTLCache
+from src.core.config.settings import settings
+from src.core.dependencies import AdminJwtClientDep, JwtClientDep
+from src.core.dependencies import jwt as jwt_module
+
+
+def build_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/open")
+    async def open_endpoint():
+        return {"status": "ok"}
+
+    @app.get("/client")
+    async def client_endpoint(jwt_client: JwtClientDep):
+        return {"status": "ok"}
+
+    @app.get("/admin")
+    async def admin_endpoint(jwt_client: AdminJwtClientDep):
+        return {"status": "ok"}
+
+    return app
+
+
+async def run(app: FastAPI, path: str, token: str, requests: int) -> float:
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": path, "raw_path": path.encode(), "root_path": "", "query_string": b"",
+        "headers": [(b"host", b"bench"), (b"authorization", f"Bearer {token}".encode())],
+        "client": ("127.0.0.1", 1234), "server": ("bench", 80),
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.start" and message["status"] != 200:
+            raise RuntimeError(f"{path} returned {message['status']}")
+
+    for _ in range(200):
+        await app(dict(scope), receive, send)
+
+    started = time.perf_counter()
+    for _ in range(requests):
+        await app(dict(scope), receive, send)
+    return (time.perf_counter() - started) / requests * 1_000_000
+
+
+async def main(requests: int) -> None:
+    logging.disable(logging.CRITICAL)
+    token = jwt.encode(
+        {"sub": "bench-client", "roles": ["base", "admin"], "exp": int(time.time()) + 3600},
+        settings.jwt_secret_key,
+        algorithm=settings.jwt_algorithm
+    )
+    app = build_app()
+
+    print(f"{'token cache':<12} {'endpoint':<8} {'us/request':>11} {'auth us':>8}")
+    for cache in ("off", "on"):
+        jwt_module._token_cache = TTLCache("jwt-bench", 1000, 300) if cache == "on" else None
+        results = {path: await run(app, path, token, requests) for path in ("/open", "/client", "/admin")}
+        for path, per_request in results.items():
+            print(f"{cache:<12} {path:<8} {per_request:>11.1f} {per_request - results['/open']:>8.1f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000))
@@ -0,0 +1,69 @@
+"""
+Bytes saved against CPU spent by response compression.
+
+Compresses JSON list payloads shaped like ``GET /api/users/`` responses at several
+gzip levels, and an NDJSON stream flushed per chunk as CompressionMiddleware does
+for streaming responses. CPU time is process time, so it is what the worker pays.
+
+Run: python -m benchmarks.compression [repeats]
+"""
+import json
+import sys
+import time
+import zlib
+from datetime import datetime, timezone
+
+LEVELS = (1, 4, 6, 9)
+SIZES = (10, 100, 1000, 10000)
+
+
+def users(count: int) -> list:
+    now = datetime.now(timezone.utc).isoformat()
+    return [
+        {"id": i, "email": f"user{i}@example.com", "is_active": i % 7 != 0, "created_at": now, "updated_at": now}
+        for i in range(count)
+    ]
+
+
+def gzip_body(body: bytes, level: int) -> bytes:
+    compressor = zlib.compressobj(level, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+    return compressor.compress(body) + compressor.flush()
+
+
+def gzip_stream(chunks: list, level: int) -> bytes:
+    compressor = zlib.compressobj(level, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+    out = [compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH) for chunk in chunks]
+    out.append(compressor.flush())
+    return b"".join(out)
+
+
+def measure(func, repeats: int):
+    result = func()
+    started = time.process_time()
+    for _ in range(repeats):
+        func()
+    return result, (time.process_time() - started) / repeats * 1_000_000
+
+
+def main(repeats: int) -> None:
+    print(f"{'payload':<16} {'level':>5} {'raw B':>10} {'gzip B':>10} {'saved':>7} {'cpu us':>10} {'MB/s':>8}")
+    for count in SIZES:
+        body = json.dumps(users(count)).encode()
+        for level in LEVELS:
+            compressed, cpu_us = measure(lambda: gzip_body(body, level), max(1, repeats // count))
+            print(f"{f'{count} users':<16} {level:>5} {len(body):>10} {len(compressed):>10} "
+                  f"{1 - len(compressed) / len(body):>6.1%} {cpu_us:>10.1f} {len(body) / cpu_us:>8.1f}")
+
+    print()
+    print("NDJSON stream of 1000 users, sync flush per chunk (level 6)")
+    print(f"{'lines/chunk':<16} {'raw B':>10} {'gzip B':>10} {'saved':>7} {'cpu us':>10}")
+    lines = [json.dumps(user).encode() + b"\n" for user in users(1000)]
+    for per_chunk in (1, 10, 100, 1000):
+        chunks = [b"".join(lines[i:i + per_chunk]) for i in range(0, len(lines), per_chunk)]
+        raw = sum(len(chunk) for chunk in chunks)
+        compressed, cpu_us = measure(lambda: gzip_stream(chunks, 6), max(1, repeats // 1000))
+        print(f"{per_chunk:<16} {raw:>10} {len(compressed):>10} {1 - len(compressed) / raw:>6.1%} {cpu_us:>10.1f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
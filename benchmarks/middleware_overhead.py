@@ -0,0 +1,115 @@
+"""
+Per-request overhead of the middleware stack.
+
+Compares the bare application against the same request-id/metrics/db hooks driven by
+Starlette's BaseHTTPMiddleware (the previous implementation), the pure-ASGI layers
+and the fused single layer. Requests are sent straight to the ASGI callable so that
+no HTTP client cost is included.
+
+Run: python -m benchmarks.middleware_overhead [requests]
+"""
+import asyncio
+import logging
+import sys
+import time
+
+from fastapi import FastAPI
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+
+from src.core.middleware import (
+    ASGIMiddleware,
+    FusedMiddleware,
+    MetricsMiddleware,
+    RequestIdMiddleware,
+    SQLAlchemyDbMiddleware
+)
+
+STACK = [RequestIdMiddleware, MetricsMiddleware, SQLAlchemyDbMiddleware]
+
+
+def legacy(middleware_class):
+    """Wrap the hooks of a middleware in BaseHTTPMiddleware, as the stack was built before"""
+
+    class LegacyMiddleware(BaseHTTPMiddleware):
+        def __init__(self, app):
+            super().__init__(app)
+            self.stage = middleware_class(app)
+
+        async def dispatch(self, request: Request, call_next):
+            ctx = {"scope": request.scope, "state": request.scope.setdefault("state", {}),
+                   "status_code": None, "error": None}
+            await self.stage.on_request(request.scope, ctx)
+            try:
+                response = await call_next(request)
+                ctx["status_code"] = response.status_code
+                message = {"type": "http.response.start", "status": response.status_code,
+                           "headers": response.raw_headers}
+                await self.stage.on_response_start(message, ctx)
+                return response
+            except Exception as e:
+                ctx["error"] = e
+                await self.stage.on_error(e, ctx)
+                raise
+            finally:
+                await self.stage.on_complete(ctx)
+
+    LegacyMiddleware.__name__ = f"Legacy{middleware_class.__name__}"
+    return LegacyMiddleware
+
+
+def build_app(mode: str) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping():
+        return {"status": "ok"}
+
+    if mode == "base_http":
+        for middleware_class in reversed(STACK):
+            app.add_middleware(legacy(middleware_class))
+    elif mode == "asgi":
+        for middleware_class in reversed(STACK):
+            app.add_middleware(middleware_class)
+    elif mode == "fused":
+        app.add_middleware(FusedMiddleware, middleware_classes=STACK)
+    return app
+
+
+async def run(app: FastAPI, requests: int) -> float:
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": "/ping", "raw_path": b"/ping", "root_path": "", "query_string": b"",
+        "headers": [(b"host", b"bench")], "client": ("127.0.0.1", 1234), "server": ("bench", 80),
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    # Warm up
+    for _ in range(200):
+        await app(dict(scope), receive, send)
+
+    started = time.perf_counter()
+    for _ in range(requests):
+        await app(dict(scope), receive, send)
+    return (time.perf_counter() - started) / requests * 1_000_000
+
+
+async def main(requests: int) -> None:
+    logging.disable(logging.CRITICAL)
+    results = {}
+    for mode in ("bare", "base_http", "asgi", "fused"):
+        results[mode] = await run(build_app(mode), requests)
+
+    bare = results["bare"]
+    print(f"{'mode':<10} {'us/request':>11} {'overhead us':>12}")
+    for mode, per_request in results.items():
+        print(f"{mode:<10} {per_request:>11.1f} {per_request - bare:>12.1f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000))
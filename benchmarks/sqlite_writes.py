@@ -0,0 +1,73 @@
+"""
+Concurrent write transactions on SQLite, default settings against the SQLite profile.
+
+Writers run read-then-insert transactions (the shape of a create with a uniqueness check)
+through SQLAlchemyDbManager.get_db_provider while readers count rows through
+get_read_db_provider. Reports committed and failed ("database is locked") transactions
+and throughput for each mode on a temporary database file.
+
+Run: python -m benchmarks.sqlite_writes [writers] [readers]
+"""
+import asyncio
+import logging
+import os
+import sys
+import tempfile
+import time
+
+from sqlalchemy import insert, select, text
+from sqlalchemy.exc import OperationalError
+
+from src.domains.user.models import Base, User
+from src.infrastructure.database.managers import SQLAlchemyDbManager
+
+
+async def run(tuned: bool, writers: int, readers: int):
+    with tempfile.TemporaryDirectory() as directory:
+        db_manager = SQLAlchemyDbManager(
+            database_uri=f"sqlite+aiosqlite:///{os.path.join(directory, 'bench.db')}",
+            sqlite_tuning_enabled=tuned,
+            db_pool_size=10,
+            db_max_overflow=20
+        )
+        await db_manager.connect()
+        async with db_manager.engine.begin() as connection:
+            await connection.run_sync(Base.metadata.create_all)
+
+        failed = 0
+
+        async def write(i: int) -> None:
+            nonlocal failed
+            try:
+                async with db_manager.get_db_provider() as session:
+                    email = f"user{i}@example.com"
+                    await session.execute(select(User.id).where(User.email == email))
+                    await session.execute(insert(User).values(email=email, name=f"User {i}"))
+                    await session.commit()
+            except OperationalError:
+                failed += 1
+
+        async def read() -> None:
+            async with db_manager.get_read_db_provider() as session:
+                await session.execute(text("SELECT count(*) FROM user"))
+
+        started = time.perf_counter()
+        await asyncio.gather(*(write(i) for i in range(writers)), *(read() for _ in range(readers)))
+        elapsed = time.perf_counter() - started
+        await db_manager.disconnect()
+        return writers - failed, failed, elapsed
+
+
+async def main(writers: int, readers: int) -> None:
+    logging.disable(logging.CRITICAL)
+    print(f"{'mode':<8} {'committed':>9} {'failed':>7} {'seconds':>8} {'commits/s':>10}")
+    for name, tuned in (("default", False), ("tuned", True)):
+        committed, failed, elapsed = await run(tuned, writers, readers)
+        print(f"{name:<8} {committed:>9} {failed:>7} {elapsed:>8.2f} {committed / elapsed:>10.0f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 500,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 500
+    ))
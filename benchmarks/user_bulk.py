@@ -0,0 +1,71 @@
+"""
+Bulk user import against one create per transaction.
+
+The bulk path is what POST /users/bulk runs per chunk: batched validation, one existence
+lookup, a multi-row insert and a commit. The single path creates each user through
+UserService.create_user and commits it, as repeated POST /users/ calls would.
+Both import the same NDJSON records into a temporary SQLite file.
+
+Run: python -m benchmarks.user_bulk [records] [chunk_size]
+"""
+import asyncio
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from src.domains.user.models import Base
+from src.domains.user.repository import UserRepositorySQLAlchemy
+from src.domains.user.schemas import UserCreate
+from src.domains.user.service import UserService
+
+
+def records(count: int, prefix: str):
+    for i in range(count):
+        yield json.dumps({"email": f"{prefix}{i}@example.com", "name": f"User {i}"}).encode()
+
+
+async def bulk(session_factory: async_sessionmaker, count: int, chunk_size: int) -> None:
+    async def source():
+        for record in records(count, "bulk"):
+            yield record
+
+    async with session_factory() as session:
+        service = UserService(UserRepositorySQLAlchemy(session))
+        async for _ in service.bulk_upsert_users(source(), chunk_size=chunk_size):
+            pass
+
+
+async def single(session_factory: async_sessionmaker, count: int, chunk_size: int) -> None:
+    for record in records(count, "single"):
+        async with session_factory() as session:
+            await UserService(UserRepositorySQLAlchemy(session)).create_user(UserCreate.model_validate_json(record))
+            await session.commit()
+
+
+async def main(count: int, chunk_size: int) -> None:
+    logging.disable(logging.CRITICAL)
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{os.path.join(directory, 'bench.db')}")
+        async with engine.begin() as connection:
+            await connection.run_sync(Base.metadata.create_all)
+        session_factory = async_sessionmaker(engine, expire_on_commit=False)
+
+        print(f"{'path':<7} {'seconds':>8} {'rows/s':>8}")
+        for name, run in (("bulk", bulk), ("single", single)):
+            started = time.perf_counter()
+            await run(session_factory, count, chunk_size)
+            elapsed = time.perf_counter() - started
+            print(f"{name:<7} {elapsed:>8.2f} {count / elapsed:>8.0f}")
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 5000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    ))
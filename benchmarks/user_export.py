@@ -0,0 +1,80 @@
+"""
+Peak memory of the user export against table size.
+
+The streaming path is what GET /users/export runs: server-side cursor partitions encoded
+to NDJSON chunk by chunk. The buffered path loads every row first and encodes the whole
+body at once, as a get_all based export would. Peak allocations are measured with
+tracemalloc while the chunks are consumed and dropped, as the ASGI server would.
+
+Run: python -m benchmarks.user_export [rows ...]
+"""
+import asyncio
+import logging
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from src.domains.user.export import ndjson_chunks
+from src.domains.user.models import Base, User
+from src.domains.user.repository import UserRepositorySQLAlchemy
+
+BATCH_SIZE = 1000
+
+
+async def streamed(session_factory: async_sessionmaker) -> int:
+    async with session_factory() as session:
+        size = 0
+        async for chunk in ndjson_chunks(UserRepositorySQLAlchemy(session).stream_all(BATCH_SIZE)):
+            size += len(chunk)
+        return size
+
+
+async def buffered(session_factory: async_sessionmaker) -> int:
+    async with session_factory() as session:
+        repository = UserRepositorySQLAlchemy(session)
+        rows = await repository.get_all(limit=await repository.count())
+
+        async def single_partition():
+            yield rows
+
+        return sum([len(chunk) async for chunk in ndjson_chunks(single_partition())])
+
+
+async def measure(export, session_factory: async_sessionmaker):
+    tracemalloc.start()
+    started = time.perf_counter()
+    size = await export(session_factory)
+    elapsed = time.perf_counter() - started
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return size, elapsed, peak
+
+
+async def main(sizes) -> None:
+    logging.disable(logging.CRITICAL)
+    print(f"{'rows':>8} {'path':<9} {'body MB':>8} {'peak MB':>8} {'seconds':>8}")
+    for rows in sizes:
+        with tempfile.TemporaryDirectory() as directory:
+            engine = create_async_engine(f"sqlite+aiosqlite:///{os.path.join(directory, 'bench.db')}")
+            async with engine.begin() as connection:
+                await connection.run_sync(Base.metadata.create_all)
+                for start in range(0, rows, 10000):
+                    await connection.execute(insert(User), [
+                        {"email": f"user{i}@example.com", "name": f"User {i}"}
+                        for i in range(start, min(start + 10000, rows))
+                    ])
+            session_factory = async_sessionmaker(engine, expire_on_commit=False)
+
+            for name, export in (("streamed", streamed), ("buffered", buffered)):
+                size, elapsed, peak = await measure(export, session_factory)
+                print(f"{rows:>8} {name:<9} {size / 1e6:>8.1f} {peak / 1e6:>8.1f} {elapsed:>8.2f}")
+            await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main([int(arg) for arg in sys.argv[1:]] or [10000, 100000]))
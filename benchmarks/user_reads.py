@@ -0,0 +1,80 @@
+"""
+ORM versus Core read path for GET /users/{user_id}.
+
+Each lookup does what the request does after routing: open a session, fetch the user,
+validate it into UserResponse, serialize it to JSON and close the session.
+The ORM path uses session.get (identity map, full instance, from_attributes validation),
+the Core path the prebuilt column select returning a Row. Lookups run in concurrent
+batches against a temporary SQLite file.
+
+Run: python -m benchmarks.user_reads [lookups] [concurrency]
+"""
+import asyncio
+import logging
+import os
+import sys
+import tempfile
+import time
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from src.domains.user.models import Base, User
+from src.domains.user.repository import UserRepositorySQLAlchemy
+from src.domains.user.schemas import UserResponse
+
+USERS = 1000
+
+
+async def orm_lookup(session_factory: async_sessionmaker, user_id: int) -> bytes:
+    async with session_factory() as session:
+        user = await UserRepositorySQLAlchemy(session).get_by_id(user_id)
+        return UserResponse.model_validate(user).model_dump_json().encode()
+
+
+async def core_lookup(session_factory: async_sessionmaker, user_id: int) -> bytes:
+    async with session_factory() as session:
+        row = await UserRepositorySQLAlchemy(session).get_row_by_id(user_id)
+        return UserResponse.model_validate(row).model_dump_json().encode()
+
+
+async def run(lookup, session_factory: async_sessionmaker, lookups: int, concurrency: int) -> float:
+    for user_id in range(1, 201):
+        await lookup(session_factory, user_id)
+
+    started = time.perf_counter()
+    for batch_start in range(0, lookups, concurrency):
+        await asyncio.gather(*(
+            lookup(session_factory, (batch_start + i) % USERS + 1) for i in range(concurrency)
+        ))
+    return (time.perf_counter() - started) / lookups * 1_000_000
+
+
+async def main(lookups: int, concurrency: int) -> None:
+    logging.disable(logging.CRITICAL)
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{os.path.join(directory, 'bench.db')}")
+        async with engine.begin() as connection:
+            await connection.run_sync(Base.metadata.create_all)
+            await connection.execute(insert(User), [
+                {"email": f"user{i}@example.com", "name": f"User {i}"} for i in range(USERS)
+            ])
+        session_factory = async_sessionmaker(engine, expire_on_commit=False)
+
+        results = {
+            "orm": await run(orm_lookup, session_factory, lookups, concurrency),
+            "core": await run(core_lookup, session_factory, lookups, concurrency),
+        }
+        await engine.dispose()
+
+    print(f"{'path':<6} {'us/lookup':>10} {'lookups/s':>10}")
+    for path, per_lookup in results.items():
+        print(f"{path:<6} {per_lookup:>10.1f} {1_000_000 / per_lookup:>10.0f}")
+    print(f"core saves {1 - results['core'] / results['orm']:.0%} per lookup")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 5000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    ))
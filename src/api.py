@@ -2,8 +2,10 @@ from fastapi import APIRouter
 
 from src.domains.user import user_router
 from src.domains.distance import distance_router
+from src.core.profiling import profiling_router
+from src.core.routing import TimedAPIRoute
 
-api_router = APIRouter()
+api_router = APIRouter(route_class=TimedAPIRoute)
 
 
 api_router.include_router(
@@ -20,6 +22,12 @@ api_router.include_router(
     tags=["distance"]
 )
 
+api_router.include_router(
+    profiling_router,
+    prefix="/admin",
+    tags=["admin"]
+)
+
 @api_router.get("/healthcheck", include_in_schema=False)
 def healthcheck():
     """Simple healthcheck endpoint."""
@@ -28,15 +36,15 @@ def healthcheck():
 
 from src.core.dependencies import JwtClient, JwtClientDep, AdminJwtClientDep
 @api_router.get("/jwt-client", response_model=JwtClient)
-def jwt_client(jwt_client: JwtClientDep):
+async def jwt_client(jwt_client: JwtClientDep):
     """Simple jwt endpoint."""
-    return jwt_client
+    return jwt_client.to_jwt_client()
 
 
 @api_router.get("/admin-client", response_model=JwtClient)
-def admin_client(jwt_client: AdminJwtClientDep):
+async def admin_client(jwt_client: AdminJwtClientDep):
     """Simple jwt endpoint."""
-    return jwt_client
+    return jwt_client.to_jwt_client()
 
 
 import asyncio
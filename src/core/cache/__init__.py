@@ -0,0 +1,12 @@
+from src.core.cache.backends import CacheBackend, CacheBackendFactory, InMemoryCacheBackend
+from src.core.cache.counter import CachedCount
+from src.core.cache.ttl_cache import TTLCache
+
+
+__all__ = [
+    "CacheBackend",
+    "CacheBackendFactory",
+    "InMemoryCacheBackend",
+    "CachedCount",
+    "TTLCache"
+]
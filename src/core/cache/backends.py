@@ -0,0 +1,72 @@
+import sys
+from abc import ABC, abstractmethod
+from typing import Any, Hashable, Optional
+import logging
+
+from src.core.cache.ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+
+def estimate_size(value: Any) -> int:
+    """Shallow size of a value plus its items, for tuples and rows of scalars"""
+    size = sys.getsizeof(value)
+    if isinstance(value, tuple):
+        size += sum(sys.getsizeof(item) for item in value)
+    return size
+
+
+class CacheBackend(ABC):
+    """Storage behind a read-through cache, async so shared (networked) caches fit the same interface"""
+    name: str
+
+    @abstractmethod
+    async def get(self, key: Hashable, count: bool = True) -> Optional[Any]:
+        """Cached value or None, hits and misses are not counted with ``count=False``"""
+        pass
+
+    @abstractmethod
+    async def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        pass
+
+    @abstractmethod
+    async def delete(self, key: Hashable) -> None:
+        pass
+
+
+class InMemoryCacheBackend(CacheBackend):
+    """Per-process LRU with TTL, bounded by entry count and estimated memory"""
+
+    def __init__(self, name: str, max_size: int, max_bytes: Optional[int], ttl: float):
+        self.name = name
+        self.cache: TTLCache[Hashable, Any] = TTLCache(
+            name, max_size=max_size, ttl=ttl, max_bytes=max_bytes, sizeof=estimate_size
+        )
+
+    async def get(self, key: Hashable, count: bool = True) -> Optional[Any]:
+        return self.cache.get(key, count=count)
+
+    async def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        self.cache.set(key, value, ttl=ttl)
+
+    async def delete(self, key: Hashable) -> None:
+        self.cache.delete(key)
+
+
+class CacheBackendFactory:
+    _backends = {
+        "memory": lambda name, **config: InMemoryCacheBackend(
+            name,
+            max_size=config.get("max_size", 10000),
+            max_bytes=config.get("max_bytes"),
+            ttl=config.get("ttl", 60.0)
+        )
+    }
+
+    @classmethod
+    def create_backend(cls, backend_type: str, name: str, **config) -> CacheBackend:
+        if backend_type not in cls._backends:
+            available = ", ".join(cls._backends.keys())
+            raise ValueError(f"Unknown cache backend: {backend_type}. Available: {available}")
+        logger.info(f"Creating {backend_type} cache backend: {name}")
+        return cls._backends[backend_type](name, **config)
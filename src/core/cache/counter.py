@@ -0,0 +1,47 @@
+import time
+from typing import Awaitable, Callable, Optional
+import logging
+
+from src.core.cache.ttl_cache import cache_hits_total, cache_misses_total
+
+logger = logging.getLogger(__name__)
+
+
+class CachedCount:
+    """
+    In-process total kept between exact reloads.
+    ``get`` runs the loader at most once per ``ttl`` seconds; while a reload is in flight other
+    callers get the previous value. ``adjust`` applies known inserts and deletes in between,
+    changes made by other processes show up at the next reload.
+    """
+
+    def __init__(self, name: str, ttl: float, clock: Callable[[], float] = time.monotonic):
+        self.name = name
+        self.ttl = ttl
+        self._clock = clock
+        self._value: Optional[int] = None
+        self._expires_at = 0.0
+        self._loading = False
+
+    async def get(self, loader: Callable[[], Awaitable[int]]) -> int:
+        value = self._value
+        if value is not None and (self._loading or self._clock() < self._expires_at):
+            cache_hits_total.inc(self.name)
+            return value
+
+        cache_misses_total.inc(self.name)
+        self._loading = True
+        try:
+            value = await loader()
+        finally:
+            self._loading = False
+        self._value = value
+        self._expires_at = self._clock() + self.ttl
+        return value
+
+    def adjust(self, delta: int) -> None:
+        if self._value is not None:
+            self._value = max(0, self._value + delta)
+
+    def invalidate(self) -> None:
+        self._value = None
@@ -0,0 +1,124 @@
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Generic, Hashable, Optional, Tuple, TypeVar
+import logging
+
+from src.core.metrics.registry import metrics_registry
+
+logger = logging.getLogger(__name__)
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+cache_hits_total = metrics_registry.counter(
+    "cache_hits_total",
+    "In-process cache lookups served from the cache",
+    ("cache",)
+)
+cache_misses_total = metrics_registry.counter(
+    "cache_misses_total",
+    "In-process cache lookups not found or expired",
+    ("cache",)
+)
+cache_evictions_total = metrics_registry.counter(
+    "cache_evictions_total",
+    "In-process cache entries evicted to stay within the size bound",
+    ("cache",)
+)
+cache_bytes = metrics_registry.gauge(
+    "cache_bytes",
+    "Estimated memory held by in-process cache entries with a memory budget",
+    ("cache",)
+)
+
+
+class TTLCache(Generic[K, V]):
+    """
+    Bounded in-process LRU cache with per-entry expiry.
+    Entries expire after ``ttl`` seconds or the TTL given to ``set``, whichever is shorter;
+    the least recently used entry is evicted when ``max_size`` entries or, when given,
+    ``max_bytes`` as estimated by ``sizeof`` are exceeded.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_size: int,
+        ttl: float,
+        clock: Callable[[], float] = time.monotonic,
+        max_bytes: Optional[int] = None,
+        sizeof: Callable[[Any], int] = sys.getsizeof
+    ):
+        self.name = name
+        self.max_size = max_size
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._clock = clock
+        self._sizeof = sizeof
+        self._data: "OrderedDict[K, Tuple[float, V, int]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    @property
+    def bytes(self) -> int:
+        return self._bytes
+
+    def get(self, key: K, count: bool = True) -> Optional[V]:
+        """Cached value or None if missing or expired, ``count=False`` for callers counting hits themselves"""
+        now = self._clock()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._data.move_to_end(key)
+                else:
+                    self._remove(key)
+                    entry = None
+
+        if entry is None:
+            if count:
+                cache_misses_total.inc(self.name)
+            return None
+        if count:
+            cache_hits_total.inc(self.name)
+        return entry[1]
+
+    def set(self, key: K, value: V, ttl: Optional[float] = None) -> None:
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        if ttl <= 0:
+            return
+        size = self._sizeof(value) if self.max_bytes is not None else 0
+
+        evicted = 0
+        with self._lock:
+            self._remove(key)
+            self._data[key] = (self._clock() + ttl, value, size)
+            self._bytes += size
+            while len(self._data) > self.max_size or (self.max_bytes is not None and self._bytes > self.max_bytes):
+                _, (_, _, evicted_size) = self._data.popitem(last=False)
+                self._bytes -= evicted_size
+                evicted += 1
+
+        if evicted:
+            cache_evictions_total.inc(self.name, amount=evicted)
+        if self.max_bytes is not None:
+            cache_bytes.set(self._bytes, self.name)
+
+    def delete(self, key: K) -> None:
+        with self._lock:
+            self._remove(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+    def _remove(self, key: K) -> None:
+        entry = self._data.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[2]
@@ -0,0 +1,8 @@
+from src.core.concurrency.data_loader import DataLoader
+from src.core.concurrency.single_flight import SingleFlight
+
+
+__all__ = [
+    "DataLoader",
+    "SingleFlight"
+]
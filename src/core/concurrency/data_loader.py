@@ -0,0 +1,118 @@
+import asyncio
+from typing import Awaitable, Callable, Dict, Generic, Hashable, Iterable, List, Mapping, Optional, Set, TypeVar
+import logging
+
+from src.core.metrics.registry import metrics_registry
+
+logger = logging.getLogger(__name__)
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+BATCH_SIZE_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+
+data_loader_batch_size = metrics_registry.histogram(
+    "data_loader_batch_size",
+    "Distinct keys resolved per batch query",
+    ("loader",),
+    buckets=BATCH_SIZE_BUCKETS
+)
+
+
+class DataLoader(Generic[K, V]):
+    """
+    Collect ``load`` calls made within one event loop tick (or ``delay`` seconds) and resolve
+    them with one ``batch_fn`` call per ``max_batch_size`` distinct keys.
+    ``batch_fn`` returns a mapping of the keys it found; missing keys resolve to None.
+    Dispatches of later ticks run in their own tasks and may overlap; loaders given the same
+    ``lock`` (e.g. all loaders bound to one session) run their ``batch_fn`` calls one at a time.
+    Those tasks outlive a cancelled caller, ``close`` stops them before their resource goes away.
+    """
+
+    def __init__(
+        self,
+        batch_fn: Callable[[List[K]], Awaitable[Mapping[K, V]]],
+        name: str,
+        max_batch_size: int = 500,
+        delay: float = 0.0,
+        lock: Optional[asyncio.Lock] = None
+    ):
+        self.batch_fn = batch_fn
+        self.name = name
+        self.max_batch_size = max_batch_size
+        self.delay = delay
+        self.lock = lock
+        self._pending: Dict[K, asyncio.Future] = {}
+        self._scheduled: Optional[asyncio.Handle] = None
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def load(self, key: K) -> Optional[V]:
+        future = self._pending.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            self._pending[key] = future
+            if self._scheduled is None:
+                if self.delay > 0:
+                    self._scheduled = loop.call_later(self.delay, self._dispatch)
+                else:
+                    self._scheduled = loop.call_soon(self._dispatch)
+        # Shielded, one cancelled caller must not cancel a key shared with other callers
+        return await asyncio.shield(future)
+
+    async def load_many(self, keys: Iterable[K]) -> List[Optional[V]]:
+        return list(await asyncio.gather(*(self.load(key) for key in keys)))
+
+    async def close(self) -> None:
+        """Cancel queued and running batches and wait for them, their callers get CancelledError"""
+        if self._scheduled is not None:
+            self._scheduled.cancel()
+            self._scheduled = None
+        pending, self._pending = self._pending, {}
+        for future in pending.values():
+            future.cancel()
+        tasks = list(self._tasks)
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _dispatch(self) -> None:
+        pending, self._pending = self._pending, {}
+        self._scheduled = None
+        task = asyncio.create_task(self._run(pending))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, pending: Dict[K, asyncio.Future]) -> None:
+        keys = list(pending)
+        try:
+            for start in range(0, len(keys), self.max_batch_size):
+                batch = keys[start:start + self.max_batch_size]
+                data_loader_batch_size.observe(len(batch), self.name)
+                try:
+                    results = await self._call_batch_fn(batch)
+                except Exception as e:
+                    logger.error(f"DataLoader {self.name} batch of {len(batch)} keys failed: {e}")
+                    for key in batch:
+                        future = pending[key]
+                        if not future.done():
+                            future.set_exception(e)
+                            # Mark retrieved, callers that gave up must not log it again
+                            future.exception()
+                    continue
+                for key in batch:
+                    future = pending[key]
+                    if not future.done():
+                        future.set_result(results.get(key))
+        finally:
+            # Dispatch cancelled (shutdown), callers must not wait forever
+            for future in pending.values():
+                if not future.done():
+                    future.cancel()
+
+    async def _call_batch_fn(self, batch: List[K]) -> Mapping[K, V]:
+        if self.lock is None:
+            return await self.batch_fn(batch)
+        async with self.lock:
+            return await self.batch_fn(batch)
@@ -0,0 +1,72 @@
+import asyncio
+from typing import Awaitable, Callable, Dict, Generic, Hashable, TypeVar
+import logging
+
+from src.core.metrics.registry import metrics_registry
+
+logger = logging.getLogger(__name__)
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+single_flight_coalesced_total = metrics_registry.counter(
+    "single_flight_coalesced_total",
+    "Calls that waited for an identical in-flight call instead of running their own",
+    ("flight",)
+)
+
+
+class SingleFlight(Generic[K, V]):
+    """
+    Coalesce concurrent calls with the same key into one execution.
+    The first caller (leader) awaits the function in its own, the caller's, task; later callers
+    wait for its result and get the same value or exception. A cancelled follower only stops
+    waiting. Cancelling the leader's task cancels the shared call itself, so its followers
+    retry instead of failing, one of them becoming the new leader.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._calls: Dict[K, asyncio.Future] = {}
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    def forget(self, key: K) -> None:
+        """Detach the in-flight call for key: it still completes for its callers, later calls start a new one"""
+        self._calls.pop(key, None)
+
+    async def do(self, key: K, fn: Callable[[], Awaitable[V]]) -> V:
+        while True:
+            future = self._calls.get(key)
+            if future is None:
+                return await self._lead(key, fn)
+
+            single_flight_coalesced_total.inc(self.name)
+            try:
+                # Shielded, a follower being cancelled must not cancel the shared result
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not future.cancelled() or asyncio.current_task().cancelling():
+                    raise
+                logger.debug(f"Single-flight {self.name} leader for {key!r} was cancelled, retrying")
+
+    async def _lead(self, key: K, fn: Callable[[], Awaitable[V]]) -> V:
+        future = asyncio.get_running_loop().create_future()
+        self._calls[key] = future
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # Mark retrieved, the leader re-raises it even when nobody else was waiting
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            if self._calls.get(key) is future:
+                del self._calls[key]
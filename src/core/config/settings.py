@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import Dict, List, Optional
 from pydantic import MongoDsn
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -10,11 +10,53 @@ class Settings(BaseSettings):
     debug: bool = False
     log_full_traceback: bool = False
 
+    # Logging configuration
+    log_level: str = "INFO"
+    log_mode: str = "sync"  # Options: "sync" (write in calling thread), "queue" (background batched writer)
+    log_format: str = "text"  # Options: "text", "json" (JSON lines)
+    log_file: Optional[str] = "logs.log"
+    log_max_bytes: int = 0  # Rotate log file at this size, 0 disables rotation
+    log_backup_count: int = 5
+    log_queue_size: int = 10000  # Records beyond this are dropped (queue mode)
+    log_queue_warning_headroom: int = 1000  # Queue slots only warnings and errors may use
+    log_batch_size: int = 500
+    log_flush_interval_ms: int = 500
+
+    # Per-request log sampling: errors, 4xx and slow requests are always logged
+    log_sampling_enabled: bool = False
+    log_sample_rate: float = 1.0  # Fraction of successful requests logged
+    log_sample_route_rates: Dict[str, float] = {}  # Per route template, e.g. {"/api/healthcheck": 0.01}
+    log_sample_error_rate_threshold: float = 0.05  # Server error rate at which every request is logged again
+    log_sample_window_seconds: int = 10
+
     # Database configuration - all optional for stateless microservices
     # TODO add PostgresDsn and @field_validator("SQLALCHEMY_DATABASE_URI", mode="before")
     database_uri: Optional[str] = "sqlite+aiosqlite:///./app.db"
     db_type: Optional[str] = "sqlalchemy"  # Options: "sqlalchemy", "motor", "none", or None
 
+    database_replica_uris: List[str] = []  # Read replicas for read-only sessions (SQLAlchemy)
+    db_replica_health_check_interval_seconds: float = 10.0
+    db_replica_health_check_timeout_seconds: float = 2.0
+
+    # SQLite profile for file databases: tuned pragmas, one writer connection, separate reader pool
+    sqlite_tuning_enabled: bool = True
+    sqlite_synchronous: str = "NORMAL"
+    sqlite_mmap_size: int = 256 * 1024 * 1024
+    sqlite_cache_size_kib: int = 64 * 1024
+    sqlite_busy_timeout_ms: int = 5000  # Waits of other processes' writers before "database is locked"
+
+    # SQLAlchemy connection pool
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30.0  # Seconds to wait for a connection before failing
+    db_pool_recycle: int = -1  # Replace connections older than this many seconds, -1 disables
+    db_pool_pre_ping: bool = False  # Test connections on checkout
+    db_pool_warmup_connections: int = 0  # Connections opened at startup, capped by db_pool_size
+
+    # Per-request SQL instrumentation
+    db_query_stats_enabled: bool = True  # Count statements and DB time per request
+    db_n_plus_one_threshold: int = 10  # Warn when one statement shape runs more often in a request, 0 disables
+
     # MongoDB specific settings
     mongo_dsn: Optional[MongoDsn] = "mongodb://localhost:27017"  # type: ignore
     mongo_db_name: Optional[str] = "racun"
@@ -23,6 +65,17 @@ class Settings(BaseSettings):
     jwt_secret_key: str = "for production can generate by: openssl rand -hex 64"
     jwt_algorithm: str = "HS256"
     jwt_dev_mode: bool = False  # Skip signature validation in development
+    jwt_jwks_file: Optional[str] = None  # JWKS with RS256/ES256 public keys, replaces the shared secret when set
+    jwt_jwks_check_interval_seconds: float = 5.0  # How often a background task checks the JWKS file for changes
+    jwt_revocation_enabled: bool = False  # Reject revoked tokens (by jti, or SHA-256 hex digest of the token)
+    jwt_revocation_source: str = "file"  # file | database
+    jwt_revocation_file: Optional[str] = None  # One revoked token id per line
+    jwt_revocation_table: str = "revoked_tokens"  # Table or collection with a jti column
+    jwt_revocation_refresh_seconds: float = 30.0
+    jwt_revocation_false_positive_rate: float = 0.001
+    jwt_cache_enabled: bool = True  # Cache verified tokens by digest
+    jwt_cache_max_size: int = 10000
+    jwt_cache_ttl_seconds: int = 300  # Upper bound, entries never outlive the token exp
 
     # Metrics configuration
     metrics_enabled: bool = True
@@ -30,6 +83,35 @@ class Settings(BaseSettings):
     metrics_slow_threshold_ms: int = 1000
     metrics_include_user_agent: bool = False
     metrics_include_client_ip: bool = True
+    phase_timing_enabled: bool = False  # Collect per-request phase timings and attach them to slow-request logs
+    server_timing_header_enabled: bool = False  # Also emit phase timings as Server-Timing header (implies collection)
+    metrics_endpoint_enabled: bool = True  # Expose Prometheus metrics for scraping
+    metrics_path: str = "/metrics"
+    metrics_histogram_buckets: List[float] = [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0]
+    metrics_multiprocess_dir: Optional[str] = None  # Shared directory for per-worker metric files (multi-worker deployments)
+    metrics_multiprocess_segment_bytes: int = 4 * 1024 * 1024  # Size of each worker metrics file
+
+    # Request ID configuration
+    request_id_trust_inbound: bool = True  # Reuse a valid X-Request-ID sent by clients or proxies
+
+    # Middleware configuration
+    middleware_fused: bool = False  # Run request-id, metrics and db middleware in a single ASGI layer
+
+    # Compression configuration
+    compression_enabled: bool = True
+    compression_minimum_size: int = 1024  # Complete bodies below this size are sent uncompressed
+    compression_level: int = 1  # JSON compresses almost as well as at 6 for less than half the CPU (benchmarks/compression.py)
+    compression_threadpool_min_size: int = 64 * 1024  # Chunks of this size are compressed off the event loop
+
+    # Profiling configuration
+    profiling_slow_requests_enabled: bool = False  # Sample stacks of requests exceeding metrics_slow_threshold_ms
+    profiling_interval_ms: int = 10
+    profiling_output_dir: str = "profiles"
+    profiling_max_concurrent: int = 2  # Slow requests profiled at the same time
+    profiling_max_seconds: int = 60  # Upper bound for on-demand process profiles
+    loop_monitor_enabled: bool = True
+    loop_monitor_interval_ms: int = 100
+    loop_monitor_threshold_ms: int = 100  # Lag that counts as a blocked loop and logs the loop thread stack
 
     # Security settings
     secret_key: str = "your-secret-key-change-in-production"
@@ -40,6 +122,22 @@ class Settings(BaseSettings):
     api_title: str = "FastAPI Template"
     api_version: str = "1.0.0"
     api_description: str = "Production-ready FastAPI template"
+    pagination_default_limit: int = 50
+    pagination_max_limit: int = 500
+    user_bulk_chunk_size: int = 1000  # Records validated, written and committed together by bulk imports
+    user_bulk_json_max_bytes: int = 10 * 1024 * 1024  # JSON array bodies are parsed whole, larger imports must use NDJSON
+    user_bulk_ndjson_max_line_bytes: int = 64 * 1024  # Longer NDJSON lines are skipped and reported as invalid
+    user_export_batch_size: int = 1000  # Rows fetched per server-side cursor round trip and per streamed chunk
+    user_count_cache_ttl_seconds: float = 60.0  # Exact COUNT at most this often, adjusted on create/delete in between
+    user_lookup_coalescing_enabled: bool = True  # Concurrent lookups of the same id share one query, writes detach it on commit
+    user_batch_loading_enabled: bool = True  # Batch concurrent get_by_id/get_by_email of a session into IN queries
+    user_loader_max_batch_size: int = 500  # Keys per IN query, keep below the database bind parameter limit
+    user_loader_batch_delay_ms: float = 0  # 0 batches calls made within one event loop tick
+    user_cache_enabled: bool = False  # Read-through cache for user lookups by id
+    user_cache_backend: str = "memory"  # Options: "memory"
+    user_cache_max_size: int = 10000
+    user_cache_max_bytes: Optional[int] = 16 * 1024 * 1024  # Estimated memory budget, None for count bound only
+    user_cache_ttl_seconds: float = 60.0  # Bounds staleness from writes by other processes
 
 
 settings = Settings()
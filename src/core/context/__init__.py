@@ -0,0 +1,25 @@
+from src.core.context.request_id import (
+    request_id_var,
+    get_request_id,
+    generate_request_id,
+    validate_request_id,
+    RequestIdGenerator,
+    RequestIdLogFilter
+)
+from src.core.context.timing import phase_timings_var, phase, PhaseTimings
+from src.core.context.queries import query_stats_var, QueryStats
+
+
+__all__ = [
+    "request_id_var",
+    "get_request_id",
+    "generate_request_id",
+    "validate_request_id",
+    "RequestIdGenerator",
+    "RequestIdLogFilter",
+    "phase_timings_var",
+    "phase",
+    "PhaseTimings",
+    "query_stats_var",
+    "QueryStats"
+]
@@ -0,0 +1,29 @@
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Tuple
+
+# SQL statistics of the current request, None when query instrumentation is disabled
+query_stats_var: ContextVar[Optional['QueryStats']] = ContextVar("query_stats", default=None)
+
+
+class QueryStats:
+    """SQL statements executed by a request, their total duration and count per statement shape"""
+    __slots__ = ("count", "duration_ms", "shapes")
+
+    def __init__(self):
+        self.count = 0
+        self.duration_ms = 0.0
+        self.shapes: Dict[str, int] = {}
+
+    def record(self, statement: str, duration_ms: float) -> None:
+        # Statements carry bound parameters as placeholders, so the SQL text is the shape
+        self.count += 1
+        self.duration_ms += duration_ms
+        self.shapes[statement] = self.shapes.get(statement, 0) + 1
+
+    def repeated(self, threshold: int) -> List[Tuple[str, int]]:
+        """Statement shapes executed more than threshold times"""
+        return [(statement, count) for statement, count in self.shapes.items() if count > threshold]
+
+    def summary(self) -> str:
+        """Compact form for log lines"""
+        return f"{self.count}q/{self.duration_ms:.1f}ms"
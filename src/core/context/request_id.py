@@ -0,0 +1,55 @@
+import itertools
+import logging
+import os
+import re
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+# Request ID of the request being processed, set by RequestIdMiddleware.
+# Context variables follow the request into awaited coroutines and threadpool calls.
+request_id_var: ContextVar[str] = ContextVar("request_id", default="unknown")
+
+# Inbound IDs are only reused when they cannot break log lines or headers
+_VALID_REQUEST_ID = re.compile(rb"^[A-Za-z0-9._:\-]{1,128}$")
+
+
+def get_request_id() -> str:
+    """Request ID of the current request, 'unknown' outside of a request"""
+    return request_id_var.get()
+
+
+class RequestIdGenerator:
+    """
+    Sortable request IDs: milliseconds since epoch, pid and a per-process counter, in fixed-width hex.
+    IDs sort by creation time and are unique across workers without the urandom call of uuid4.
+    """
+
+    def __init__(self):
+        self._reset_pid()
+        os.register_at_fork(after_in_child=self._reset_pid)
+
+    def _reset_pid(self) -> None:
+        self._pid = os.getpid() & 0xFFFFFF
+        self._counter = itertools.count()
+
+    def __call__(self) -> str:
+        return f"{time.time_ns() // 1_000_000:011x}-{self._pid:06x}-{next(self._counter) & 0xFFFFFF:06x}"
+
+
+generate_request_id = RequestIdGenerator()
+
+
+def validate_request_id(value: bytes) -> Optional[str]:
+    """Return the inbound request ID if it is safe to reuse"""
+    if _VALID_REQUEST_ID.match(value):
+        return value.decode("ascii")
+    return None
+
+
+class RequestIdLogFilter(logging.Filter):
+    """Stamp every record with the current request ID as ``record.request_id``"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get()
+        return True
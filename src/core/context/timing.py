@@ -0,0 +1,59 @@
+import time
+from contextlib import nullcontext
+from contextvars import ContextVar
+from typing import Dict, Optional
+
+# Phase timings of the current request, None when phase timing is disabled
+phase_timings_var: ContextVar[Optional['PhaseTimings']] = ContextVar("phase_timings", default=None)
+
+_NOOP_PHASE = nullcontext()
+
+
+class PhaseTimings:
+    """Accumulated duration per phase of a request in milliseconds"""
+    __slots__ = ("durations", "endpoint_start", "endpoint_end")
+
+    def __init__(self):
+        self.durations: Dict[str, float] = {}
+        self.endpoint_start: Optional[float] = None
+        self.endpoint_end: Optional[float] = None
+
+    def add(self, name: str, duration_ms: float) -> None:
+        self.durations[name] = self.durations.get(name, 0.0) + duration_ms
+
+    def server_timing(self) -> str:
+        """Value for the Server-Timing response header"""
+        return ", ".join(f"{name};dur={duration_ms:.1f}" for name, duration_ms in self.durations.items())
+
+    def summary(self) -> str:
+        """Compact form for log lines"""
+        return " ".join(f"{name}={duration_ms:.1f}ms" for name, duration_ms in self.durations.items())
+
+
+class _Phase:
+    __slots__ = ("timings", "name", "start")
+
+    def __init__(self, timings: PhaseTimings, name: str):
+        self.timings = timings
+        self.name = name
+
+    def __enter__(self) -> None:
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc_info) -> None:
+        self.timings.add(self.name, (time.perf_counter() - self.start) * 1000)
+
+
+def phase(name: str):
+    """
+    Time a block as a named phase of the current request:
+
+        with phase("jwt"):
+            ...
+
+    Returns a shared no-op context manager when timing is disabled.
+    """
+    timings = phase_timings_var.get()
+    if timings is None:
+        return _NOOP_PHASE
+    return _Phase(timings, name)
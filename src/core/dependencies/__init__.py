@@ -1,13 +1,30 @@
 from src.core.dependencies.common import RequestId
-from src.core.dependencies.database import DbProvider
-from src.core.dependencies.jwt import JwtClient, JwtClientDep, AdminJwtClientDep, get_jwt_client
+from src.core.dependencies.database import DbProvider, ReadDbProvider
+from src.core.dependencies.pagination import Pagination, CursorParams, encode_cursor, decode_cursor
+from src.core.dependencies.jwt import (
+    JwtClient,
+    Principal,
+    JwtClientDep,
+    AdminJwtClientDep,
+    get_jwt_client,
+    require_roles,
+    require_role
+)
 
 
 __all__ = [
     "RequestId",
     "DbProvider",
+    "ReadDbProvider",
+    "Pagination",
+    "CursorParams",
+    "encode_cursor",
+    "decode_cursor",
     "JwtClient",
+    "Principal",
     "JwtClientDep",
     "AdminJwtClientDep",
-    "get_jwt_client"
+    "get_jwt_client",
+    "require_roles",
+    "require_role"
 ]
@@ -2,13 +2,14 @@ from typing import Annotated
 import logging
 
 from fastapi import Depends
-from starlette.requests import Request
+
+from src.core.context import request_id_var
 
 logger = logging.getLogger(__name__)
 
 
-def get_request_id(request: Request) -> str:
-    return getattr(request.state, 'request_id', 'unknown')
+async def get_request_id() -> str:
+    return request_id_var.get()
 
 
 RequestId = Annotated[str, Depends(get_request_id)]
@@ -4,6 +4,7 @@ import logging
 from fastapi import Depends
 from starlette.requests import Request
 
+from src.core.context.timing import phase
 from src.infrastructure.database.managers import BaseDbManager
 
 if TYPE_CHECKING:
@@ -29,13 +30,29 @@ def get_db_provider(request: Request)-> 'AsyncSession | AsyncIOMotorDatabase | N
 
     if db_provider is None:
         db_manager = get_db_manager_from_app(request.app)
-        db_provider = db_manager.get_db_provider()
+        with phase("db_session"):
+            db_provider = db_manager.get_db_provider()
         request.state.db_provider = db_provider
+        logger.info(f"{db_manager.get_provider_type()} id:{id(db_provider)} provider set in request.state.db_provider")
 
-        request_id = getattr(request.state, 'request_id', 'unknown')
-        logger.info(f"[{request_id}] {db_manager.get_provider_type()} id:{id(db_provider)} provider set in request.state.db_provider")
+    return db_provider
+
+
+def get_read_db_provider(request: Request) -> 'AsyncSession | AsyncIOMotorDatabase | None':
+    """
+    Dependency providing a read-only database provider, served by a read replica when configured.
+    Writes and transactions must use DbProvider. Cleanup is managed by middleware.
+    """
+    db_provider = getattr(request.state, 'db_read_provider', None)
+
+    if db_provider is None:
+        db_manager = get_db_manager_from_app(request.app)
+        with phase("db_session"):
+            db_provider = db_manager.get_read_db_provider()
+        request.state.db_read_provider = db_provider
 
     return db_provider
 
 
 DbProvider = Annotated['AsyncSession | AsyncIOMotorDatabase', Depends(get_db_provider)]
+ReadDbProvider = Annotated['AsyncSession | AsyncIOMotorDatabase', Depends(get_read_db_provider)]
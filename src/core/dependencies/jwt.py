@@ -1,5 +1,8 @@
-from typing import List, Annotated
+from dataclasses import dataclass
+from typing import FrozenSet, Iterable, List, Annotated, Optional
+import hashlib
 import logging
+import time
 from datetime import datetime, timezone
 
 from fastapi import Depends, HTTPException, status
@@ -7,7 +10,10 @@ from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from jose import JWTError, jwt
 from pydantic import BaseModel
 
+from src.core.cache import TTLCache
 from src.core.config.settings import settings
+from src.core.context.timing import phase
+from src.core.security import JwksKeySet, jwks_key_set, revocation_list
 
 logger = logging.getLogger(__name__)
 
@@ -33,9 +39,61 @@ class JwtClient(BaseModel):
         """Check if client has any of specified roles"""
         return any(role in self.roles for role in roles)
 
+    def to_jwt_client(self) -> "JwtClient":
+        """Already the response model, lets dependency overrides return a JwtClient"""
+        return self
 
-def validate_jwt_token(token: str) -> JwtClient:
-    """Validate JWT token and extract client data"""
+
+@dataclass(frozen=True, slots=True)
+class Principal:
+    """Authenticated client for internal use - immutable, roles as frozenset for set-based checks"""
+    sub: str
+    roles: FrozenSet[str]
+    exp: int
+    token_id: Optional[str] = None  # jti claim, or SHA-256 hex digest of the token without one
+
+    @property
+    def client_id(self) -> str:
+        return self.sub
+
+    def has_role(self, role: str) -> bool:
+        return role in self.roles
+
+    def has_any_role(self, roles: Iterable[str]) -> bool:
+        """Check if client has any of specified roles, pass a frozenset to avoid a conversion"""
+        return not self.roles.isdisjoint(roles)
+
+    def to_jwt_client(self) -> JwtClient:
+        """Pydantic representation for response models"""
+        return JwtClient(sub=self.sub, roles=sorted(self.roles), exp=self.exp)
+
+
+# Asymmetric tokens are verified against the JWKS file when configured, otherwise with the shared secret
+_jwks_key_set: Optional[JwksKeySet] = jwks_key_set
+_secret_algorithms = [settings.jwt_algorithm]
+
+# Verified tokens by SHA-256 digest, so repeat callers skip decoding and signature checks
+_token_cache: Optional[TTLCache[bytes, Principal]] = TTLCache(
+    "jwt", max_size=settings.jwt_cache_max_size, ttl=settings.jwt_cache_ttl_seconds
+) if settings.jwt_cache_enabled else None
+
+
+def validate_jwt_token(token: str) -> Principal:
+    """Validate JWT token and extract client data, reusing the result for a repeated token"""
+    if _token_cache is None:
+        return _decode_jwt_token(token)
+
+    key = hashlib.sha256(token.encode()).digest()
+    principal = _token_cache.get(key)
+    if principal is None:
+        principal = _decode_jwt_token(token)
+        # TTL capped by exp, an expired token is never served from the cache
+        _token_cache.set(key, principal, ttl=principal.exp - time.time())
+    return principal
+
+
+def _decode_jwt_token(token: str) -> Principal:
+    """Decode and verify JWT token"""
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -44,11 +102,17 @@ def validate_jwt_token(token: str) -> JwtClient:
 
     try:
         # Decode JWT token
-        payload = jwt.decode(
-            token,
-            settings.jwt_secret_key,
-            algorithms=[settings.jwt_algorithm]
-        )
+        if _jwks_key_set is None:
+            payload = jwt.decode(token, settings.jwt_secret_key, algorithms=_secret_algorithms)
+        else:
+            kid = jwt.get_unverified_header(token).get("kid")
+            # Untrusted header: a list or object kid must not reach the dict lookup
+            entry = _jwks_key_set.get(kid) if isinstance(kid, str) and kid else None
+            if entry is None:
+                logger.warning(f"JWT validation failed: unknown key id {kid}")
+                raise credentials_exception
+            key, algorithm = entry
+            payload = jwt.decode(token, key, algorithms=[algorithm])
 
         # Extract required fields
         sub = payload.get("sub")
@@ -72,26 +136,29 @@ def validate_jwt_token(token: str) -> JwtClient:
         if not isinstance(roles, list):
             roles = []
 
-        return JwtClient(sub=sub, roles=roles, exp=exp)
+        token_id = payload.get("jti") or hashlib.sha256(token.encode()).hexdigest()
+        return Principal(sub=sub, roles=frozenset(roles), exp=exp, token_id=token_id)
 
     except JWTError as e:
         logger.warning(f"JWT validation failed: {e}")
         raise credentials_exception
 
 
-def get_jwt_client(
+_DEV_PRINCIPAL = Principal(sub="dev-client", roles=frozenset(["admin", "base"]), exp=9999999999)
+
+
+async def get_jwt_client(
     credentials: HTTPAuthorizationCredentials = Depends(oauth2_scheme)
-) -> JwtClient:
-    """Extract and validate client from JWT token"""
+) -> Principal:
+    """
+    Extract and validate client from JWT token.
+    Async so cached tokens are resolved on the event loop without a thread pool hop.
+    """
 
     # Development mode: skip authentication completely
     if settings.jwt_dev_mode:
         logger.info("JWT dev mode: bypassing authentication, using admin client")
-        return JwtClient(
-            sub="dev-client",
-            roles=["admin", "base"],
-            exp=9999999999
-        )
+        return _DEV_PRINCIPAL
 
     # Production mode: require token
     if credentials is None:
@@ -102,18 +169,31 @@ def get_jwt_client(
         )
 
     # Production mode: full validation
-    return validate_jwt_token(credentials.credentials)
+    with phase("jwt"):
+        principal = validate_jwt_token(credentials.credentials)
+
+    # Checked on every request, cached tokens included
+    if settings.jwt_revocation_enabled and revocation_list.is_revoked(principal.token_id):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token revoked",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return principal
 
 
 def require_roles(required_roles: List[str]):
-    """Dependency factory for role-based authorization"""
-    def role_checker(jwt_client: JwtClient = Depends(get_jwt_client)) -> JwtClient:
-        if not jwt_client.has_any_role(required_roles):
+    """Dependency factory for role-based authorization, the role set is built once per dependency"""
+    required = frozenset(required_roles)
+    detail = f"Insufficient permissions. Required roles: {required_roles}"
+
+    async def role_checker(principal: Principal = Depends(get_jwt_client)) -> Principal:
+        if not principal.has_any_role(required):
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
-                detail=f"Insufficient permissions. Required roles: {required_roles}"
+                detail=detail
             )
-        return jwt_client
+        return principal
     return role_checker
 
 
@@ -123,5 +203,5 @@ def require_role(required_role: str):
 
 
 # Convenient type aliases
-JwtClientDep = Annotated[JwtClient, Depends(get_jwt_client)]
-AdminJwtClientDep = Annotated[JwtClient, Depends(require_role("admin"))]
+JwtClientDep = Annotated[Principal, Depends(get_jwt_client)]
+AdminJwtClientDep = Annotated[Principal, Depends(require_role("admin"))]
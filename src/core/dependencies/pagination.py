@@ -0,0 +1,63 @@
+from dataclasses import dataclass
+from typing import Annotated, Any, Dict, Optional, Type, TypeVar
+import base64
+import binascii
+import json
+import logging
+
+from fastapi import Depends, HTTPException, Query, status
+
+from src.core.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+def encode_cursor(values: Dict[str, Any]) -> str:
+    """Opaque cursor token for the sort key values of the last item on a page"""
+    payload = json.dumps(values, separators=(",", ":"), default=str).encode()
+    return base64.urlsafe_b64encode(payload).rstrip(b"=").decode()
+
+
+def decode_cursor(token: str) -> Dict[str, Any]:
+    """Sort key values from a cursor token, ValueError when the token is malformed"""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+    except (binascii.Error, UnicodeDecodeError, json.JSONDecodeError) as e:
+        raise ValueError(f"Malformed cursor: {e}") from e
+    if not isinstance(values, dict):
+        raise ValueError("Malformed cursor: expected an object")
+    return values
+
+
+@dataclass(frozen=True, slots=True)
+class CursorParams:
+    """Keyset pagination parameters: position after the previous page and the page size"""
+    after: Optional[Dict[str, Any]]
+    limit: int
+
+    def after_key(self, name: str, type_: Type[T]) -> Optional[T]:
+        """Sort key value to continue after, None on the first page"""
+        if self.after is None:
+            return None
+        value = self.after.get(name)
+        if not isinstance(value, type_):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+        return value
+
+
+async def get_cursor_params(
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    limit: int = Query(settings.pagination_default_limit, ge=1, le=settings.pagination_max_limit)
+) -> CursorParams:
+    if cursor is None:
+        return CursorParams(after=None, limit=limit)
+    try:
+        return CursorParams(after=decode_cursor(cursor), limit=limit)
+    except ValueError as e:
+        logger.warning(f"Rejected pagination cursor: {e}")
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
+Pagination = Annotated[CursorParams, Depends(get_cursor_params)]
@@ -0,0 +1,14 @@
+from src.core.logs.formatters import JsonFormatter, create_formatter
+from src.core.logs.handlers import BatchingLogListener, BoundedQueueHandler, RotatingFileWriter
+from src.core.logs.setup import setup_logging, shutdown_logging
+
+
+__all__ = [
+    "JsonFormatter",
+    "create_formatter",
+    "BatchingLogListener",
+    "BoundedQueueHandler",
+    "RotatingFileWriter",
+    "setup_logging",
+    "shutdown_logging"
+]
@@ -0,0 +1,32 @@
+import json
+import logging
+
+TEXT_FORMAT = "%(asctime)s [%(levelname)s] [%(request_id)s] [%(message)s]"
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+class JsonFormatter(logging.Formatter):
+    """Format records as JSON lines"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "timestamp": self.formatTime(record, self.datefmt),
+            "level": record.levelname,
+            "logger": record.name,
+            "pid": record.process,
+            "request_id": getattr(record, "request_id", None),
+            "message": record.getMessage(),
+        }
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+def create_formatter(log_format: str) -> logging.Formatter:
+    if log_format == "json":
+        return JsonFormatter(datefmt=DATE_FORMAT)
+    if log_format == "text":
+        return logging.Formatter(TEXT_FORMAT, datefmt=DATE_FORMAT, defaults={"request_id": "unknown"})
+    raise ValueError(f"Unknown log format: {log_format}. Available: text, json")
@@ -0,0 +1,212 @@
+import os
+import queue
+import sys
+import threading
+import time
+from logging.handlers import QueueHandler
+from typing import List, Optional, TextIO, Tuple
+import logging
+
+from src.core.metrics.registry import metrics_registry
+
+logger = logging.getLogger(__name__)
+
+log_records_dropped_total = metrics_registry.counter(
+    "log_records_dropped_total",
+    "Log records dropped because the logging queue was full"
+)
+log_warnings_dropped_total = metrics_registry.counter(
+    "log_warnings_dropped_total",
+    "Warning and error records dropped because the logging queue was full, headroom included"
+)
+
+
+class BoundedQueueHandler(QueueHandler):
+    """
+    Enqueue records without blocking the caller.
+    The last ``warning_headroom`` slots of the queue are kept for warnings and errors: records
+    below WARNING are dropped once the queue is that full, warnings and errors only when it is
+    completely full. Drops are counted separately and reported by the listener.
+    """
+
+    def __init__(self, log_queue: queue.Queue, warning_headroom: int = 0):
+        super().__init__(log_queue)
+        self.dropped = 0
+        self.dropped_warnings = 0
+        self._low_level_limit = max(log_queue.maxsize - warning_headroom, 1) if log_queue.maxsize > 0 else 0
+        self._exception_formatter = logging.Formatter()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Merge args now - they may reference objects that change after the call returns.
+        # The record is not copied: this handler is the only one on the hot path.
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = self._exception_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        if record.levelno < logging.WARNING:
+            if self._low_level_limit and self.queue.qsize() >= self._low_level_limit:
+                self.dropped += 1
+                log_records_dropped_total.inc()
+                return
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            if record.levelno >= logging.WARNING:
+                self.dropped_warnings += 1
+                log_warnings_dropped_total.inc()
+            else:
+                self.dropped += 1
+                log_records_dropped_total.inc()
+
+    def take_dropped(self) -> Tuple[int, int]:
+        """Records dropped since the last call: (below WARNING, WARNING and above)"""
+        dropped, self.dropped = self.dropped, 0
+        dropped_warnings, self.dropped_warnings = self.dropped_warnings, 0
+        return dropped, dropped_warnings
+
+
+class RotatingFileWriter:
+    """Buffered file writer with size-based rotation"""
+
+    def __init__(self, filename: str, max_bytes: int = 0, backup_count: int = 0, buffer_size: int = 64 * 1024):
+        self.filename = os.path.abspath(filename)
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.buffer_size = buffer_size
+        self._stream = open(self.filename, "ab", buffering=buffer_size)
+        self._size = self._stream.tell()
+
+    def write(self, data: bytes) -> None:
+        if self.max_bytes and self._size and self._size + len(data) > self.max_bytes:
+            self.rotate()
+        self._stream.write(data)
+        self._size += len(data)
+
+    def rotate(self) -> None:
+        self._stream.close()
+        if self.backup_count > 0:
+            for i in range(self.backup_count - 1, 0, -1):
+                source = f"{self.filename}.{i}"
+                if os.path.exists(source):
+                    os.replace(source, f"{self.filename}.{i + 1}")
+            os.replace(self.filename, f"{self.filename}.1")
+            self._stream = open(self.filename, "ab", buffering=self.buffer_size)
+        else:
+            self._stream = open(self.filename, "wb", buffering=self.buffer_size)
+        self._size = 0
+
+    def flush(self) -> None:
+        self._stream.flush()
+
+    def close(self) -> None:
+        self._stream.close()
+
+
+class BatchingLogListener:
+    """
+    Background thread draining the logging queue.
+    Records are formatted and written in batches; destinations are flushed
+    when the queue runs empty or after ``flush_interval`` seconds.
+    """
+    _sentinel = None
+
+    def __init__(
+        self,
+        log_queue: queue.Queue,
+        handler: BoundedQueueHandler,
+        formatter: logging.Formatter,
+        stream: Optional[TextIO] = None,
+        file_writer: Optional[RotatingFileWriter] = None,
+        batch_size: int = 500,
+        flush_interval: float = 0.5
+    ):
+        self.queue = log_queue
+        self.handler = handler
+        self.formatter = formatter
+        self.stream = stream
+        self.file_writer = file_writer
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="log-listener", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        # The sentinel must get through even when the queue is full
+        self.queue.put(self._sentinel)
+        self._thread.join()
+        self._thread = None
+        if self.file_writer:
+            self.file_writer.close()
+
+    def _run(self) -> None:
+        last_flush = time.monotonic()
+        while True:
+            try:
+                batch = [self.queue.get(timeout=self.flush_interval)]
+            except queue.Empty:
+                self._flush()
+                last_flush = time.monotonic()
+                continue
+
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            stopping = self._sentinel in batch
+            self._write([record for record in batch if record is not self._sentinel])
+
+            if stopping or self.queue.empty() or time.monotonic() - last_flush >= self.flush_interval:
+                self._flush()
+                last_flush = time.monotonic()
+            if stopping:
+                return
+
+    def _write(self, records: List[logging.LogRecord]) -> None:
+        dropped, dropped_warnings = self.handler.take_dropped()
+        if dropped or dropped_warnings:
+            records.append(logging.makeLogRecord({
+                "name": __name__,
+                "levelno": logging.ERROR if dropped_warnings else logging.WARNING,
+                "levelname": "ERROR" if dropped_warnings else "WARNING",
+                "msg": f"Logging queue full: {dropped} records and {dropped_warnings} warnings or errors dropped",
+            }))
+
+        lines = []
+        for record in records:
+            try:
+                lines.append(self.formatter.format(record))
+            except Exception:
+                self.handler.handleError(record)
+        if not lines:
+            return
+
+        text = "\n".join(lines) + "\n"
+        try:
+            if self.stream:
+                self.stream.write(text)
+            if self.file_writer:
+                self.file_writer.write(text.encode("utf-8"))
+        except Exception as e:
+            # Nowhere left to log to - report on stderr like logging.Handler.handleError does
+            print(f"Logging listener failed to write batch: {e}", file=sys.stderr)
+
+    def _flush(self) -> None:
+        try:
+            if self.stream:
+                self.stream.flush()
+            if self.file_writer:
+                self.file_writer.flush()
+        except (OSError, ValueError):
+            # Destination already closed (e.g. at interpreter exit), same as logging.shutdown
+            pass
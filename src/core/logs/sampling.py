@@ -0,0 +1,112 @@
+import random
+import time
+from typing import Callable, Dict, Optional
+import logging
+
+from starlette.types import Scope
+
+from src.core.config.settings import settings
+from src.core.metrics.http import get_route_template
+from src.core.metrics.registry import metrics_registry
+
+logger = logging.getLogger(__name__)
+
+request_logs_sampled_out_total = metrics_registry.counter(
+    "request_logs_sampled_out_total",
+    "Per-request log lines skipped by log sampling"
+)
+
+
+class LogSampler:
+    """
+    Decide whether the per-request log lines of a finished request are written.
+    Errors, 4xx and slow requests are always logged. Other requests are sampled
+    at a per-route rate, which rises towards 1.0 as the recent server error rate
+    approaches ``error_rate_threshold``.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = False,
+        default_rate: float = 1.0,
+        route_rates: Optional[Dict[str, float]] = None,
+        error_rate_threshold: float = 0.05,
+        slow_threshold_ms: float = 1000,
+        window_seconds: float = 10,
+        min_window_requests: int = 20,
+        random_func: Callable[[], float] = random.random,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.enabled = enabled
+        self.default_rate = default_rate
+        self.route_rates = route_rates or {}
+        self.error_rate_threshold = error_rate_threshold
+        self.slow_threshold_ms = slow_threshold_ms
+        self.window_seconds = window_seconds
+        self.min_window_requests = min_window_requests
+        self._random = random_func
+        self._clock = clock
+        self._window_start = clock()
+        self._requests = 0
+        self._errors = 0
+        self._previous_error_rate = 0.0
+
+    def _record(self, is_error: bool) -> None:
+        now = self._clock()
+        if now - self._window_start >= self.window_seconds:
+            self._previous_error_rate = self._errors / self._requests if self._requests else 0.0
+            self._window_start = now
+            self._requests = 0
+            self._errors = 0
+        self._requests += 1
+        self._errors += is_error
+
+    @property
+    def error_rate(self) -> float:
+        """Server error rate of the last complete window, or of the current one once it has enough requests"""
+        current = self._errors / self._requests if self._requests >= self.min_window_requests else 0.0
+        return max(self._previous_error_rate, current)
+
+    def sample_rate(self, route: str) -> float:
+        base_rate = self.route_rates.get(route, self.default_rate)
+        if self.error_rate_threshold <= 0:
+            return base_rate
+        boost = min(1.0, self.error_rate / self.error_rate_threshold)
+        return base_rate + (1.0 - base_rate) * boost
+
+    def should_log(self, route: str, status_code: int, duration_ms: float, error: Exception | None = None) -> bool:
+        is_error = error is not None or status_code >= 500
+        self._record(is_error)
+
+        # Full detail when things go wrong
+        if is_error or status_code >= 400 or duration_ms > self.slow_threshold_ms:
+            return True
+
+        rate = self.sample_rate(route)
+        if rate >= 1.0 or self._random() < rate:
+            return True
+        request_logs_sampled_out_total.inc()
+        return False
+
+
+request_log_sampler = LogSampler(
+    enabled=settings.log_sampling_enabled,
+    default_rate=settings.log_sample_rate,
+    route_rates=settings.log_sample_route_rates,
+    error_rate_threshold=settings.log_sample_error_rate_threshold,
+    slow_threshold_ms=settings.metrics_slow_threshold_ms,
+    window_seconds=settings.log_sample_window_seconds
+)
+
+
+def should_log_request(scope: Scope, status_code: int, duration_ms: float, error: Exception | None = None) -> bool:
+    """Sampling decision for a finished request, made once and shared by all middlewares via request state"""
+    if not request_log_sampler.enabled:
+        return True
+
+    state = scope["state"]
+    sampled = state.get("log_sampled")
+    if sampled is None:
+        sampled = request_log_sampler.should_log(get_route_template(scope), status_code, duration_ms, error)
+        state["log_sampled"] = sampled
+    return sampled
@@ -0,0 +1,86 @@
+import atexit
+import logging
+import queue
+import sys
+from logging.handlers import RotatingFileHandler
+from typing import List, Optional
+
+from src.core.config.settings import Settings
+from src.core.context import RequestIdLogFilter
+from src.core.logs.formatters import create_formatter
+from src.core.logs.handlers import BatchingLogListener, BoundedQueueHandler, RotatingFileWriter
+
+_listener: Optional[BatchingLogListener] = None
+_installed_handlers: List[logging.Handler] = []
+
+
+def setup_logging(settings: Settings) -> None:
+    """
+    Configure the root logger.
+    ``sync`` writes from the calling thread (stream + file handlers),
+    ``queue`` only enqueues records and leaves formatting and I/O to a background listener.
+    """
+    global _listener
+
+    shutdown_logging()
+    formatter = create_formatter(settings.log_format)
+    root = logging.getLogger()
+    root.setLevel(settings.log_level.upper())
+
+    if settings.log_mode == "sync":
+        handlers: List[logging.Handler] = [logging.StreamHandler()]
+        if settings.log_file:
+            if settings.log_max_bytes:
+                handlers.append(RotatingFileHandler(
+                    settings.log_file, maxBytes=settings.log_max_bytes, backupCount=settings.log_backup_count
+                ))
+            else:
+                handlers.append(logging.FileHandler(settings.log_file))
+        for handler in handlers:
+            handler.setFormatter(formatter)
+
+    elif settings.log_mode == "queue":
+        log_queue: queue.Queue = queue.Queue(maxsize=settings.log_queue_size)
+        queue_handler = BoundedQueueHandler(log_queue, warning_headroom=settings.log_queue_warning_headroom)
+        file_writer = RotatingFileWriter(
+            settings.log_file, settings.log_max_bytes, settings.log_backup_count
+        ) if settings.log_file else None
+        _listener = BatchingLogListener(
+            log_queue,
+            queue_handler,
+            formatter,
+            stream=sys.stderr,
+            file_writer=file_writer,
+            batch_size=settings.log_batch_size,
+            flush_interval=settings.log_flush_interval_ms / 1000
+        )
+        _listener.start()
+        handlers = [queue_handler]
+
+    else:
+        raise ValueError(f"Unknown log mode: {settings.log_mode}. Available: sync, queue")
+
+    # Handlers stamp the request ID in the calling context - before records reach the queue
+    request_id_filter = RequestIdLogFilter()
+    for handler in handlers:
+        handler.addFilter(request_id_filter)
+        root.addHandler(handler)
+    _installed_handlers.extend(handlers)
+
+
+def shutdown_logging() -> None:
+    """Remove installed handlers and drain the queue listener"""
+    global _listener
+
+    root = logging.getLogger()
+    for handler in _installed_handlers:
+        root.removeHandler(handler)
+        handler.close()
+    _installed_handlers.clear()
+
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+atexit.register(shutdown_logging)
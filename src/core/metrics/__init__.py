@@ -0,0 +1,21 @@
+from src.core.metrics.registry import (
+    Counter,
+    Gauge,
+    Histogram,
+    MetricsRegistry,
+    metrics_registry
+)
+from src.core.metrics.exposition import CONTENT_TYPE_LATEST, generate_latest
+from src.core.metrics.routes import router as metrics_router
+
+
+__all__ = [
+    "Counter",
+    "Gauge",
+    "Histogram",
+    "MetricsRegistry",
+    "metrics_registry",
+    "CONTENT_TYPE_LATEST",
+    "generate_latest",
+    "metrics_router"
+]
@@ -0,0 +1,39 @@
+import math
+from typing import List, Tuple
+
+from src.core.metrics.registry import MetricsRegistry
+
+CONTENT_TYPE_LATEST = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape_label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _escape_help(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("\n", "\\n")
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if math.isnan(value):
+        return "NaN"
+    return repr(float(value))
+
+
+def _format_labels(labels: Tuple[Tuple[str, str], ...]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape_label_value(value)}"' for name, value in labels) + "}"
+
+
+def generate_latest(registry: MetricsRegistry) -> str:
+    """Render all metrics of the registry in Prometheus text exposition format"""
+    lines: List[str] = []
+    for metric, children in registry.collect():
+        lines.append(f"# HELP {metric.name} {_escape_help(metric.documentation)}")
+        lines.append(f"# TYPE {metric.name} {metric.type_name}")
+        for sample_name, labels, value in metric.samples(children):
+            lines.append(f"{sample_name}{_format_labels(labels)} {_format_value(value)}")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,54 @@
+from starlette.types import Scope
+
+from src.core.config.settings import settings
+from src.core.metrics.registry import metrics_registry
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+# HTTP metrics recorded by MetricsMiddleware, labelled by route template to keep cardinality bounded
+http_requests_total = metrics_registry.counter(
+    "http_requests_total",
+    "Total number of HTTP requests",
+    ("method", "route", "status")
+)
+http_request_duration_seconds = metrics_registry.histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency in seconds",
+    ("method", "route", "status"),
+    buckets=settings.metrics_histogram_buckets
+)
+http_requests_in_progress = metrics_registry.gauge(
+    "http_requests_in_progress",
+    "Number of HTTP requests currently being processed",
+    ("method",)
+)
+
+http_request_db_queries = metrics_registry.histogram(
+    "http_request_db_queries",
+    "SQL statements executed per request (requests using the database)",
+    ("method", "route"),
+    buckets=(1, 2, 3, 5, 10, 20, 50, 100)
+)
+http_request_db_duration_seconds = metrics_registry.histogram(
+    "http_request_db_duration_seconds",
+    "Time spent in SQL statements per request",
+    ("method", "route"),
+    buckets=settings.metrics_histogram_buckets
+)
+http_request_n_plus_one_total = metrics_registry.counter(
+    "http_request_n_plus_one_total",
+    "Requests running one statement shape more than db_n_plus_one_threshold times",
+    ("method", "route")
+)
+
+
+def get_route_template(scope: Scope) -> str:
+    """Template of the matched route, e.g. ``/api/users/{user_id}``"""
+    # FastAPI resolving included routers lazily keeps the full template in its route context,
+    # otherwise the matched route already carries the prefixed path
+    route_context = scope.get("fastapi", {}).get("effective_route_context")
+    path_format = getattr(route_context, "path_format", None)
+    if path_format:
+        return path_format
+    return getattr(scope.get("route"), "path", None) or UNMATCHED_ROUTE
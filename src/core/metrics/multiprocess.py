@@ -0,0 +1,174 @@
+import glob
+import json
+import mmap
+import os
+import struct
+from typing import Dict, Iterator, List, Mapping, MutableSequence, Optional, Sequence, Tuple
+import logging
+
+from src.core.metrics.registry import Counter, Gauge, Histogram, Metric, MetricsRegistry
+
+logger = logging.getLogger(__name__)
+
+
+# File layout: header with the number of used bytes, followed by entries of
+# [key length, number of values][json key padded to 8 bytes][float64 values]
+_HEADER = struct.Struct("<Q")
+_ENTRY = struct.Struct("<II")
+_VALUE_SIZE = 8
+_FILE_PREFIX = "metrics_"
+_FILE_SUFFIX = ".db"
+
+
+def _encode_key(name: str, labelvalues: Tuple[str, ...]) -> bytes:
+    return json.dumps([name, list(labelvalues)], separators=(",", ":")).encode("utf-8")
+
+
+def _padded(length: int) -> int:
+    return (length + 7) & ~7
+
+
+def _iter_entries(buffer, used: int) -> Iterator[Tuple[bytes, int, int]]:
+    """Yield (key, values offset, number of values) for every complete entry"""
+    position = _HEADER.size
+    while position + _ENTRY.size <= used:
+        key_length, size = _ENTRY.unpack_from(buffer, position)
+        key_start = position + _ENTRY.size
+        values_offset = key_start + _padded(key_length)
+        end = values_offset + size * _VALUE_SIZE
+        if end > used:
+            break
+        yield bytes(buffer[key_start:key_start + key_length]), values_offset, size
+        position = end
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class MmapMetricsRegistry(MetricsRegistry):
+    """
+    Metrics registry backed by one memory-mapped file per worker process.
+    Each worker only writes to its own file, so recording stays a lock-free in-memory update
+    without any IPC. On scrape the files of all workers in the directory are merged:
+    counters and histograms are summed (including exited workers), gauges combine live workers only.
+    """
+
+    def __init__(self, directory: str, segment_bytes: int = 4 * 1024 * 1024):
+        super().__init__()
+        self.directory = directory
+        self.segment_bytes = segment_bytes
+        self._mmap: Optional[mmap.mmap] = None
+        self._used = 0
+        self._offsets: Dict[bytes, Tuple[int, int]] = {}
+        self._overflow_logged = False
+        os.makedirs(directory, exist_ok=True)
+        # A forked worker must not keep writing into the parent's file
+        os.register_at_fork(after_in_child=self._reset)
+
+    def _reset(self) -> None:
+        self._mmap = None
+        self._used = 0
+        self._offsets = {}
+        for metric in self._metrics.values():
+            metric._children.clear()
+
+    def _open(self) -> None:
+        path = os.path.join(self.directory, f"{_FILE_PREFIX}{os.getpid()}{_FILE_SUFFIX}")
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            if os.fstat(fd).st_size < self.segment_bytes:
+                os.ftruncate(fd, self.segment_bytes)
+            self._mmap = mmap.mmap(fd, self.segment_bytes)
+        finally:
+            os.close(fd)
+
+        # Continue an existing file (e.g. a reused pid) instead of overwriting it
+        self._used = _HEADER.unpack_from(self._mmap, 0)[0] or _HEADER.size
+        self._offsets = {
+            key: (offset, size) for key, offset, size in _iter_entries(self._mmap, self._used)
+        }
+        logger.info(f"Metrics storage mapped: {path}")
+
+    def allocate(self, name: str, labelvalues: Tuple[str, ...], size: int) -> MutableSequence[float]:
+        if self._mmap is None:
+            self._open()
+
+        key = _encode_key(name, labelvalues)
+        entry = self._offsets.get(key)
+        if entry is None:
+            entry = self._append(key, size)
+        if entry is None or entry[1] != size:
+            if not self._overflow_logged:
+                logger.warning(f"Metrics file in {self.directory} is full or inconsistent, {name} stays worker-local")
+                self._overflow_logged = True
+            return super().allocate(name, labelvalues, size)
+
+        offset, size = entry
+        return memoryview(self._mmap)[offset:offset + size * _VALUE_SIZE].cast("d")
+
+    def _append(self, key: bytes, size: int) -> Optional[Tuple[int, int]]:
+        values_offset = self._used + _ENTRY.size + _padded(len(key))
+        end = values_offset + size * _VALUE_SIZE
+        if end > self.segment_bytes:
+            return None
+
+        _ENTRY.pack_into(self._mmap, self._used, len(key), size)
+        self._mmap[self._used + _ENTRY.size:self._used + _ENTRY.size + len(key)] = key
+        self._mmap[values_offset:end] = bytes(end - values_offset)
+        # Publish the entry only once it is complete so readers never see a partial one
+        _HEADER.pack_into(self._mmap, 0, end)
+        self._used = end
+        self._offsets[key] = (values_offset, size)
+        return values_offset, size
+
+    def _read_files(self) -> Dict[str, Dict[Tuple[str, ...], List[Tuple[int, Sequence[float]]]]]:
+        """Read every worker file: metric name -> labelvalues -> [(pid, values)]"""
+        merged: Dict[str, Dict[Tuple[str, ...], List[Tuple[int, Sequence[float]]]]] = {}
+        for path in glob.glob(os.path.join(self.directory, f"{_FILE_PREFIX}*{_FILE_SUFFIX}")):
+            try:
+                pid = int(os.path.basename(path)[len(_FILE_PREFIX):-len(_FILE_SUFFIX)])
+                with open(path, "rb") as f:
+                    used = _HEADER.unpack(f.read(_HEADER.size))[0]
+                    f.seek(0)
+                    data = f.read(used)
+            except (OSError, ValueError, struct.error) as e:
+                logger.warning(f"Skipping metrics file {path}: {e}")
+                continue
+
+            for key, offset, size in _iter_entries(data, len(data)):
+                name, labelvalues = json.loads(key)
+                values = struct.unpack_from(f"<{size}d", data, offset)
+                merged.setdefault(name, {}).setdefault(tuple(labelvalues), []).append((pid, values))
+        return merged
+
+    def collect(self) -> List[Tuple[Metric, Mapping[Tuple[str, ...], Sequence[float]]]]:
+        merged = self._read_files()
+        alive: Dict[int, bool] = {}
+        result = []
+        for metric in self._metrics.values():
+            children: Dict[Tuple[str, ...], Sequence[float]] = {}
+            for labelvalues, per_worker in merged.get(metric.name, {}).items():
+                if isinstance(metric, Gauge):
+                    values = [
+                        worker_values for pid, worker_values in per_worker
+                        if alive.setdefault(pid, _pid_alive(pid))
+                    ]
+                    if not values:
+                        continue
+                    combine = {"sum": sum, "max": max, "min": min}[metric.multiprocess_mode]
+                    children[labelvalues] = [combine(v[0] for v in values)]
+                elif isinstance(metric, (Counter, Histogram)):
+                    children[labelvalues] = [sum(column) for column in zip(*(v for _, v in per_worker))]
+            # Series that did not fit into the shared file are still reported by this worker
+            for labelvalues, values in metric._children.items():
+                if not isinstance(values, memoryview):
+                    children.setdefault(labelvalues, values)
+            result.append((metric, children))
+        return result
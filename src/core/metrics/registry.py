@@ -0,0 +1,192 @@
+from bisect import bisect_left
+from typing import Dict, Iterator, List, Mapping, MutableSequence, Optional, Sequence, Tuple
+import logging
+
+from src.core.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+
+
+class Metric:
+    """
+    Base metric family with optional labels.
+    Values of each labelled child live in a flat float sequence allocated by the registry,
+    so recording is a plain index update without locks - it happens on the event loop thread.
+    """
+    type_name = "untyped"
+
+    def __init__(self, registry: 'MetricsRegistry', name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.registry = registry
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], MutableSequence[float]] = {}
+
+    def _values(self, labelvalues: Tuple[str, ...]) -> MutableSequence[float]:
+        values = self._children.get(labelvalues)
+        if values is None:
+            if len(labelvalues) != len(self.labelnames):
+                raise ValueError(f"Metric {self.name} expects labels {self.labelnames}, got {labelvalues}")
+            values = self.registry.allocate(self.name, labelvalues, self._size())
+            self._children[labelvalues] = values
+        return values
+
+    def _size(self) -> int:
+        return 1
+
+    def samples(
+        self, children: Mapping[Tuple[str, ...], Sequence[float]]
+    ) -> Iterator[Tuple[str, Tuple[Tuple[str, str], ...], float]]:
+        """Yield (sample name, label pairs, value) for exposition"""
+        for labelvalues, values in children.items():
+            yield self.name, tuple(zip(self.labelnames, labelvalues)), values[0]
+
+
+class Counter(Metric):
+    """Monotonically increasing value"""
+    type_name = "counter"
+
+    def inc(self, *labelvalues: str, amount: float = 1.0) -> None:
+        self._values(labelvalues)[0] += amount
+
+    def get(self, *labelvalues: str) -> float:
+        return self._values(labelvalues)[0]
+
+
+class Gauge(Metric):
+    """
+    Value that can go up and down.
+    ``multiprocess_mode`` ("sum", "max" or "min") defines how values of live workers are combined.
+    """
+    type_name = "gauge"
+
+    def __init__(
+        self,
+        registry: 'MetricsRegistry',
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        multiprocess_mode: str = "sum"
+    ):
+        super().__init__(registry, name, documentation, labelnames)
+        if multiprocess_mode not in ("sum", "max", "min"):
+            raise ValueError(f"Unknown multiprocess mode: {multiprocess_mode}")
+        self.multiprocess_mode = multiprocess_mode
+
+    def inc(self, *labelvalues: str, amount: float = 1.0) -> None:
+        self._values(labelvalues)[0] += amount
+
+    def dec(self, *labelvalues: str, amount: float = 1.0) -> None:
+        self._values(labelvalues)[0] -= amount
+
+    def set(self, value: float, *labelvalues: str) -> None:
+        self._values(labelvalues)[0] = value
+
+    def get(self, *labelvalues: str) -> float:
+        return self._values(labelvalues)[0]
+
+
+class Histogram(Metric):
+    """
+    Fixed-bucket histogram.
+    Values layout: one counter per bucket (non-cumulative, last one is +Inf) followed by the sum.
+    """
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        registry: 'MetricsRegistry',
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ):
+        super().__init__(registry, name, documentation, labelnames)
+        self.buckets = tuple(sorted(float(b) for b in buckets if b != float("inf")))
+
+    def _size(self) -> int:
+        return len(self.buckets) + 2
+
+    def observe(self, value: float, *labelvalues: str) -> None:
+        values = self._values(labelvalues)
+        values[bisect_left(self.buckets, value)] += 1
+        values[-1] += value
+
+    def samples(
+        self, children: Mapping[Tuple[str, ...], Sequence[float]]
+    ) -> Iterator[Tuple[str, Tuple[Tuple[str, str], ...], float]]:
+        bounds = [_format_bound(b) for b in self.buckets] + ["+Inf"]
+        for labelvalues, values in children.items():
+            labels = tuple(zip(self.labelnames, labelvalues))
+            cumulative = 0.0
+            for bound, bucket_count in zip(bounds, values):
+                cumulative += bucket_count
+                yield f"{self.name}_bucket", labels + (("le", bound),), cumulative
+            yield f"{self.name}_sum", labels, values[-1]
+            yield f"{self.name}_count", labels, cumulative
+
+
+def _format_bound(bound: float) -> str:
+    return repr(float(bound))
+
+
+class MetricsRegistry:
+    """In-process metrics registry"""
+
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+
+    def allocate(self, name: str, labelvalues: Tuple[str, ...], size: int) -> MutableSequence[float]:
+        """Allocate value storage for a new labelled child"""
+        return [0.0] * size
+
+    def _get_or_create(self, metric_class, name: str, documentation: str, labelnames: Sequence[str], **kwargs):
+        metric = self._metrics.get(name)
+        if metric is None:
+            metric = metric_class(self, name, documentation, labelnames, **kwargs)
+            self._metrics[name] = metric
+        elif not isinstance(metric, metric_class):
+            raise ValueError(f"Metric {name} already registered as {metric.type_name}")
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._get_or_create(Counter, name, documentation, labelnames)
+
+    def gauge(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        multiprocess_mode: str = "sum"
+    ) -> Gauge:
+        return self._get_or_create(Gauge, name, documentation, labelnames, multiprocess_mode=multiprocess_mode)
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Optional[Sequence[float]] = None
+    ) -> Histogram:
+        return self._get_or_create(
+            Histogram, name, documentation, labelnames, buckets=buckets or DEFAULT_BUCKETS
+        )
+
+    def collect(self) -> List[Tuple[Metric, Mapping[Tuple[str, ...], Sequence[float]]]]:
+        """Return every metric with the values of its labelled children"""
+        return [(metric, metric._children) for metric in self._metrics.values()]
+
+
+def _create_registry() -> MetricsRegistry:
+    if settings.metrics_multiprocess_dir:
+        from src.core.metrics.multiprocess import MmapMetricsRegistry
+        return MmapMetricsRegistry(settings.metrics_multiprocess_dir, settings.metrics_multiprocess_segment_bytes)
+    return MetricsRegistry()
+
+
+metrics_registry = _create_registry()
@@ -0,0 +1,14 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from src.core.config.settings import settings
+from src.core.metrics.exposition import CONTENT_TYPE_LATEST, generate_latest
+from src.core.metrics.registry import metrics_registry
+
+router = APIRouter()
+
+
+@router.get(settings.metrics_path, include_in_schema=False)
+def metrics():
+    """Prometheus scrape endpoint."""
+    return PlainTextResponse(generate_latest(metrics_registry), media_type=CONTENT_TYPE_LATEST)
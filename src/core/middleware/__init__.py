@@ -1,5 +1,7 @@
+from src.core.middleware.base import ASGIMiddleware, FusedMiddleware
 from src.core.middleware.request_id import RequestIdMiddleware
 from src.core.middleware.metrics import MetricsMiddleware
+from src.core.middleware.compression import CompressionMiddleware, no_compression
 from src.core.middleware.database import (
     BaseDbMiddleware,
     SQLAlchemyDbMiddleware,
@@ -9,8 +11,12 @@ from src.core.middleware.database import (
 )
 
 __all__ = [
+    "ASGIMiddleware",
+    "FusedMiddleware",
     "RequestIdMiddleware",
     "MetricsMiddleware",
+    "CompressionMiddleware",
+    "no_compression",
     "BaseDbMiddleware",
     "SQLAlchemyDbMiddleware",
     "MotorDbMiddleware",
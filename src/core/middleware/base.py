@@ -0,0 +1,86 @@
+import logging
+from abc import ABC
+from typing import Any, Dict, Sequence, Type
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+
+class ASGIMiddleware(ABC):
+    """
+    Base class for pure-ASGI HTTP middleware.
+    Subclasses implement lifecycle hooks instead of ``dispatch``, so no extra task
+    or response stream is created per request and streaming responses pass through untouched.
+    The same hooks are reused by ``FusedMiddleware`` to run several middlewares in one pass.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self._stages: Sequence['ASGIMiddleware'] = (self,)
+        self._reversed_stages: Sequence['ASGIMiddleware'] = (self,)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stages = self._stages
+        reversed_stages = self._reversed_stages
+        ctx: Dict[str, Any] = {
+            "scope": scope,
+            "state": scope.setdefault("state", {}),
+            "status_code": None,
+            "error": None,
+        }
+
+        for stage in stages:
+            await stage.on_request(scope, ctx)
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                ctx["status_code"] = message["status"]
+                for stage in reversed_stages:
+                    await stage.on_response_start(message, ctx)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception as e:
+            ctx["error"] = e
+            for stage in reversed_stages:
+                await stage.on_error(e, ctx)
+            raise
+        finally:
+            for stage in reversed_stages:
+                await stage.on_complete(ctx)
+
+    async def on_request(self, scope: Scope, ctx: Dict[str, Any]) -> None:
+        """Called before the request is passed to the application"""
+        pass
+
+    async def on_response_start(self, message: Message, ctx: Dict[str, Any]) -> None:
+        """Called with the ``http.response.start`` message before it is sent to the client"""
+        pass
+
+    async def on_error(self, error: Exception, ctx: Dict[str, Any]) -> None:
+        """Called when the application raises an exception"""
+        pass
+
+    async def on_complete(self, ctx: Dict[str, Any]) -> None:
+        """Always called after the application has finished - cleanup goes here"""
+        pass
+
+
+class FusedMiddleware(ASGIMiddleware):
+    """
+    Runs the hooks of several middlewares in a single ASGI layer.
+    ``middleware_classes`` are listed outermost first, matching the order
+    they would have when added one by one.
+    """
+
+    def __init__(self, app: ASGIApp, middleware_classes: Sequence[Type[ASGIMiddleware]]):
+        super().__init__(app)
+        self._stages = tuple(middleware_class(app) for middleware_class in middleware_classes)
+        self._reversed_stages = self._stages[::-1]
+        logger.info(f"Fused middleware: {', '.join(cls.__name__ for cls in middleware_classes)}")
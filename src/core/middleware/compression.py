@@ -0,0 +1,147 @@
+import zlib
+from typing import Callable, Optional, TypeVar
+
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.core.config.settings import settings
+
+EndpointT = TypeVar("EndpointT", bound=Callable)
+
+# Content types that are already compressed or must not be buffered
+UNCOMPRESSIBLE_PREFIXES = ("image/", "video/", "audio/", "application/zip", "application/gzip", "text/event-stream")
+
+
+def no_compression(endpoint: EndpointT) -> EndpointT:
+    """Opt a route out of response compression, apply below the route decorator"""
+    endpoint.no_compression = True
+    return endpoint
+
+
+def accepts_gzip(headers: Headers) -> bool:
+    """Whether the client Accept-Encoding allows gzip (q=0 disables it), an explicit gzip entry overrides *"""
+    gzip_q: Optional[float] = None
+    any_q: Optional[float] = None
+    for value in headers.getlist("accept-encoding"):
+        for item in value.split(","):
+            coding, *params = item.split(";")
+            coding = coding.strip().lower()
+            if coding not in ("gzip", "*"):
+                continue
+            q = 1.0
+            for param in params:
+                name, _, param_value = param.strip().partition("=")
+                if name.strip().lower() == "q":
+                    try:
+                        q = float(param_value)
+                    except ValueError:
+                        q = 0.0
+            if coding == "gzip":
+                gzip_q = q
+            else:
+                any_q = q
+    q = gzip_q if gzip_q is not None else any_q
+    return q is not None and q > 0
+
+
+class GzipCompressor:
+    """Incremental gzip stream, large chunks are compressed in the thread pool"""
+
+    def __init__(self, level: int, threadpool_min_size: int):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+        self._threadpool_min_size = threadpool_min_size
+
+    def _compress(self, data: bytes, final: bool) -> bytes:
+        flush_mode = zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH
+        return self._compressor.compress(data) + self._compressor.flush(flush_mode)
+
+    async def compress(self, data: bytes, final: bool) -> bytes:
+        if len(data) >= self._threadpool_min_size:
+            return await run_in_threadpool(self._compress, data, final)
+        return self._compress(data, final)
+
+
+class CompressionMiddleware:
+    """
+    Gzip responses for clients sending ``Accept-Encoding: gzip``.
+    Complete bodies are compressed only above ``minimum_size``; streaming bodies are
+    compressed chunk by chunk with a sync flush so clients receive data as it is produced.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = settings.compression_minimum_size,
+        level: int = settings.compression_level,
+        threadpool_min_size: int = settings.compression_threadpool_min_size
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.level = level
+        self.threadpool_min_size = threadpool_min_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not accepts_gzip(Headers(scope=scope)):
+            await self.app(scope, receive, send)
+            return
+
+        start_message: Optional[Message] = None
+        compressor: Optional[GzipCompressor] = None
+        passthrough = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal start_message, compressor, passthrough
+            message_type = message["type"]
+
+            if message_type == "http.response.start":
+                start_message = message
+                passthrough = not self._is_compressible(scope, message)
+                if passthrough:
+                    await send(message)
+                return
+
+            if passthrough or message_type != "http.response.body":
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            headers = MutableHeaders(scope=start_message) if start_message is not None else None
+
+            if compressor is None:
+                if not more_body and len(body) < self.minimum_size:
+                    # Complete body below the threshold - not worth the CPU
+                    passthrough = True
+                    await send(start_message)
+                    await send(message)
+                    return
+
+                compressor = GzipCompressor(self.level, self.threadpool_min_size)
+                headers["Content-Encoding"] = "gzip"
+                headers.add_vary_header("Accept-Encoding")
+                if more_body:
+                    del headers["Content-Length"]
+                else:
+                    body = await compressor.compress(body, final=True)
+                    headers["Content-Length"] = str(len(body))
+                    await send(start_message)
+                    await send({"type": "http.response.body", "body": body, "more_body": False})
+                    return
+                await send(start_message)
+
+            body = await compressor.compress(body, final=not more_body)
+            await send({"type": "http.response.body", "body": body, "more_body": more_body})
+
+        await self.app(scope, receive, send_wrapper)
+
+    @staticmethod
+    def _is_compressible(scope: Scope, message: Message) -> bool:
+        if getattr(scope.get("endpoint"), "no_compression", False):
+            return False
+        if message["status"] < 200 or message["status"] in (204, 304):
+            return False
+        headers = Headers(raw=message.get("headers", []))
+        if "content-encoding" in headers:
+            return False
+        return not headers.get("content-type", "").startswith(UNCOMPRESSIBLE_PREFIXES)
@@ -1,64 +1,70 @@
 import logging
 from abc import ABC, abstractmethod
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
-from starlette.responses import Response
+from typing import Any, Dict
+
+from starlette.types import Message, Receive, Scope, Send
+
+from src.core.context.timing import phase
+from src.core.middleware.base import ASGIMiddleware
+from src.infrastructure.database.transactions import discard_after_commit, run_after_commit, run_before_close
 
 logger = logging.getLogger(__name__)
 
 
-def _is_success_response(response: Response) -> bool:
+def _is_success_response(status_code: int) -> bool:
     """Check if response indicates success (2xx status codes)."""
-    return response.status_code // 200 == 1
+    return status_code // 200 == 1
 
 
-class BaseDbMiddleware(BaseHTTPMiddleware, ABC):
+class BaseDbMiddleware(ASGIMiddleware, ABC):
     """
     Base middleware for database session management.
     Handles common logic while allowing database-specific implementations.
+    The transaction is finished before the response headers are sent,
+    while cleanup waits until the response body has been fully streamed.
     """
 
-    async def dispatch(self, request: Request, call_next):
-        request.state.db_provider = None
-        request_id = getattr(request.state, 'request_id', 'unknown')
-
-        try:
-            # Process the request
-            response = await call_next(request)
-
-            # Handle successful response
-            db_provider = request.state.db_provider
-            if db_provider is not None:
-                await self._handle_success(db_provider, response, request_id)
-
-            return response
-
-        except Exception as e:
-            # Handle exceptions
-            db_provider = request.state.db_provider
-            if db_provider is not None:
-                await self._handle_error(db_provider, e, request_id)
-            raise
-
-        finally:
-            # Always cleanup
-            db_provider = request.state.db_provider
-            if db_provider is not None:
-                await self._cleanup(db_provider, request_id)
-            request.state.db_provider = None
+    async def on_request(self, scope: Scope, ctx: Dict[str, Any]) -> None:
+        state = ctx["state"]
+        state["db_provider"] = None
+        state["db_read_provider"] = None
+
+    async def on_response_start(self, message: Message, ctx: Dict[str, Any]) -> None:
+        # Handle successful response
+        db_provider = ctx["state"]["db_provider"]
+        if db_provider is not None:
+            await self._handle_success(db_provider, message["status"])
+
+    async def on_error(self, error: Exception, ctx: Dict[str, Any]) -> None:
+        # Handle exceptions
+        db_provider = ctx["state"]["db_provider"]
+        if db_provider is not None:
+            await self._handle_error(db_provider, error)
+
+    async def on_complete(self, ctx: Dict[str, Any]) -> None:
+        # Always cleanup, read-only providers have nothing to commit
+        state = ctx["state"]
+        db_provider = state["db_provider"]
+        if db_provider is not None:
+            await self._cleanup(db_provider)
+        db_read_provider = state["db_read_provider"]
+        if db_read_provider is not None:
+            await self._cleanup(db_read_provider)
+        state["db_provider"] = None
+        state["db_read_provider"] = None
 
     @abstractmethod
-    async def _handle_success(self, db_provider, response: Response, request_id: str):
+    async def _handle_success(self, db_provider, status_code: int):
         """Handle successful response - commit or log success"""
         pass
 
     @abstractmethod
-    async def _handle_error(self, db_provider, error: Exception, request_id: str):
+    async def _handle_error(self, db_provider, error: Exception):
         """Handle error response - rollback or log error"""
         pass
 
     @abstractmethod
-    async def _cleanup(self, db_provider, request_id: str):
+    async def _cleanup(self, db_provider):
         """Cleanup resources - close sessions or connections"""
         pass
 
@@ -66,56 +72,65 @@ class BaseDbMiddleware(BaseHTTPMiddleware, ABC):
 class SQLAlchemyDbMiddleware(BaseDbMiddleware):
     """SQLAlchemy-specific database middleware with transaction management"""
 
-    async def _handle_success(self, db_provider, response: Response, request_id: str):
+    async def _handle_success(self, db_provider, status_code: int):
         try:
-            if _is_success_response(response):
-                await db_provider.commit()
-                logger.info(f"[{request_id}] SQL transaction committed")
+            if _is_success_response(status_code):
+                with phase("db_commit"):
+                    await db_provider.commit()
+                logger.info("SQL transaction committed")
+                # Cache invalidation and similar side effects only once the data is visible
+                await run_after_commit(db_provider)
             else:
+                discard_after_commit(db_provider)
                 await db_provider.rollback()
-                logger.warning(f"[{request_id}] SQL transaction rolled back (status: {response.status_code})")
+                logger.warning(f"SQL transaction rolled back (status: {status_code})")
         except Exception as e:
-            logger.error(f"[{request_id}] Error during SQL transaction handling: {e}")
+            logger.error(f"Error during SQL transaction handling: {e}")
+            discard_after_commit(db_provider)
             await db_provider.rollback()
 
-    async def _handle_error(self, db_provider, error: Exception, request_id: str):
+    async def _handle_error(self, db_provider, error: Exception):
+        discard_after_commit(db_provider)
+        # Work still running on the session (batch loads of a cancelled request) must stop first
+        await run_before_close(db_provider)
         try:
             await db_provider.rollback()
-            logger.error(f"[{request_id}] SQL transaction rolled back due to exception: {error}")
+            logger.error(f"SQL transaction rolled back due to exception: {error}")
         except Exception as rollback_error:
-            logger.error(f"[{request_id}] Error during SQL rollback: {rollback_error}")
+            logger.error(f"Error during SQL rollback: {rollback_error}")
 
-    async def _cleanup(self, db_provider, request_id: str):
+    async def _cleanup(self, db_provider):
+        await run_before_close(db_provider)
         try:
             await db_provider.close()
-            logger.debug(f"[{request_id}] SQL session closed")
+            logger.debug("SQL session closed")
         except Exception as e:
-            logger.error(f"[{request_id}] Error closing SQL session: {e}")
+            logger.error(f"Error closing SQL session: {e}")
 
 
 class MotorDbMiddleware(BaseDbMiddleware):
     """MongoDB-specific database middleware"""
 
-    async def _handle_success(self, db_provider, response: Response, request_id: str):
-        if _is_success_response(response):
-            logger.debug(f"[{request_id}] MongoDB operation completed successfully")
+    async def _handle_success(self, db_provider, status_code: int):
+        if _is_success_response(status_code):
+            logger.debug("MongoDB operation completed successfully")
         else:
-            logger.warning(f"[{request_id}] MongoDB operation completed with error status: {response.status_code}")
+            logger.warning(f"MongoDB operation completed with error status: {status_code}")
 
-    async def _handle_error(self, db_provider, error: Exception, request_id: str):
-        logger.error(f"[{request_id}] MongoDB operation failed: {error}")
+    async def _handle_error(self, db_provider, error: Exception):
+        logger.error(f"MongoDB operation failed: {error}")
 
-    async def _cleanup(self, db_provider, request_id: str):
+    async def _cleanup(self, db_provider):
         # MongoDB connections are managed by the motor client, no explicit cleanup needed
-        logger.debug(f"[{request_id}] MongoDB operation cleanup completed")
+        logger.debug("MongoDB operation cleanup completed")
 
 
-class NoOpDbMiddleware(BaseHTTPMiddleware):
+class NoOpDbMiddleware(ASGIMiddleware):
     """No-operation middleware when no database is needed"""
 
-    async def dispatch(self, request: Request, call_next):
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         # Simply pass through without any database handling
-        return await call_next(request)
+        await self.app(scope, receive, send)
 
 
 class DbMiddlewareFactory:
@@ -1,78 +1,148 @@
 import os
 import time
 import logging
+from typing import Any, Dict
 
 from fastapi import HTTPException
+from starlette.datastructures import MutableHeaders
 from starlette.requests import Request
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.types import Message, Scope
 
 from src.core.config.settings import settings
+from src.core.context.queries import QueryStats, query_stats_var
+from src.core.context.timing import PhaseTimings, phase_timings_var
+from src.core.logs.sampling import should_log_request
+from src.core.profiling.slow_requests import slow_request_profiler
+from src.core.metrics.http import (
+    get_route_template,
+    http_requests_total,
+    http_request_duration_seconds,
+    http_requests_in_progress,
+    http_request_db_queries,
+    http_request_db_duration_seconds,
+    http_request_n_plus_one_total
+)
+from src.core.middleware.base import ASGIMiddleware
 
 logger = logging.getLogger(__name__)
 
 
-class MetricsMiddleware(BaseHTTPMiddleware):
+class MetricsMiddleware(ASGIMiddleware):
     """Enhanced metrics middleware with comprehensive request logging and exception catching."""
 
-    async def dispatch(self, request: Request, call_next):
+    async def on_request(self, scope: Scope, ctx: Dict[str, Any]) -> None:
         if not settings.metrics_enabled:
-            return await call_next(request)
+            ctx["metrics_start"] = None
+            return
 
-        start_time = time.perf_counter()
-        request_id = getattr(request.state, 'request_id', 'unknown')
-        process_id = os.getpid()
+        ctx["metrics_start"] = time.perf_counter()
+        http_requests_in_progress.inc(scope["method"])
 
-        # Collect request info
-        method = request.method
-        path = request.url.path
-        client_ip = self._get_client_ip(request) if settings.metrics_include_client_ip else None
-        user_agent = self._get_user_agent(request) if settings.metrics_include_user_agent else None
-
-        try:
-            # Process request
-            response = await call_next(request)
-
-            # Calculate timing
-            duration_ms = (time.perf_counter() - start_time) * 1000
-            status_code = response.status_code
-
-            # Log successful response
-            self._log_request(
-                request_id, process_id, method, path, status_code, duration_ms,
-                client_ip, user_agent, exception=None
-            )
-
-            return response
-
-        except HTTPException as http_exc:
-            # Calculate timing for HTTP exceptions
-            duration_ms = (time.perf_counter() - start_time) * 1000
+        if settings.phase_timing_enabled or settings.server_timing_header_enabled:
+            timings = PhaseTimings()
+            ctx["metrics_timings"] = timings
+            ctx["metrics_timings_token"] = phase_timings_var.set(timings)
+        else:
+            ctx["metrics_timings"] = None
 
-            # Log HTTP exception with metrics
-            self._log_request(
-                request_id, process_id, method, path, http_exc.status_code, duration_ms,
-                client_ip, user_agent, exception=http_exc
-            )
+        if settings.db_query_stats_enabled:
+            query_stats = QueryStats()
+            ctx["metrics_queries"] = query_stats
+            ctx["metrics_queries_token"] = query_stats_var.set(query_stats)
+        else:
+            ctx["metrics_queries"] = None
 
-            # Re-raise to let exception handlers format the response
-            raise
+        ctx["metrics_profile"] = slow_request_profiler.watch() if settings.profiling_slow_requests_enabled else None
 
-        except Exception as exc:
-            # Calculate timing for server errors
-            duration_ms = (time.perf_counter() - start_time) * 1000
+        # Collect request info
+        request = Request(scope)
+        ctx["metrics_client_ip"] = self._get_client_ip(request) if settings.metrics_include_client_ip else None
+        ctx["metrics_user_agent"] = self._get_user_agent(request) if settings.metrics_include_user_agent else None
+
+    async def on_response_start(self, message: Message, ctx: Dict[str, Any]) -> None:
+        timings = ctx.get("metrics_timings")
+        if timings is None:
+            return
+        timings.add("total", (time.perf_counter() - ctx["metrics_start"]) * 1000)
+        if settings.server_timing_header_enabled:
+            MutableHeaders(scope=message).append("Server-Timing", timings.server_timing())
+
+    async def on_complete(self, ctx: Dict[str, Any]) -> None:
+        start_time = ctx["metrics_start"]
+        if start_time is None:
+            return
+
+        timings = ctx["metrics_timings"]
+        if timings is not None:
+            phase_timings_var.reset(ctx["metrics_timings_token"])
+
+        query_stats = ctx["metrics_queries"]
+        if query_stats is not None:
+            query_stats_var.reset(ctx["metrics_queries_token"])
+            if not query_stats.count:
+                query_stats = None
+
+        if ctx["metrics_profile"] is not None:
+            await slow_request_profiler.finish(ctx["metrics_profile"])
+
+        # Calculate timing
+        duration_ms = (time.perf_counter() - start_time) * 1000
+        scope = ctx["scope"]
+        exception = ctx["error"]
+
+        if exception is None:
+            status_code = ctx["status_code"]
+        elif isinstance(exception, HTTPException):
+            # HTTP exceptions that escaped the exception handlers
+            status_code = exception.status_code
+        else:
+            # Server errors - the exception handlers will format a 500 response
+            status_code = 500
 
-            # Log server exception with metrics
+        self._record_metrics(scope, status_code, duration_ms)
+        if query_stats is not None:
+            self._record_query_metrics(scope, query_stats)
+        if should_log_request(scope, status_code, duration_ms, exception):
             self._log_request(
-                request_id, process_id, method, path, 500, duration_ms,
-                client_ip, user_agent, exception=exc
+                os.getpid(), scope["method"], scope["path"], status_code, duration_ms,
+                ctx["metrics_client_ip"], ctx["metrics_user_agent"], exception=exception,
+                phase_summary=timings.summary() if timings is not None else None,
+                query_summary=query_stats.summary() if query_stats is not None else None
             )
 
-            # Re-raise to let exception handlers format the response
-            raise
+    def _record_metrics(self, scope: Scope, status_code: int, duration_ms: float) -> None:
+        """Aggregate request metrics keyed by route template, method and status."""
+        method = scope["method"]
+        # Route template instead of the raw path keeps label cardinality bounded
+        route = get_route_template(scope)
+        status = str(status_code)
+
+        http_requests_in_progress.dec(method)
+        http_requests_total.inc(method, route, status)
+        http_request_duration_seconds.observe(duration_ms / 1000, method, route, status)
+
+    def _record_query_metrics(self, scope: Scope, query_stats: QueryStats) -> None:
+        """Record per-request SQL statistics and warn about statements repeated like an N+1 pattern."""
+        method = scope["method"]
+        route = get_route_template(scope)
+
+        http_request_db_queries.observe(query_stats.count, method, route)
+        http_request_db_duration_seconds.observe(query_stats.duration_ms / 1000, method, route)
+
+        threshold = settings.db_n_plus_one_threshold
+        if not threshold or query_stats.count <= threshold:
+            return
+        repeated = query_stats.repeated(threshold)
+        if repeated:
+            http_request_n_plus_one_total.inc(method, route)
+            for statement, count in repeated:
+                statement = " ".join(statement.split())[:200]
+                logger.warning(
+                    f"[pid:{os.getpid()}] Possible N+1 query: {method} {route} ran the same statement {count} times: {statement}"
+                )
 
     def _log_request(
         self,
-        request_id: str,
         process_id: int,
         method: str,
         path: str,
@@ -80,7 +150,9 @@ class MetricsMiddleware(BaseHTTPMiddleware):
         duration_ms: float,
         client_ip: str | None = None,
         user_agent: str | None = None,
-        exception: Exception | None = None
+        exception: Exception | None = None,
+        phase_summary: str | None = None,
+        query_summary: str | None = None
     ) -> None:
         """Unified request logging with appropriate log levels."""
 
@@ -89,8 +161,8 @@ class MetricsMiddleware(BaseHTTPMiddleware):
 
         # Build comprehensive log message
         log_message = self._build_log_message(
-            request_id, process_id, method, path, status_code, duration_ms,
-            client_ip, user_agent, exception
+            process_id, method, path, status_code, duration_ms,
+            client_ip, user_agent, exception, query_summary
         )
 
         # Log with appropriate level
@@ -100,7 +172,7 @@ class MetricsMiddleware(BaseHTTPMiddleware):
         if (not exception and
             settings.metrics_log_slow_requests and
             duration_ms > settings.metrics_slow_threshold_ms):
-            self._log_slow_request(request_id, process_id, method, path, duration_ms, client_ip)
+            self._log_slow_request(process_id, method, path, duration_ms, client_ip, phase_summary)
 
     def _get_log_level(self, status_code: int, exception: Exception | None = None) -> int:
         """Determine appropriate log level based on status code and exception type."""
@@ -122,7 +194,6 @@ class MetricsMiddleware(BaseHTTPMiddleware):
 
     def _build_log_message(
         self,
-        request_id: str,
         process_id: int,
         method: str,
         path: str,
@@ -130,7 +201,8 @@ class MetricsMiddleware(BaseHTTPMiddleware):
         duration_ms: float,
         client_ip: str | None = None,
         user_agent: str | None = None,
-        exception: Exception | None = None
+        exception: Exception | None = None,
+        query_summary: str | None = None
     ) -> str:
         """Build comprehensive log message with exception details."""
 
@@ -138,12 +210,14 @@ class MetricsMiddleware(BaseHTTPMiddleware):
         if exception:
             exc_type = type(exception).__name__
             exc_msg = str(exception)[:100]  # Truncate long exception messages
-            message = f"[{request_id}] [pid:{process_id}] {method} {path} - {status_code} - {duration_ms:.0f}ms - {exc_type}: {exc_msg}"
+            message = f"[pid:{process_id}] {method} {path} - {status_code} - {duration_ms:.0f}ms - {exc_type}: {exc_msg}"
         else:
-            message = f"[{request_id}] [pid:{process_id}] {method} {path} - {status_code} - {duration_ms:.0f}ms"
+            message = f"[pid:{process_id}] {method} {path} - {status_code} - {duration_ms:.0f}ms"
 
         # Add optional info
         extras = []
+        if query_summary:
+            extras.append(f"db:{query_summary}")
         if client_ip:
             extras.append(f"ip:{client_ip}")
         if user_agent:
@@ -180,16 +254,18 @@ class MetricsMiddleware(BaseHTTPMiddleware):
 
     def _log_slow_request(
         self,
-        request_id: str,
         process_id: int,
         method: str,
         path: str,
         duration_ms: float,
-        client_ip: str | None = None
+        client_ip: str | None = None,
+        phase_summary: str | None = None
     ) -> None:
         """Log slow requests with WARNING level for easy filtering."""
-        slow_message = f"[{request_id}] [pid:{process_id}] SLOW REQUEST: {method} {path} took {duration_ms:.0f}ms"
+        slow_message = f"[pid:{process_id}] SLOW REQUEST: {method} {path} took {duration_ms:.0f}ms"
         if client_ip:
             slow_message += f" from {client_ip}"
+        if phase_summary:
+            slow_message += f" - phases: {phase_summary}"
 
         logger.warning(slow_message)
@@ -1,20 +1,57 @@
-import uuid
+import time
 import logging
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
+from typing import Any, Dict
+
+from starlette.datastructures import URL, MutableHeaders
+from starlette.types import Message, Scope
+
+from src.core.config.settings import settings
+from src.core.context import request_id_var, generate_request_id, validate_request_id
+from src.core.logs.sampling import request_log_sampler, should_log_request
+from src.core.middleware.base import ASGIMiddleware
 
 logger = logging.getLogger(__name__)
 
+_REQUEST_ID_HEADER = b"x-request-id"
+
+
+class RequestIdMiddleware(ASGIMiddleware):
+    async def on_request(self, scope: Scope, ctx: Dict[str, Any]) -> None:
+        request_id = self._get_inbound_request_id(scope) if settings.request_id_trust_inbound else None
+        if request_id is None:
+            request_id = generate_request_id()
+        ctx["request_id_token"] = request_id_var.set(request_id)
+        # The 500 handler runs outside the middleware stack, after the context has been reset
+        ctx["state"]["request_id"] = request_id
+
+        message = f"Processing request: {scope['method']} {URL(scope=scope)}"
+        if request_log_sampler.enabled:
+            # Deferred until the sampling decision is known at completion
+            ctx["request_id_start_log"] = (time.perf_counter(), message)
+        else:
+            logger.info(message)
 
-class RequestIdMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        request_id = str(uuid.uuid4())
-        request.state.request_id = request_id
+    async def on_response_start(self, message: Message, ctx: Dict[str, Any]) -> None:
+        MutableHeaders(scope=message)["X-Request-ID"] = request_id_var.get()
 
-        logger.info(f"[{request_id}] Processing request: {request.method} {request.url}")
+    async def on_complete(self, ctx: Dict[str, Any]) -> None:
+        try:
+            start_log = ctx.get("request_id_start_log")
+            if start_log is not None:
+                start_time, message = start_log
+                duration_ms = (time.perf_counter() - start_time) * 1000
+                if not should_log_request(ctx["scope"], ctx["status_code"] or 500, duration_ms, ctx["error"]):
+                    return
+                logger.info(message)
 
-        response = await call_next(request)
-        response.headers["X-Request-ID"] = request_id
+            if ctx["error"] is None and ctx["status_code"] is not None:
+                logger.info(f"Request completed with status: {ctx['status_code']}")
+        finally:
+            request_id_var.reset(ctx["request_id_token"])
 
-        logger.info(f"[{request_id}] Request completed with status: {response.status_code}")
-        return response
+    def _get_inbound_request_id(self, scope: Scope) -> str | None:
+        """Reuse a valid X-Request-ID sent by the client or an upstream proxy"""
+        for name, value in scope["headers"]:
+            if name == _REQUEST_ID_HEADER:
+                return validate_request_id(value)
+        return None
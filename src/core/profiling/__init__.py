@@ -0,0 +1,17 @@
+from src.core.profiling.sampler import StackSampler, collapse_stack, format_stack, render_collapsed
+from src.core.profiling.slow_requests import SlowRequestProfiler, slow_request_profiler
+from src.core.profiling.loop_monitor import LoopLagMonitor, loop_lag_monitor
+from src.core.profiling.routes import router as profiling_router
+
+
+__all__ = [
+    "StackSampler",
+    "collapse_stack",
+    "format_stack",
+    "render_collapsed",
+    "SlowRequestProfiler",
+    "slow_request_profiler",
+    "LoopLagMonitor",
+    "loop_lag_monitor",
+    "profiling_router"
+]
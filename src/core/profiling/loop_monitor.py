@@ -0,0 +1,94 @@
+import asyncio
+import sys
+import threading
+import time
+from typing import Optional
+import logging
+
+from src.core.config.settings import settings
+from src.core.metrics.registry import metrics_registry
+from src.core.profiling.sampler import format_stack
+
+logger = logging.getLogger(__name__)
+
+event_loop_lag_seconds = metrics_registry.gauge(
+    "event_loop_lag_seconds",
+    "Event loop scheduling lag measured by the loop monitor",
+    multiprocess_mode="max"
+)
+event_loop_blocked_total = metrics_registry.counter(
+    "event_loop_blocked_total",
+    "Number of times the event loop lag exceeded the blocking threshold"
+)
+
+
+class LoopLagMonitor:
+    """
+    Measure event loop lag and report code blocking the loop.
+    A task on the loop sleeps for ``interval`` and records how late it wakes up.
+    A watchdog thread checks the task heartbeat; when the loop is stalled longer than
+    ``threshold`` it logs the loop thread stack while the blocking call is still running.
+    """
+
+    def __init__(self, interval_ms: float, threshold_ms: float):
+        self.interval = interval_ms / 1000
+        self.threshold = threshold_ms / 1000
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        self._loop_thread_id: Optional[int] = None
+        self._beat = 0.0
+        self._beat_count = 0
+
+    def start(self) -> None:
+        """Start monitoring the running loop"""
+        self._loop_thread_id = threading.get_ident()
+        self._beat = time.monotonic()
+        self._stop_event.clear()
+        self._task = asyncio.get_running_loop().create_task(self._run())
+        self._watchdog = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._watchdog.start()
+        logger.info(f"Event loop monitor started (threshold: {self.threshold * 1000:.0f}ms)")
+
+    async def stop(self) -> None:
+        self._stop_event.set()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._watchdog is not None:
+            await asyncio.to_thread(self._watchdog.join)
+            self._watchdog = None
+
+    async def _run(self) -> None:
+        while True:
+            self._beat = time.monotonic()
+            self._beat_count += 1
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, time.monotonic() - self._beat - self.interval)
+            event_loop_lag_seconds.set(lag)
+            if lag >= self.threshold:
+                event_loop_blocked_total.inc()
+
+    def _watch(self) -> None:
+        reported_beat = None
+        poll_interval = min(self.interval, self.threshold) / 2
+        while not self._stop_event.wait(poll_interval):
+            beat_count = self._beat_count
+            stalled = time.monotonic() - self._beat - self.interval
+            if stalled < self.threshold or beat_count == reported_beat:
+                continue
+            reported_beat = beat_count
+            frame = sys._current_frames().get(self._loop_thread_id)
+            logger.warning(
+                f"Event loop blocked for {stalled * 1000:.0f}ms, loop thread stack:\n{format_stack(frame)}"
+            )
+
+
+loop_lag_monitor = LoopLagMonitor(
+    interval_ms=settings.loop_monitor_interval_ms,
+    threshold_ms=settings.loop_monitor_threshold_ms
+)
@@ -0,0 +1,42 @@
+import asyncio
+import os
+import time
+
+from fastapi import APIRouter, HTTPException, Query, status
+from fastapi.responses import PlainTextResponse
+
+from src.core.config.settings import settings
+from src.core.dependencies import AdminJwtClientDep
+from src.core.profiling.sampler import StackSampler, render_collapsed
+from src.core.routing import TimedAPIRoute
+
+router = APIRouter(route_class=TimedAPIRoute)
+
+_profile_lock = asyncio.Lock()
+
+
+@router.get("/profile", response_class=PlainTextResponse)
+async def profile_process(
+    jwt_client: AdminJwtClientDep,
+    seconds: float = Query(10, gt=0, le=settings.profiling_max_seconds)
+):
+    """Profile the whole process for N seconds and return collapsed stacks (admin only)"""
+    if _profile_lock.locked():
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Profiling already in progress"
+        )
+
+    async with _profile_lock:
+        sampler = StackSampler(settings.profiling_interval_ms / 1000)
+        sampler.start()
+        try:
+            await asyncio.sleep(seconds)
+        finally:
+            counts = await asyncio.to_thread(sampler.stop)
+
+    filename = f"profile-{os.getpid()}-{int(time.time())}.collapsed"
+    return PlainTextResponse(
+        render_collapsed(counts),
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
@@ -0,0 +1,94 @@
+import os
+import sys
+import threading
+from collections import Counter
+from types import CodeType, FrameType
+from typing import Dict, Iterable, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+SAMPLER_THREAD_PREFIX = "stack-sampler"
+
+_frame_labels: Dict[CodeType, str] = {}
+_cwd = os.getcwd()
+
+
+def _frame_label(code: CodeType) -> str:
+    label = _frame_labels.get(code)
+    if label is None:
+        filename = code.co_filename
+        if filename.startswith(_cwd):
+            filename = filename[len(_cwd) + 1:]
+        label = f"{code.co_name} ({filename}:{code.co_firstlineno})".replace(";", ":")
+        _frame_labels[code] = label
+    return label
+
+
+def collapse_stack(frame: Optional[FrameType]) -> str:
+    """Stack of a frame in collapsed form (root first, frames separated by ';')"""
+    labels = []
+    while frame is not None:
+        labels.append(_frame_label(frame.f_code))
+        frame = frame.f_back
+    labels.reverse()
+    return ";".join(labels)
+
+
+def format_stack(frame: Optional[FrameType]) -> str:
+    """Stack of a frame as readable 'file:line in function' lines, innermost last"""
+    lines = []
+    while frame is not None:
+        code = frame.f_code
+        lines.append(f"  {code.co_filename}:{frame.f_lineno} in {code.co_name}")
+        frame = frame.f_back
+    lines.reverse()
+    return "\n".join(lines)
+
+
+def render_collapsed(counts: Counter) -> str:
+    """Collapsed stacks ('stack count' per line) - input for flamegraph.pl, speedscope and similar tools"""
+    return "".join(f"{stack} {count}\n" for stack, count in counts.most_common())
+
+
+class StackSampler:
+    """
+    Sampling profiler running on its own timer thread.
+    Every ``interval`` seconds it records the stack of each thread (optionally only ``thread_ids``)
+    with ``sys._current_frames``. Profiled code is not instrumented, so overhead is bounded by the interval.
+    """
+
+    def __init__(self, interval: float = 0.01, thread_ids: Optional[Iterable[int]] = None):
+        self.interval = interval
+        self.thread_ids = frozenset(thread_ids) if thread_ids is not None else None
+        self.counts: Counter = Counter()
+        self.samples = 0
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name=f"{SAMPLER_THREAD_PREFIX}-{id(self):x}", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> Counter:
+        """Stop sampling and return stack counts - blocks for at most one interval"""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        return self.counts
+
+    def _run(self) -> None:
+        while not self._stop_event.wait(self.interval):
+            names = {
+                thread.ident: thread.name for thread in threading.enumerate()
+                if thread.ident is not None
+            }
+            for thread_id, frame in sys._current_frames().items():
+                name = names.get(thread_id, str(thread_id))
+                if name.startswith(SAMPLER_THREAD_PREFIX):
+                    continue
+                if self.thread_ids is not None and thread_id not in self.thread_ids:
+                    continue
+                self.counts[f"{name};{collapse_stack(frame)}"] += 1
+            self.samples += 1
@@ -0,0 +1,81 @@
+import asyncio
+import os
+import threading
+import time
+from typing import Optional
+import logging
+
+from src.core.config.settings import settings
+from src.core.context import get_request_id
+from src.core.profiling.sampler import StackSampler, render_collapsed
+
+logger = logging.getLogger(__name__)
+
+
+class SlowRequestWatch:
+    """Profiling state of a single request"""
+    __slots__ = ("timer", "sampler", "thread_id")
+
+    def __init__(self, thread_id: int):
+        self.timer: Optional[asyncio.TimerHandle] = None
+        self.sampler: Optional[StackSampler] = None
+        self.thread_id = thread_id
+
+
+class SlowRequestProfiler:
+    """
+    Profile requests that exceed the slow-request threshold.
+    A timer is armed when the request starts; if the request is still running when it fires,
+    a StackSampler records the event loop thread running the request until it completes and the collapsed
+    stacks are written to ``output_dir``. Fast requests only pay for arming and cancelling the timer.
+    """
+
+    def __init__(self, threshold_ms: float, interval_ms: float, output_dir: str, max_concurrent: int = 2):
+        self.threshold = threshold_ms / 1000
+        self.interval = interval_ms / 1000
+        self.output_dir = output_dir
+        self.max_concurrent = max_concurrent
+        self._active = 0
+
+    def watch(self) -> SlowRequestWatch:
+        """Arm the timer, call from the request's event loop thread"""
+        watch = SlowRequestWatch(threading.get_ident())
+        watch.timer = asyncio.get_running_loop().call_later(self.threshold, self._start, watch)
+        return watch
+
+    def _start(self, watch: SlowRequestWatch) -> None:
+        if self._active >= self.max_concurrent:
+            return
+        self._active += 1
+        # Idle threadpool, log listener and monitor threads would only add noise
+        watch.sampler = StackSampler(self.interval, thread_ids=[watch.thread_id])
+        watch.sampler.start()
+
+    async def finish(self, watch: SlowRequestWatch) -> Optional[str]:
+        """Stop profiling the request, returns the profile path if one was captured"""
+        watch.timer.cancel()
+        if watch.sampler is None:
+            return None
+        try:
+            return await asyncio.to_thread(self._write_profile, watch.sampler)
+        finally:
+            self._active -= 1
+
+    def _write_profile(self, sampler: StackSampler) -> Optional[str]:
+        counts = sampler.stop()
+        if not counts:
+            return None
+        os.makedirs(self.output_dir, exist_ok=True)
+        path = os.path.join(self.output_dir, f"slow-{int(time.time())}-{get_request_id()}.collapsed")
+        with open(path, "w") as f:
+            f.write(render_collapsed(counts))
+        logger.warning(f"Slow request profile written to {path} ({sampler.samples} samples)")
+        return path
+
+
+slow_request_profiler = SlowRequestProfiler(
+    threshold_ms=settings.metrics_slow_threshold_ms,
+    interval_ms=settings.profiling_interval_ms,
+    output_dir=settings.profiling_output_dir,
+    max_concurrent=settings.profiling_max_concurrent
+)
@@ -0,0 +1,6 @@
+from src.core.routing.timed_route import TimedAPIRoute
+
+
+__all__ = [
+    "TimedAPIRoute"
+]
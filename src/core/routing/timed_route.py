@@ -0,0 +1,72 @@
+import functools
+import inspect
+import time
+from typing import Any, Callable, Coroutine
+
+from fastapi.routing import APIRoute
+from starlette.requests import Request
+from starlette.responses import Response
+
+from src.core.context.timing import phase_timings_var
+
+
+def _timed_endpoint(endpoint: Callable) -> Callable:
+    """Mark endpoint start and end in the request phase timings, keeping the endpoint signature"""
+    if inspect.iscoroutinefunction(endpoint):
+        @functools.wraps(endpoint)
+        async def async_wrapper(*args, **kwargs):
+            timings = phase_timings_var.get()
+            if timings is None:
+                return await endpoint(*args, **kwargs)
+            timings.endpoint_start = time.perf_counter()
+            try:
+                return await endpoint(*args, **kwargs)
+            finally:
+                timings.endpoint_end = time.perf_counter()
+        return async_wrapper
+
+    @functools.wraps(endpoint)
+    def sync_wrapper(*args, **kwargs):
+        timings = phase_timings_var.get()
+        if timings is None:
+            return endpoint(*args, **kwargs)
+        timings.endpoint_start = time.perf_counter()
+        try:
+            return endpoint(*args, **kwargs)
+        finally:
+            timings.endpoint_end = time.perf_counter()
+    return sync_wrapper
+
+
+class TimedAPIRoute(APIRoute):
+    """
+    Route splitting request handling into phases:
+    ``deps`` (body parsing and dependency resolution), ``endpoint`` and ``serialize``.
+    """
+
+    def __init__(self, path: str, endpoint: Callable[..., Any], **kwargs):
+        super().__init__(path, _timed_endpoint(endpoint), **kwargs)
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        handler = super().get_route_handler()
+
+        async def timed_handler(request: Request) -> Response:
+            timings = phase_timings_var.get()
+            if timings is None:
+                return await handler(request)
+
+            start = time.perf_counter()
+            try:
+                return await handler(request)
+            finally:
+                end = time.perf_counter()
+                if timings.endpoint_start is None:
+                    # Failed before the endpoint was called
+                    timings.add("deps", (end - start) * 1000)
+                else:
+                    endpoint_end = timings.endpoint_end or end
+                    timings.add("deps", (timings.endpoint_start - start) * 1000)
+                    timings.add("endpoint", (endpoint_end - timings.endpoint_start) * 1000)
+                    timings.add("serialize", (end - endpoint_end) * 1000)
+
+        return timed_handler
@@ -0,0 +1,26 @@
+from src.core.security.jwks import JwksKeySet, JwksRefresher, jwks_key_set
+from src.core.security.revocation import (
+    BloomFilter,
+    RevocationList,
+    RevocationSource,
+    FileRevocationSource,
+    DatabaseRevocationSource,
+    RevocationSourceFactory,
+    RevocationRefresher,
+    revocation_list
+)
+
+
+__all__ = [
+    "JwksKeySet",
+    "JwksRefresher",
+    "jwks_key_set",
+    "BloomFilter",
+    "RevocationList",
+    "RevocationSource",
+    "FileRevocationSource",
+    "DatabaseRevocationSource",
+    "RevocationSourceFactory",
+    "RevocationRefresher",
+    "revocation_list"
+]
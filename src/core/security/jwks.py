@@ -0,0 +1,126 @@
+import asyncio
+import json
+import os
+import threading
+from typing import Dict, Optional, Tuple
+import logging
+
+from jose import jwk
+from jose.backends.base import Key
+from jose.exceptions import JWKError
+
+from src.core.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+SUPPORTED_ALGORITHMS = ("RS256", "RS384", "RS512", "ES256", "ES384", "ES512")
+
+# Default algorithm for keys that do not declare "alg"
+_DEFAULT_ALGORITHMS = {"RSA": "RS256", "P-256": "ES256", "P-384": "ES384", "P-521": "ES512"}
+
+
+def _key_algorithm(key_data: dict) -> Optional[str]:
+    if "alg" in key_data:
+        return key_data["alg"]
+    if key_data.get("kty") == "EC":
+        return _DEFAULT_ALGORITHMS.get(key_data.get("crv"))
+    return _DEFAULT_ALGORITHMS.get(key_data.get("kty"))
+
+
+class JwksKeySet:
+    """
+    Public keys from a JWKS file, pre-parsed into key objects indexed by ``kid``.
+    ``get`` is a plain dict lookup; the file is only checked and parsed by ``reload_if_changed``,
+    called by JwksRefresher off the request path. A changed file is parsed into a new index that
+    replaces the old one in a single assignment, so lookups never see a partially loaded set.
+    A file that fails to parse keeps the previous keys.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._keys: Dict[str, Tuple[Key, str]] = {}
+        self._file_version: Optional[Tuple[int, int]] = None
+        self._reload_lock = threading.Lock()
+        self.reload_if_changed()
+
+    def get(self, kid: str) -> Optional[Tuple[Key, str]]:
+        """Key object and algorithm for a key id"""
+        return self._keys.get(kid)
+
+    def reload_if_changed(self) -> bool:
+        # Only one thread reloads, the others keep using the current keys
+        if not self._reload_lock.acquire(blocking=False):
+            return False
+        try:
+            try:
+                stat = os.stat(self.path)
+            except OSError as e:
+                logger.error(f"JWKS file unavailable, keeping {len(self._keys)} keys: {e}")
+                return False
+
+            version = (stat.st_mtime_ns, stat.st_size)
+            if version == self._file_version:
+                return False
+            keys = self._load()
+            if keys is None:
+                return False
+            self._keys = keys
+            self._file_version = version
+            logger.info(f"Loaded {len(keys)} JWKS keys from {self.path}")
+            return True
+        finally:
+            self._reload_lock.release()
+
+    def _load(self) -> Optional[Dict[str, Tuple[Key, str]]]:
+        try:
+            with open(self.path) as f:
+                key_set = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.error(f"Failed to read JWKS file {self.path}: {e}")
+            return None
+
+        keys = {}
+        for key_data in key_set.get("keys", []):
+            kid = key_data.get("kid")
+            algorithm = _key_algorithm(key_data)
+            if kid is None or algorithm not in SUPPORTED_ALGORITHMS or key_data.get("use", "sig") != "sig":
+                logger.warning(f"Skipping unsupported JWKS key: kid={kid}, alg={algorithm}")
+                continue
+            try:
+                keys[kid] = (jwk.construct(key_data, algorithm), algorithm)
+            except JWKError as e:
+                logger.warning(f"Skipping invalid JWKS key {kid}: {e}")
+        return keys
+
+
+class JwksRefresher:
+    """Background task reloading a changed JWKS file in a worker thread, never on the request path"""
+
+    def __init__(self, key_set: JwksKeySet, interval: float):
+        self.key_set = key_set
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        # The key set loaded the file on creation, only changes are picked up here
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await asyncio.to_thread(self.key_set.reload_if_changed)
+            except Exception as e:
+                logger.error(f"Failed to reload JWKS file {self.key_set.path}: {e}")
+
+
+jwks_key_set: Optional[JwksKeySet] = JwksKeySet(settings.jwt_jwks_file) if settings.jwt_jwks_file else None
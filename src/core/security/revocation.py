@@ -0,0 +1,190 @@
+import asyncio
+import math
+import os
+from abc import ABC, abstractmethod
+from typing import FrozenSet, Iterable, Optional, Tuple
+import logging
+
+from src.core.config.settings import settings
+from src.infrastructure.database.managers import BaseDbManager
+
+logger = logging.getLogger(__name__)
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter over strings.
+    Bit positions come from the string hash (cached by CPython on the str object) with double hashing,
+    so a lookup allocates nothing beyond small ints. No false negatives; false positives
+    at roughly ``false_positive_rate`` when holding ``capacity`` items.
+    """
+    __slots__ = ("_bits", "_size", "_hashes")
+
+    def __init__(self, capacity: int, false_positive_rate: float = 0.001):
+        capacity = max(capacity, 1)
+        size = max(64, int(-capacity * math.log(false_positive_rate) / math.log(2) ** 2))
+        self._size = size
+        self._hashes = max(1, round(size / capacity * math.log(2)))
+        self._bits = bytearray((size + 7) // 8)
+
+    def add(self, item: str) -> None:
+        h = hash(item)
+        h1 = h & 0xFFFFFFFF
+        h2 = ((h >> 32) & 0xFFFFFFFF) | 1
+        for i in range(self._hashes):
+            position = (h1 + i * h2) % self._size
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, item: str) -> bool:
+        h = hash(item)
+        h1 = h & 0xFFFFFFFF
+        h2 = ((h >> 32) & 0xFFFFFFFF) | 1
+        bits = self._bits
+        for i in range(self._hashes):
+            position = (h1 + i * h2) % self._size
+            if not bits[position >> 3] & (1 << (position & 7)):
+                return False
+        return True
+
+
+class RevocationList:
+    """
+    Revoked token ids (``jti`` or token digest) with a Bloom filter in front of the exact set.
+    The common "not revoked" answer is decided by the filter; ``replace`` builds a new snapshot
+    and swaps it in a single assignment, so lookups never see a partial list.
+    """
+
+    def __init__(self, false_positive_rate: float = 0.001):
+        self.false_positive_rate = false_positive_rate
+        self._snapshot: Tuple[BloomFilter, FrozenSet[str]] = (BloomFilter(1, false_positive_rate), frozenset())
+
+    def __len__(self) -> int:
+        return len(self._snapshot[1])
+
+    def is_revoked(self, token_id: str) -> bool:
+        bloom, revoked = self._snapshot
+        return token_id in bloom and token_id in revoked
+
+    def replace(self, token_ids: Iterable[str]) -> None:
+        revoked = frozenset(token_ids)
+        bloom = BloomFilter(len(revoked), self.false_positive_rate)
+        for token_id in revoked:
+            bloom.add(token_id)
+        self._snapshot = (bloom, revoked)
+
+
+class RevocationSource(ABC):
+    """Where revoked token ids are loaded from"""
+
+    @abstractmethod
+    async def load(self) -> Optional[FrozenSet[str]]:
+        """Current revoked ids, or None when unchanged since the last load"""
+        pass
+
+
+class FileRevocationSource(RevocationSource):
+    """Text file with one revoked token id per line, '#' starts a comment"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file_version: Optional[Tuple[int, int]] = None
+
+    async def load(self) -> Optional[FrozenSet[str]]:
+        return await asyncio.to_thread(self._load)
+
+    def _load(self) -> Optional[FrozenSet[str]]:
+        stat = os.stat(self.path)
+        version = (stat.st_mtime_ns, stat.st_size)
+        if version == self._file_version:
+            return None
+        with open(self.path) as f:
+            token_ids = frozenset(
+                line.split("#", 1)[0].strip() for line in f
+            ) - {""}
+        self._file_version = version
+        return token_ids
+
+
+class DatabaseRevocationSource(RevocationSource):
+    """Table (or collection) of the configured database with a ``jti`` column"""
+
+    def __init__(self, db_manager: BaseDbManager, table: str):
+        self.db_manager = db_manager
+        self.table = table
+
+    async def load(self) -> Optional[FrozenSet[str]]:
+        provider_type = self.db_manager.get_provider_type()
+        if provider_type == "sql":
+            from sqlalchemy import column, select, table
+
+            async with self.db_manager.get_db_provider() as session:
+                result = await session.execute(select(column("jti")).select_from(table(self.table)))
+                return frozenset(result.scalars())
+        if provider_type == "mongodb":
+            collection = self.db_manager.get_db_provider()[self.table]
+            return frozenset([document["jti"] async for document in collection.find({}, {"jti": 1})])
+        raise RuntimeError(f"Token revocation is not supported for database type: {provider_type}")
+
+
+def _create_file_source(db_manager: BaseDbManager, **config) -> FileRevocationSource:
+    path = config.get("jwt_revocation_file")
+    if not path:
+        raise ValueError("File revocation source requires jwt_revocation_file to be set")
+    return FileRevocationSource(path)
+
+
+class RevocationSourceFactory:
+    _sources = {
+        "file": _create_file_source,
+        "database": lambda db_manager, **config: DatabaseRevocationSource(db_manager, config["jwt_revocation_table"])
+    }
+
+    @classmethod
+    def create_source(cls, db_manager: BaseDbManager, **config) -> RevocationSource:
+        source_type = config.get("jwt_revocation_source")
+        if source_type not in cls._sources:
+            available = ", ".join(cls._sources.keys())
+            raise ValueError(f"Unknown revocation source: {source_type}. Available: {available}")
+        return cls._sources[source_type](db_manager, **config)
+
+
+class RevocationRefresher:
+    """Background task reloading the revocation list from its source, never on the request path"""
+
+    def __init__(self, revocation_list: RevocationList, source: RevocationSource, interval: float):
+        self.revocation_list = revocation_list
+        self.source = source
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        # Initial load before serving, so revoked tokens are rejected from the first request
+        await self.refresh()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def refresh(self) -> None:
+        try:
+            token_ids = await self.source.load()
+        except Exception as e:
+            logger.error(f"Failed to load revoked tokens, keeping {len(self.revocation_list)} entries: {e}")
+            return
+        if token_ids is not None:
+            self.revocation_list.replace(token_ids)
+            logger.info(f"Loaded {len(token_ids)} revoked tokens")
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.refresh()
+
+
+revocation_list = RevocationList(settings.jwt_revocation_false_positive_rate)
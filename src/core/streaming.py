@@ -0,0 +1,62 @@
+from dataclasses import dataclass
+from typing import AsyncIterator, Optional, Union
+import logging
+
+from starlette.responses import StreamingResponse
+from starlette.types import Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class OversizedLine:
+    """Stands in for an NDJSON line longer than the limit, its bytes were skipped without buffering"""
+    size: int
+
+
+async def ndjson_lines(
+    chunks: AsyncIterator[bytes],
+    max_line_bytes: Optional[int] = None
+) -> AsyncIterator[Union[bytes, OversizedLine]]:
+    """
+    Non-empty lines of an NDJSON byte stream, one line buffered at a time.
+    Lines longer than ``max_line_bytes`` are skipped up to their newline and reported as OversizedLine,
+    so a body without newlines cannot grow the buffer without bound.
+    """
+    buffer = b""
+    skipped = 0  # Bytes of the oversized line being skipped, 0 when not skipping
+    async for chunk in chunks:
+        if skipped:
+            end = chunk.find(b"\n")
+            if end < 0:
+                skipped += len(chunk)
+                continue
+            yield OversizedLine(skipped + end)
+            skipped = 0
+            chunk = chunk[end + 1:]
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            if max_line_bytes is not None and len(line) > max_line_bytes:
+                yield OversizedLine(len(line))
+            elif line.strip():
+                yield line
+        if max_line_bytes is not None and len(buffer) > max_line_bytes:
+            skipped, buffer = len(buffer), b""
+    if skipped:
+        yield OversizedLine(skipped)
+    elif buffer.strip():
+        yield buffer
+
+
+class RequestStreamingResponse(StreamingResponse):
+    """
+    StreamingResponse whose body is produced while the request body is still being read.
+    Starlette's disconnect listener would consume the request body messages, so it is not
+    started: the request stream raises ClientDisconnect on its own.
+    """
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
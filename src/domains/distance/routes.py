@@ -3,9 +3,10 @@ from fastapi import APIRouter
 from src.core.dependencies import RequestId
 from src.domains.distance.schemas import Point, DistanceResponse
 from src.core.dependencies import JwtClientDep
+from src.core.routing import TimedAPIRoute
 
 
-router = APIRouter()
+router = APIRouter(route_class=TimedAPIRoute)
 
 
 @router.post("", response_model=DistanceResponse, status_code=200)
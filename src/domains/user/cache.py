@@ -0,0 +1,113 @@
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Sequence, Tuple
+import logging
+import uuid
+
+from sqlalchemy import Row
+
+from src.core.cache import CacheBackend, CacheBackendFactory
+from src.core.cache.ttl_cache import cache_hits_total, cache_misses_total
+from src.core.config.settings import settings
+from src.domains.user.models import User
+from src.domains.user.repository import UserRepository
+from src.infrastructure.database.transactions import AfterCommitCallback
+
+logger = logging.getLogger(__name__)
+
+
+def _row_key(user_id: int) -> str:
+    return f"user:row:{user_id}"
+
+
+@dataclass(frozen=True)
+class _Invalidated:
+    """Tombstone left in place of an invalidated row, unique per invalidation"""
+    token: str
+
+
+class CachedUserRepository(UserRepository):
+    """
+    Read-through cache in front of a user repository.
+    Only the immutable row lookup is cached, ORM instances stay bound to their session.
+    Updates and deletes replace the cached row with a tombstone after their transaction commits,
+    so a concurrent reader cannot re-cache the old row from the still uncommitted transaction.
+    A reader only caches its row if no invalidation replaced the tombstone it saw while it was
+    loading, so a slow load cannot write back data older than the latest invalidation.
+    Hits and misses are counted here rather than by the backend, a tombstone is a miss. On a read replica the row loaded
+    right after an invalidation may still predate the write (replication lag) and is then
+    cached for the full TTL: keep the TTL within the staleness replica reads already accept.
+    """
+
+    def __init__(self, repository: UserRepository, backend: CacheBackend):
+        self.repository = repository
+        self.backend = backend
+
+    async def get_by_id(self, user_id: int) -> Optional[User]:
+        return await self.repository.get_by_id(user_id)
+
+    async def get_many_by_ids(self, user_ids: Iterable[int]) -> List[Optional[User]]:
+        return await self.repository.get_many_by_ids(user_ids)
+
+    async def get_row_by_id(self, user_id: int) -> Optional[Row]:
+        key = _row_key(user_id)
+        cached = await self.backend.get(key, count=False)
+        if cached is not None and not isinstance(cached, _Invalidated):
+            cache_hits_total.inc(self.backend.name)
+            return cached
+        cache_misses_total.inc(self.backend.name)
+        row = await self.repository.get_row_by_id(user_id)
+        if row is not None and await self.backend.get(key, count=False) == cached:
+            await self.backend.set(key, row)
+        return row
+
+    async def get_by_email(self, email: str) -> Optional[User]:
+        return await self.repository.get_by_email(email)
+
+    async def create(self, email: str, name: str, **kwargs) -> User:
+        return await self.repository.create(email, name, **kwargs)
+
+    async def update(self, user: User) -> User:
+        user = await self.repository.update(user)
+        self._invalidate_on_commit(user.id)
+        return user
+
+    async def bulk_upsert(self, values: List[Dict[str, Any]], update_existing: bool) -> List[Tuple[int, str]]:
+        results = await self.repository.bulk_upsert(values, update_existing)
+        for user_id, status in results:
+            if status == "updated":
+                self._invalidate_on_commit(user_id)
+        return results
+
+    async def delete(self, user: User) -> bool:
+        user_id = user.id
+        deleted = await self.repository.delete(user)
+        self._invalidate_on_commit(user_id)
+        return deleted
+
+    async def get_all(self, after_id: Optional[int] = None, limit: int = 100) -> List[Row]:
+        return await self.repository.get_all(after_id=after_id, limit=limit)
+
+    async def count(self) -> int:
+        return await self.repository.count()
+
+    def stream_all(self, batch_size: int = 1000) -> AsyncIterator[Sequence[Row]]:
+        return self.repository.stream_all(batch_size=batch_size)
+
+    async def commit(self) -> None:
+        await self.repository.commit()
+
+    def on_commit(self, callback: AfterCommitCallback) -> None:
+        self.repository.on_commit(callback)
+
+    def _invalidate_on_commit(self, user_id: int) -> None:
+        key = _row_key(user_id)
+        self.repository.on_commit(lambda: self.backend.set(key, _Invalidated(uuid.uuid4().hex)))
+
+
+user_cache_backend: Optional[CacheBackend] = CacheBackendFactory.create_backend(
+    settings.user_cache_backend,
+    "user",
+    max_size=settings.user_cache_max_size,
+    max_bytes=settings.user_cache_max_bytes,
+    ttl=settings.user_cache_ttl_seconds
+) if settings.user_cache_enabled else None
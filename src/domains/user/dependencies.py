@@ -1,26 +1,47 @@
 from fastapi import Depends, HTTPException
 from typing import Annotated
 
-from src.core.dependencies import DbProvider
-from src.domains.user.repository import UserRepositorySQLAlchemy
+from src.core.dependencies import DbProvider, ReadDbProvider
+from src.domains.user.cache import CachedUserRepository, user_cache_backend
+from src.domains.user.repository import UserRepository, UserRepositorySQLAlchemy
 from src.domains.user.service import UserService
 from src.domains.user.models import User
 
 
-def get_user_repository(db_provider: DbProvider) -> UserRepositorySQLAlchemy:
+def _with_cache(repository: UserRepository) -> UserRepository:
+    if user_cache_backend is None:
+        return repository
+    return CachedUserRepository(repository, user_cache_backend)
+
+
+def get_user_repository(db_provider: DbProvider) -> UserRepository:
     """Get user repository implementation"""
     if db_provider is None:
         raise HTTPException(500, "Database not configured")
-    return UserRepositorySQLAlchemy(db_provider)
+    return _with_cache(UserRepositorySQLAlchemy(db_provider))
+
+
+def get_user_read_repository(db_provider: ReadDbProvider) -> UserRepository:
+    """Get user repository on a read-only session (read replica when configured)"""
+    if db_provider is None:
+        raise HTTPException(500, "Database not configured")
+    return _with_cache(UserRepositorySQLAlchemy(db_provider))
 
 
 def get_user_service(
-    repository: UserRepositorySQLAlchemy = Depends(get_user_repository)
+    repository: UserRepository = Depends(get_user_repository)
 ) -> UserService:
     """Get user service with injected repository"""
     return UserService(repository)
 
 
+def get_user_read_service(
+    repository: UserRepository = Depends(get_user_read_repository)
+) -> UserService:
+    """Get user service for read-only routes"""
+    return UserService(repository)
+
+
 async def get_current_user(
     # TODO: Add JWT token validation
     # token: str = Depends(oauth2_scheme)
@@ -54,3 +75,4 @@ CurrentUserDep = Annotated[User, Depends(get_current_user)]
 CurrentActiveUserDep = Annotated[User, Depends(get_current_active_user)]
 CurrentAdminUserDep = Annotated[User, Depends(get_current_admin_user)]
 UserServiceDep = Annotated[UserService, Depends(get_user_service)]
+UserReadServiceDep = Annotated[UserService, Depends(get_user_read_service)]
@@ -0,0 +1,49 @@
+import csv
+import io
+import json
+from datetime import datetime
+from typing import Any, AsyncIterator, Callable, Dict, Sequence, Tuple
+
+from sqlalchemy import Row
+
+from src.domains.user.schemas import UserResponse
+
+EXPORT_FIELDS = tuple(UserResponse.model_fields)
+
+
+def _json_default(value: Any) -> str:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+async def ndjson_chunks(partitions: AsyncIterator[Sequence[Row]]) -> AsyncIterator[bytes]:
+    """One JSON object per line, one chunk per fetched partition"""
+    dumps = json.dumps
+    async for rows in partitions:
+        yield "".join(
+            dumps(row._asdict(), default=_json_default, separators=(",", ":")) + "\n" for row in rows
+        ).encode()
+
+
+async def csv_chunks(partitions: AsyncIterator[Sequence[Row]]) -> AsyncIterator[bytes]:
+    """Header line, then one chunk per fetched partition"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_FIELDS)
+    yield buffer.getvalue().encode()
+
+    async for rows in partitions:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(
+            tuple(value.isoformat() if isinstance(value, datetime) else value for value in row) for row in rows
+        )
+        yield buffer.getvalue().encode()
+
+
+# format -> (chunk encoder, media type)
+EXPORT_FORMATS: Dict[str, Tuple[Callable[[AsyncIterator[Sequence[Row]]], AsyncIterator[bytes]], str]] = {
+    "ndjson": (ndjson_chunks, "application/x-ndjson"),
+    "csv": (csv_chunks, "text/csv; charset=utf-8"),
+}
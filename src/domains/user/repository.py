@@ -1,8 +1,16 @@
 from abc import abstractmethod
-from typing import Protocol, Optional, List
+from typing import Any, AsyncIterator, Dict, Iterable, Protocol, Optional, List, Sequence, Tuple
+import asyncio
+
+from sqlalchemy import Row, bindparam, func, insert, inspect, select, update
+from sqlalchemy.orm.util import identity_key
 
 from src.domains.user.models import User
+from src.domains.user.schemas import UserResponse
+from src.core.concurrency import DataLoader
+from src.core.config.settings import settings
 from src.core.dependencies import DbProvider
+from src.infrastructure.database.transactions import AfterCommitCallback, after_commit, before_close, run_after_commit
 
 
 class UserRepository(Protocol):
@@ -12,6 +20,16 @@ class UserRepository(Protocol):
     async def get_by_id(self, user_id: int) -> Optional[User]:
         pass
 
+    @abstractmethod
+    async def get_many_by_ids(self, user_ids: Iterable[int]) -> List[Optional[User]]:
+        """Users in the order of ``user_ids``, None for missing ids"""
+        pass
+
+    @abstractmethod
+    async def get_row_by_id(self, user_id: int) -> Optional[Row]:
+        """Columns of UserResponse without building an ORM instance"""
+        pass
+
     @abstractmethod
     async def get_by_email(self, email: str) -> Optional[User]:
         pass
@@ -24,43 +42,214 @@ class UserRepository(Protocol):
     async def update(self, user: User) -> User:
         pass
 
+    @abstractmethod
+    async def bulk_upsert(self, values: List[Dict[str, Any]], update_existing: bool) -> List[Tuple[int, str]]:
+        """
+        Insert users with unique emails in one statement, existing emails are updated or skipped.
+        Inserts fill the column defaults, updates only write the keys present in each value.
+        Returns (id, "created" | "updated" | "skipped") in the order of ``values``.
+        """
+        pass
+
     @abstractmethod
     async def delete(self, user: User) -> bool:
         pass
 
     @abstractmethod
-    async def get_all(self, skip: int = 0, limit: int = 100) -> List[User]:
+    async def get_all(self, after_id: Optional[int] = None, limit: int = 100) -> List[Row]:
+        """Rows ordered by id, starting after ``after_id`` (keyset pagination)"""
         pass
 
     @abstractmethod
     async def count(self) -> int:
         pass
 
+    @abstractmethod
+    def stream_all(self, batch_size: int = 1000) -> AsyncIterator[Sequence[Row]]:
+        """All rows ordered by id, fetched from a server-side cursor in partitions of ``batch_size``"""
+        pass
+
+    @abstractmethod
+    async def commit(self) -> None:
+        """Commit now, for writes streamed after the DB middleware has already committed"""
+        pass
+
+    @abstractmethod
+    def on_commit(self, callback: AfterCommitCallback) -> None:
+        """Run callback after the current transaction commits, never if it rolls back"""
+        pass
+
 
 """sqlalchemy specified"""
+_users = User.__table__
+
+# Built once at import: Core select of the response columns only, its compiled form is
+# reused from the engine statement cache on every execution
+_select_user_rows = select(*(_users.c[name] for name in UserResponse.model_fields))
+_select_user_row_by_id = _select_user_rows.where(_users.c.id == bindparam("user_id"))
+
+# Keyset pages walk the primary key index, the cost of a page does not grow with its position
+_select_first_user_page = _select_user_rows.order_by(_users.c.id).limit(bindparam("limit"))
+_select_user_page = (
+    _select_user_rows.where(_users.c.id > bindparam("after_id")).order_by(_users.c.id).limit(bindparam("limit"))
+)
+_count_users = select(func.count()).select_from(_users)
+_select_users_by_ids = select(User).where(User.id.in_(bindparam("ids", expanding=True)))
+_select_users_by_emails = select(User).where(User.email.in_(bindparam("emails", expanding=True)))
+
+# Bulk writes: one existence lookup, one multi-row insert and one executemany update per chunk
+_select_ids_by_emails = select(_users.c.email, _users.c.id).where(_users.c.email.in_(bindparam("emails", expanding=True)))
+_insert_users = insert(_users).returning(_users.c.id, sort_by_parameter_order=True)
+_update_user_by_id = update(_users).where(_users.c.id == bindparam("user_id"))
+# Scalar column defaults, so rows that leave out optional fields still share one insert
+_insert_defaults = {
+    column.key: column.default.arg for column in _users.columns
+    if column.default is not None and column.default.is_scalar
+}
+_select_all_users = _select_user_rows.order_by(_users.c.id)
+
+LOADER_LOCK_KEY = "loader_lock"
+
+
 class UserRepositorySQLAlchemy(UserRepository):
     """SQLAlchemy implementation of user repository"""
 
     def __init__(self, session: DbProvider):
         self.session = session
+        # Per-session loaders: lookups awaited together (e.g. gathered) become one IN query
+        self._by_id_loader: Optional[DataLoader[int, User]] = None
+        self._by_email_loader: Optional[DataLoader[str, User]] = None
+        if settings.user_batch_loading_enabled:
+            # One lock per session: batches of both loaders (and of later ticks) must not
+            # execute on the session at the same time
+            options = dict(
+                max_batch_size=settings.user_loader_max_batch_size,
+                delay=settings.user_loader_batch_delay_ms / 1000,
+                lock=session.info.setdefault(LOADER_LOCK_KEY, asyncio.Lock())
+            )
+            self._by_id_loader = DataLoader(self._load_by_ids, "user_by_id", **options)
+            self._by_email_loader = DataLoader(self._load_by_emails, "user_by_email", **options)
+            # Batches run in their own tasks, they must not outlive the session
+            before_close(session, self._by_id_loader.close)
+            before_close(session, self._by_email_loader.close)
 
     async def get_by_id(self, user_id: int) -> User | None:
-        return await self.session.get(User, user_id)
+        if self._by_id_loader is None:
+            return await self.session.get(User, user_id)
+        user = self._loaded_user(user_id)
+        if user is not None:
+            return user
+        return await self._by_id_loader.load(user_id)
+
+    async def get_many_by_ids(self, user_ids: Iterable[int]) -> List[Optional[User]]:
+        user_ids = list(user_ids)
+        if self._by_id_loader is None:
+            result = await self.session.execute(_select_users_by_ids, {"ids": list(set(user_ids))})
+            users = {user.id: user for user in result.scalars()}
+            return [users.get(user_id) for user_id in user_ids]
+        users = {user_id: self._loaded_user(user_id) for user_id in user_ids}
+        missing = [user_id for user_id, user in users.items() if user is None]
+        users.update(zip(missing, await self._by_id_loader.load_many(missing)))
+        return [users[user_id] for user_id in user_ids]
+
+    def _loaded_user(self, user_id: int) -> Optional[User]:
+        """User already in the session identity map, like session.get without emitting SQL"""
+        user = self.session.identity_map.get(identity_key(User, user_id))
+        if user is None or inspect(user).expired_attributes:
+            # Expired instances must be refreshed by a query, lazy loads are not possible here
+            return None
+        return user
+
+    async def get_row_by_id(self, user_id: int) -> Row | None:
+        # Core execution on the session connection skips ORM compilation and the identity map
+        connection = await self.session.connection()
+        result = await connection.execute(_select_user_row_by_id, {"user_id": user_id})
+        return result.first()
 
     async def get_by_email(self, email: str) -> Optional[User]:
-        pass
+        if self._by_email_loader is None:
+            result = await self.session.execute(select(User).where(User.email == email))
+            return result.scalar_one_or_none()
+        return await self._by_email_loader.load(email)
+
+    async def _load_by_ids(self, user_ids: List[int]) -> Dict[int, User]:
+        result = await self.session.execute(_select_users_by_ids, {"ids": user_ids})
+        return {user.id: user for user in result.scalars()}
+
+    async def _load_by_emails(self, emails: List[str]) -> Dict[str, User]:
+        result = await self.session.execute(_select_users_by_emails, {"emails": emails})
+        return {user.email: user for user in result.scalars()}
 
     async def create(self, email: str, name: str, **kwargs) -> User:
-        pass
+        user = User(email=email, name=name, **kwargs)
+        self.session.add(user)
+        await self.session.flush()
+        # Load server-side defaults (created_at) while still in async context
+        await self.session.refresh(user)
+        return user
 
     async def update(self, user: User) -> User:
-        pass
+        await self.session.flush()
+        # Load server-side onupdate values (updated_at)
+        await self.session.refresh(user)
+        return user
+
+    async def bulk_upsert(self, values: List[Dict[str, Any]], update_existing: bool) -> List[Tuple[int, str]]:
+        connection = await self.session.connection()
+        result = await connection.execute(_select_ids_by_emails, {"emails": [value["email"] for value in values]})
+        existing: Dict[str, int] = dict(result.all())
+
+        new_values = [value for value in values if value["email"] not in existing]
+        created: Dict[str, int] = {}
+        if new_values:
+            result = await connection.execute(_insert_users, [{**_insert_defaults, **value} for value in new_values])
+            created = {value["email"]: user_id for value, user_id in zip(new_values, result.scalars())}
+        if update_existing and existing:
+            # executemany sets the columns of its first row, rows writing other columns need their own statement
+            updates: Dict[frozenset, List[Dict[str, Any]]] = {}
+            for value in values:
+                if value["email"] in existing:
+                    updates.setdefault(frozenset(value), []).append({"user_id": existing[value["email"]], **value})
+            for rows in updates.values():
+                await connection.execute(_update_user_by_id, rows)
+
+        existing_status = "updated" if update_existing else "skipped"
+        return [
+            (created[value["email"]], "created") if value["email"] in created
+            else (existing[value["email"]], existing_status)
+            for value in values
+        ]
 
     async def delete(self, user: User) -> bool:
-        pass
-
-    async def get_all(self, skip: int = 0, limit: int = 100) -> List[User]:
-        pass
+        await self.session.delete(user)
+        await self.session.flush()
+        return True
+
+    async def get_all(self, after_id: Optional[int] = None, limit: int = 100) -> List[Row]:
+        connection = await self.session.connection()
+        if after_id is None:
+            result = await connection.execute(_select_first_user_page, {"limit": limit})
+        else:
+            result = await connection.execute(_select_user_page, {"after_id": after_id, "limit": limit})
+        return result.all()
 
     async def count(self) -> int:
-        pass
+        result = await self.session.execute(_count_users)
+        return result.scalar_one()
+
+    async def stream_all(self, batch_size: int = 1000) -> AsyncIterator[Sequence[Row]]:
+        # Only one partition is buffered at a time, memory does not grow with the table
+        connection = await self.session.connection()
+        result = await connection.stream(_select_all_users.execution_options(yield_per=batch_size))
+        try:
+            async for rows in result.partitions():
+                yield rows
+        finally:
+            await result.close()
+
+    async def commit(self) -> None:
+        await self.session.commit()
+        await run_after_commit(self.session)
+
+    def on_commit(self, callback: AfterCommitCallback) -> None:
+        after_commit(self.session, callback)
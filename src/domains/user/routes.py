@@ -1,15 +1,24 @@
-from fastapi import APIRouter, HTTPException, status
-from typing import List
-
-from src.core.dependencies import RequestId
-from src.domains.user.schemas import UserResponse, UserCreate, UserUpdate
+from typing import Any, AsyncIterator, Literal
+import json
+
+from fastapi import APIRouter, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
+
+from src.core.config.settings import settings
+from src.core.dependencies import AdminJwtClientDep, Pagination, RequestId, encode_cursor
+from src.core.routing import TimedAPIRoute
+from src.core.streaming import RequestStreamingResponse, ndjson_lines
+from src.domains.user.export import EXPORT_FORMATS
+from src.domains.user.schemas import UserPage, UserResponse, UserCreate, UserUpdate
 from src.domains.user.dependencies import (
     UserServiceDep,
+    UserReadServiceDep,
     CurrentUserDep,
     CurrentAdminUserDep
 )
 
 router = APIRouter(
+    route_class=TimedAPIRoute,
     # prefix="/users",
     # tags=["users"],
     # responses={
@@ -20,15 +29,41 @@ router = APIRouter(
 )
 
 
-@router.get("/", response_model=List[UserResponse])
+@router.get("/", response_model=UserPage)
 async def get_users(
-    # pagination: Pagination,
-    user_service: UserServiceDep,
-    current_user: CurrentAdminUserDep,  # Only admins can list all users
+    pagination: Pagination,
+    user_service: UserReadServiceDep,
+    current_admin: AdminJwtClientDep,  # Only admins can list all users
     request_id: RequestId
 ):
-    """Get all users with pagination (admin only)"""
-    pass
+    """Get all users with cursor pagination (admin only)"""
+    users, next_id = await user_service.get_users(
+        after_id=pagination.after_key("id", int), limit=pagination.limit
+    )
+    return {
+        "items": users,
+        "next_cursor": encode_cursor({"id": next_id}) if next_id is not None else None,
+        "total": await user_service.get_users_count()
+    }
+
+
+@router.get("/export", response_class=StreamingResponse)
+async def export_users(
+    user_service: UserReadServiceDep,
+    current_admin: AdminJwtClientDep,  # Only admins can export users
+    request_id: RequestId,
+    format: Literal["ndjson", "csv"] = Query("ndjson")
+):
+    """
+    Stream all users as NDJSON or CSV (admin only).
+    The read session stays open until the body is sent, the DB middleware closes it afterwards.
+    """
+    encode, media_type = EXPORT_FORMATS[format]
+    return StreamingResponse(
+        encode(user_service.stream_users(batch_size=settings.user_export_batch_size)),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="users.{format}"'}
+    )
 
 
 @router.get("/me", response_model=UserResponse)
@@ -43,10 +78,11 @@ async def get_current_user_profile(
 @router.get("/{user_id}", response_model=UserResponse)
 async def get_user(
     user_id: int,
-    user_service: UserServiceDep,
+    user_service: UserReadServiceDep,
     request_id: RequestId
 ):
-    user = await user_service.get_user_by_id(user_id)
+    # Row validated once into UserResponse by the response model
+    user = await user_service.get_user_row_by_id(user_id)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -62,7 +98,72 @@ async def create_user(
     request_id: RequestId
 ):
     """Create new user (public endpoint)"""
-    pass
+    if await user_service.get_user_by_email(user_data.email):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=[{"msg": "A user with this email already exists."}],
+        )
+    return await user_service.create_user(user_data)
+
+
+@router.post("/bulk", response_class=StreamingResponse)
+async def bulk_upsert_users(
+    request: Request,
+    user_service: UserServiceDep,
+    current_admin: AdminJwtClientDep,  # Only admins can import users
+    request_id: RequestId,
+    on_conflict: Literal["skip", "update"] = Query("skip", description="What to do with existing emails")
+):
+    """
+    Create or update users in bulk (admin only).
+    Accepts an NDJSON stream of UserCreate objects, read incrementally with lines limited to
+    ``user_bulk_ndjson_max_line_bytes``, or a JSON array, which is parsed whole and limited to
+    ``user_bulk_json_max_bytes``: large imports must use NDJSON.
+    With on_conflict=update, existing users get only the fields present in their record.
+    Streams one NDJSON result per input record: index, status (created, updated, skipped or
+    invalid), id and email, or errors. Every chunk is committed on its own, so a failure leaves
+    earlier chunks in place.
+    """
+    if request.headers.get("content-type", "").startswith(("application/x-ndjson", "application/jsonl")):
+        records = ndjson_lines(request.stream(), max_line_bytes=settings.user_bulk_ndjson_max_line_bytes)
+    else:
+        body = await _read_body(request, settings.user_bulk_json_max_bytes)
+        try:
+            items = json.loads(body)
+        except json.JSONDecodeError:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Body must be a JSON array")
+        if not isinstance(items, list):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Body must be a JSON array")
+        records = _iterate(items)
+
+    async def results() -> AsyncIterator[bytes]:
+        async for chunk in user_service.bulk_upsert_users(
+            records, update_existing=on_conflict == "update", chunk_size=settings.user_bulk_chunk_size
+        ):
+            yield "".join(json.dumps(result, separators=(",", ":")) + "\n" for result in chunk).encode()
+
+    return RequestStreamingResponse(results(), media_type="application/x-ndjson")
+
+
+async def _read_body(request: Request, max_bytes: int) -> bytes:
+    """Request body, rejected as soon as it grows past ``max_bytes``"""
+    too_large = HTTPException(
+        status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+        detail=f"JSON array bodies are limited to {max_bytes} bytes, send large imports as NDJSON"
+    )
+    if int(request.headers.get("content-length") or 0) > max_bytes:
+        raise too_large
+    body = bytearray()
+    async for chunk in request.stream():
+        body += chunk
+        if len(body) > max_bytes:
+            raise too_large
+    return bytes(body)
+
+
+async def _iterate(items: list) -> AsyncIterator[Any]:
+    for item in items:
+        yield item
 
 
 @router.put("/me", response_model=UserResponse)
@@ -81,19 +182,36 @@ async def update_user(
     user_id: int,
     user_data: UserUpdate,
     user_service: UserServiceDep,
-    current_admin: CurrentAdminUserDep,  # Only admins can update other users
+    current_admin: AdminJwtClientDep,  # Only admins can update other users
     request_id: RequestId
 ):
     """Update user (admin only)"""
-    pass
+    if user_data.email is not None:
+        existing = await user_service.get_user_by_email(user_data.email)
+        if existing is not None and existing.id != user_id:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=[{"msg": "A user with this email already exists."}],
+            )
+    user = await user_service.update_user(user_id, user_data)
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=[{"msg": "A user with this id does not exist."}],
+        )
+    return user
 
 
-@router.delete("/{user_id}")
+@router.delete("/{user_id}", status_code=204)
 async def delete_user(
     user_id: int,
     user_service: UserServiceDep,
-    current_admin: CurrentAdminUserDep,  # Only admins can delete users
+    current_admin: AdminJwtClientDep,  # Only admins can delete users
     request_id: RequestId
 ):
     """Delete user (admin only)"""
-    pass
+    if not await user_service.delete_user(user_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=[{"msg": "A user with this id does not exist."}],
+        )
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, ConfigDict, EmailStr, Field
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 
 
@@ -33,3 +33,10 @@ class UserResponse(UserBase):
     is_admin: bool = Field(..., description="Whether the user is an admin")
     created_at: datetime = Field(..., description="User creation timestamp")
     updated_at: Optional[datetime] = Field(None, description="User last update timestamp")
+
+
+class UserPage(BaseModel):
+    """Keyset page of users"""
+    items: List[UserResponse] = Field(..., description="Users ordered by id")
+    next_cursor: Optional[str] = Field(None, description="Cursor for the next page, null on the last page")
+    total: int = Field(..., description="Approximate total number of users")
@@ -1,9 +1,29 @@
-from typing import List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple
 
+from pydantic import ValidationError
+from sqlalchemy import Row
+
+from src.core.cache import CachedCount
+from src.core.concurrency import SingleFlight
+from src.core.config.settings import settings
+from src.core.streaming import OversizedLine
 from src.domains.user.models import User
 from src.domains.user.repository import UserRepository
 from src.domains.user.schemas import UserCreate, UserUpdate
 
+# Exact COUNT(*) scans the table, listings show this total instead
+_users_count = CachedCount("user_count", ttl=settings.user_count_cache_ttl_seconds)
+
+# Concurrent lookups of a hot id share one query, rows are immutable and safe to hand to every caller.
+# Updates and deletes forget the id's flight after commit: a lookup started before the commit may still
+# return the old row to its own callers, but lookups arriving after the commit never join it.
+_user_row_flight: SingleFlight[int, Optional[Row]] = SingleFlight("user_row")
+
+
+def _forget_user_rows(user_ids: List[int]) -> None:
+    for user_id in user_ids:
+        _user_row_flight.forget(user_id)
+
 
 class UserService:
     """User business logic service"""
@@ -14,30 +34,136 @@ class UserService:
     async def get_user_by_id(self, user_id: int) -> User | None:
         return await self.repository.get_by_id(user_id)
 
+    async def get_users_by_ids(self, user_ids: List[int]) -> List[Optional[User]]:
+        """Users in the order of user_ids, None for missing ids, loaded in batched queries"""
+        return await self.repository.get_many_by_ids(user_ids)
+
+    async def get_user_row_by_id(self, user_id: int) -> Row | None:
+        """Read-only user lookup returning a lightweight row with the response fields"""
+        if not settings.user_lookup_coalescing_enabled:
+            return await self.repository.get_row_by_id(user_id)
+        return await _user_row_flight.do(user_id, lambda: self.repository.get_row_by_id(user_id))
+
     async def get_user_by_email(self, email: str) -> Optional[User]:
         """Get user by email"""
-        pass
+        return await self.repository.get_by_email(email)
 
     async def create_user(self, user_data: UserCreate) -> User:
         """Create new user with business validation"""
-        pass
+        user = await self.repository.create(**user_data.model_dump())
+        self.repository.on_commit(lambda: _users_count.adjust(1))
+        return user
 
-    async def update_user(self, user_id: int, user_data: UserUpdate) -> User:
-        """Update existing user"""
-        pass
+    async def update_user(self, user_id: int, user_data: UserUpdate) -> Optional[User]:
+        """Update existing user, None when it does not exist"""
+        user = await self.repository.get_by_id(user_id)
+        if user is None:
+            return None
+        for field, value in user_data.model_dump(exclude_unset=True).items():
+            setattr(user, field, value)
+        user = await self.repository.update(user)
+        self.repository.on_commit(lambda: _user_row_flight.forget(user_id))
+        return user
 
     async def delete_user(self, user_id: int) -> bool:
         """Delete user by ID"""
-        pass
+        user = await self.repository.get_by_id(user_id)
+        if user is None:
+            return False
+        await self.repository.delete(user)
+        self.repository.on_commit(lambda: _users_count.adjust(-1))
+        self.repository.on_commit(lambda: _user_row_flight.forget(user_id))
+        return True
 
-    async def get_users(self, skip: int = 0, limit: int = 100) -> List[User]:
-        """Get paginated list of users"""
-        pass
+    async def get_users(self, after_id: Optional[int] = None, limit: int = 100) -> Tuple[List[Row], Optional[int]]:
+        """Page of users ordered by id with the id to continue after, None on the last page"""
+        # One extra row tells whether another page exists without a COUNT
+        rows = await self.repository.get_all(after_id=after_id, limit=limit + 1)
+        if len(rows) > limit:
+            return rows[:limit], rows[limit - 1].id
+        return rows, None
+
+    def stream_users(self, batch_size: int = 1000) -> AsyncIterator[Sequence[Row]]:
+        """All users ordered by id in partitions, for exports"""
+        return self.repository.stream_all(batch_size=batch_size)
 
     async def get_users_count(self) -> int:
-        """Get total number of users"""
-        pass
+        """Approximate total number of users, exact as of the last reload plus local creates and deletes"""
+        return await _users_count.get(self.repository.count)
+
+    async def bulk_upsert_users(
+        self,
+        records: AsyncIterator[Any],
+        update_existing: bool = False,
+        chunk_size: int = 1000
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Create users from raw records (dicts or JSON lines), updating or skipping existing emails.
+        Each chunk is validated, written and committed on its own, only one chunk is held in memory.
+        Yields the results of each chunk, one per record in input order.
+        """
+        chunk: List[Tuple[int, Any]] = []
+        index = 0
+        async for record in records:
+            chunk.append((index, record))
+            index += 1
+            if len(chunk) >= chunk_size:
+                yield await self._upsert_chunk(chunk, update_existing)
+                chunk = []
+        if chunk:
+            yield await self._upsert_chunk(chunk, update_existing)
+
+    async def _upsert_chunk(self, chunk: List[Tuple[int, Any]], update_existing: bool) -> List[Dict[str, Any]]:
+        results: Dict[int, Dict[str, Any]] = {}
+        valid: Dict[str, Tuple[int, UserCreate]] = {}
+        for index, user_data, errors in self._validate_users(chunk):
+            if errors:
+                results[index] = {"index": index, "status": "invalid", "errors": errors}
+            elif user_data.email in valid:
+                results[index] = {"index": index, "status": "invalid", "errors": ["Duplicate email in input"]}
+            else:
+                valid[user_data.email] = (index, user_data)
+
+        if valid:
+            # Only the fields present in the record, an update must not reset omitted ones to their defaults
+            written = await self.repository.bulk_upsert(
+                [user_data.model_dump(exclude_unset=True) for _, user_data in valid.values()], update_existing
+            )
+            created = 0
+            updated: List[int] = []
+            for (email, (index, _)), (user_id, status) in zip(valid.items(), written):
+                results[index] = {"index": index, "status": status, "id": user_id, "email": email}
+                created += status == "created"
+                if status == "updated":
+                    updated.append(user_id)
+            if created:
+                self.repository.on_commit(lambda: _users_count.adjust(created))
+            if updated:
+                self.repository.on_commit(lambda: _forget_user_rows(updated))
+            await self.repository.commit()
+
+        return [results[index] for index, _ in chunk]
+
+    def _validate_users(self, chunk: List[Tuple[int, Any]]):
+        """Validate a chunk of raw records, yields (index, user data or None, error messages)"""
+        for index, record in chunk:
+            if isinstance(record, OversizedLine):
+                yield index, None, [f"record: line of {record.size} bytes exceeds the size limit"]
+                continue
+            try:
+                if isinstance(record, (bytes, str)):
+                    user_data = UserCreate.model_validate_json(record)
+                else:
+                    user_data = UserCreate.model_validate(record)
+                self._validate_user_data(user_data)
+            except ValidationError as e:
+                yield index, None, [f"{'.'.join(map(str, error['loc'])) or 'record'}: {error['msg']}" for error in e.errors()]
+            except ValueError as e:
+                yield index, None, [str(e)]
+            else:
+                yield index, user_data, []
 
     def _validate_user_data(self, user_data: UserCreate) -> None:
         """Validate business rules for user creation"""
-        pass
+        if not user_data.name.strip():
+            raise ValueError("name: must not be blank")
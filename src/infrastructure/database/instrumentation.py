@@ -0,0 +1,33 @@
+import time
+from typing import TYPE_CHECKING
+
+from src.core.context.queries import query_stats_var
+from src.core.context.timing import phase_timings_var
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncEngine
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    if query_stats_var.get() is not None:
+        context.query_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    stats = query_stats_var.get()
+    if stats is None:
+        return
+    duration_ms = (time.perf_counter() - context.query_start) * 1000
+    stats.record(statement, duration_ms)
+
+    timings = phase_timings_var.get()
+    if timings is not None:
+        timings.add("db", duration_ms)
+
+
+def instrument_queries(engine: 'AsyncEngine') -> None:
+    """Count statements and DB time of the current request (see query_stats_var)"""
+    from sqlalchemy import event
+
+    event.listen(engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine.sync_engine, "after_cursor_execute", _after_cursor_execute)
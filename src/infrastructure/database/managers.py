@@ -1,6 +1,13 @@
-from typing import Protocol, TYPE_CHECKING
+from typing import Any, Dict, Protocol, TYPE_CHECKING
+import asyncio
 import logging
 
+from src.infrastructure.database.instrumentation import instrument_queries
+from src.infrastructure.database.pool import engine_options, instrument_pool
+from src.infrastructure.database.replicas import ReplicaSet
+from src.infrastructure.database.sqlite import apply_pragmas, is_file_sqlite, sqlite_pragmas
+from src.infrastructure.database.transactions import READ_ONLY_KEY, install_read_only_guard
+
 
 if TYPE_CHECKING:
     from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
@@ -17,9 +24,15 @@ class BaseDbManager(Protocol):
     async def disconnect(self) -> None:
         ...
 
+    async def warm_up(self, connections: int) -> None:
+        ...
+
     def get_db_provider(self) -> 'AsyncSession | AsyncIOMotorDatabase | None':
         ...
 
+    def get_read_db_provider(self) -> 'AsyncSession | AsyncIOMotorDatabase | None':
+        ...
+
     def get_provider_type(self) -> str:
         ...
 
@@ -36,9 +49,15 @@ class NoOpDbManager(BaseDbManager):
     async def disconnect(self) -> None:
         logger.info("No database configured - skipping disconnection")
 
+    async def warm_up(self, connections: int) -> None:
+        pass
+
     def get_db_provider(self) -> None:
         raise RuntimeError("No database manager configured. Remove database dependencies from endpoints.")
 
+    def get_read_db_provider(self) -> None:
+        return self.get_db_provider()
+
     def get_provider_type(self) -> str:
         return "none"
 
@@ -48,31 +67,91 @@ class SQLAlchemyDbManager(BaseDbManager):
 
     def __init__(self, **config):
         self.database_uri = config.get("database_uri")
+        self.config = config
+        # Built in connect(), they need SQLAlchemy installed
+        self.engine_options: 'Dict[str, Any] | None' = None
+        self.sqlite_tuned = False
         self.engine: 'AsyncEngine | None' = None
         self.session_factory: 'async_sessionmaker | None' = None
+        self.read_engine: 'AsyncEngine | None' = None
+        self.read_session_factory: 'async_sessionmaker | None' = None
+        replica_uris = config.get("database_replica_uris") or []
+        self.replica_set: 'ReplicaSet | None' = ReplicaSet(
+            replica_uris,
+            check_interval=config.get("db_replica_health_check_interval_seconds", 10.0),
+            check_timeout=config.get("db_replica_health_check_timeout_seconds", 2.0),
+            **config
+        ) if replica_uris else None
 
 
     async def connect(self) -> None:
         if self.engine is None:
             try:
                 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
-                self.engine = create_async_engine(self.database_uri)  # TODO add Excepion
+                self.engine_options = engine_options(self.database_uri, **self.config)
+                # SQLite profile: tuned pragmas, the primary engine becomes the single writer and
+                # read-only sessions get their own pool on the same file
+                self.sqlite_tuned = (
+                    self.config.get("sqlite_tuning_enabled", True) and is_file_sqlite(self.database_uri)
+                )
+                if self.sqlite_tuned:
+                    self.engine_options.update(pool_size=1, max_overflow=0)
+                self.engine = create_async_engine(self.database_uri, **self.engine_options)  # TODO add Excepion
+                install_read_only_guard()
+                instrument_pool(self.engine, "primary")
+                instrument_queries(self.engine)
                 self.session_factory = async_sessionmaker(self.engine, expire_on_commit=False)
+                if self.sqlite_tuned:
+                    self._connect_sqlite_reader()
                 logger.info(f"Connected to SQL database: {self.database_uri}")
+                if self.replica_set is not None:
+                    await self.replica_set.connect()
             except ImportError as e:
                 raise RuntimeError(
                     "SQLAlchemy is required for SQL database support. "
                     "Install it with: pip install 'sqlalchemy[asyncio]'"
                 ) from e
 
+    def _connect_sqlite_reader(self) -> None:
+        from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+
+        pragmas = sqlite_pragmas(**self.config)
+        apply_pragmas(self.engine, pragmas)
+        self.read_engine = create_async_engine(self.database_uri, **engine_options(self.database_uri, **self.config))
+        apply_pragmas(self.read_engine, pragmas + ["PRAGMA query_only=ON"])
+        instrument_pool(self.read_engine, "reader")
+        instrument_queries(self.read_engine)
+        self.read_session_factory = async_sessionmaker(self.read_engine, expire_on_commit=False)
+        logger.info("SQLite profile: WAL journal, single writer connection, separate reader pool")
+
     async def disconnect(self) -> None:
         """Close database engine"""
+        if self.replica_set is not None:
+            await self.replica_set.disconnect()
+        if self.read_engine is not None:
+            await self.read_engine.dispose()
+            self.read_engine = None
+            self.read_session_factory = None
         if self.engine:
             await self.engine.dispose()
             self.engine = None
             self.session_factory = None
             logger.info("SQL database connection closed")
 
+    async def warm_up(self, connections: int) -> None:
+        """Open pooled connections up front so the first requests do not pay for connecting"""
+        if self.engine is None:
+            raise RuntimeError("SQL database not connected. Call connect() first.")
+
+        # Hold all connections at once, otherwise the pool hands the same one back
+        engines = [(self.engine, min(connections, self.engine_options.get("pool_size", connections)))]
+        if self.read_engine is not None:
+            engines.append((self.read_engine, connections))
+        opened = await asyncio.gather(*(engine.connect() for engine, count in engines for _ in range(count)))
+        for connection in opened:
+            await connection.close()
+        logger.info(f"Warmed up {len(opened)} SQL connections")
+
 
     def get_db_provider(self) -> 'AsyncSession':
         """Get async session factory"""
@@ -80,6 +159,17 @@ class SQLAlchemyDbManager(BaseDbManager):
             raise RuntimeError("SQL database not connected. Call connect() first.")
         return self.session_factory()
 
+    def get_read_db_provider(self) -> 'AsyncSession':
+        """Read-only session on a healthy replica, the SQLite reader pool, or the primary"""
+        session = self.replica_set.get_session() if self.replica_set is not None else None
+        if session is None and self.read_session_factory is not None:
+            session = self.read_session_factory()
+        if session is None:
+            session = self.get_db_provider()
+        # Enforced by the read-only guard: DML and flushes raise instead of being rolled back silently
+        session.info[READ_ONLY_KEY] = True
+        return session
+
 
     def get_provider_type(self) -> str:
         return "sql"
@@ -93,6 +183,7 @@ class MotorDbManager(BaseDbManager):
         self.mongo_db_name = config.get("mongo_db_name")
         self.client: 'AsyncIOMotorClient | None' = None
         self.database: 'AsyncIOMotorDatabase | None'  = None
+        self.read_database: 'AsyncIOMotorDatabase | None' = None
 
 
     async def connect(self) -> None:
@@ -100,8 +191,11 @@ class MotorDbManager(BaseDbManager):
         if self.client is None:
             try:
                 from motor.motor_asyncio import AsyncIOMotorClient
+                from pymongo.read_preferences import SecondaryPreferred
                 self.client = AsyncIOMotorClient(self.mongo_dsn)
                 self.database = self.client.get_database(self.mongo_db_name)
+                # Replica set members serve reads, the primary only when no secondary is available
+                self.read_database = self.client.get_database(self.mongo_db_name, read_preference=SecondaryPreferred())
                 logger.info(f"Connected to MongoDB database: {self.mongo_db_name}")
             except ImportError as e:
                 raise RuntimeError(
@@ -116,14 +210,26 @@ class MotorDbManager(BaseDbManager):
             self.client.close()
             self.client = None
             self.database = None
+            self.read_database = None
             logger.info("MongoDB database connection closed")
 
+    async def warm_up(self, connections: int) -> None:
+        """Motor opens connections lazily, a ping establishes the first one"""
+        if self.client is None:
+            raise RuntimeError("MongoDB not connected. Call connect() first.")
+        await self.client.admin.command("ping")
+
 
     def get_db_provider(self) -> 'AsyncIOMotorDatabase':
         if self.database is None:
             raise RuntimeError("MongoDB not connected. Call connect() first.")
         return self.database
 
+    def get_read_db_provider(self) -> 'AsyncIOMotorDatabase':
+        if self.read_database is None:
+            raise RuntimeError("MongoDB not connected. Call connect() first.")
+        return self.read_database
+
 
     def get_provider_type(self) -> str:
         return "mongodb"
@@ -0,0 +1,139 @@
+import time
+from typing import Any, Dict, Optional, TYPE_CHECKING
+import logging
+
+from src.core.metrics.registry import metrics_registry
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncEngine
+
+logger = logging.getLogger(__name__)
+
+POOL_CHECKOUT_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0)
+
+db_pool_size = metrics_registry.gauge(
+    "db_pool_size",
+    "Configured number of persistent connections in the pool",
+    ("pool",)
+)
+db_pool_checked_out = metrics_registry.gauge(
+    "db_pool_checked_out",
+    "Connections currently checked out of the pool",
+    ("pool",)
+)
+db_pool_idle = metrics_registry.gauge(
+    "db_pool_idle",
+    "Open connections waiting in the pool",
+    ("pool",)
+)
+db_pool_overflow = metrics_registry.gauge(
+    "db_pool_overflow",
+    "Connections open beyond pool_size (negative while the pool is not yet full)",
+    ("pool",)
+)
+db_pool_checkout_seconds = metrics_registry.histogram(
+    "db_pool_checkout_seconds",
+    "Time to check out a connection: waiting for the pool plus opening a new one when the pool grows",
+    ("pool",),
+    buckets=POOL_CHECKOUT_BUCKETS
+)
+db_pool_wait_seconds = metrics_registry.histogram(
+    "db_pool_wait_seconds",
+    "Time a checkout queued for a connection to be returned, pool and overflow exhausted",
+    ("pool",),
+    buckets=POOL_CHECKOUT_BUCKETS
+)
+
+
+def _is_memory_sqlite(database_uri: str) -> bool:
+    from sqlalchemy.engine import make_url
+
+    url = make_url(database_uri)
+    return url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:")
+
+
+def engine_options(uri: str, **config) -> Dict[str, Any]:
+    """create_async_engine arguments for the pool settings"""
+    options: Dict[str, Any] = {
+        "pool_pre_ping": config.get("db_pool_pre_ping", False),
+        "pool_recycle": config.get("db_pool_recycle", -1),
+    }
+    # In-memory SQLite shares one connection through a StaticPool, there is nothing to size
+    if not _is_memory_sqlite(uri):
+        options.update(
+            poolclass=instrumented_pool_class(),
+            pool_size=config.get("db_pool_size", 5),
+            max_overflow=config.get("db_max_overflow", 10),
+            pool_timeout=config.get("db_pool_timeout", 30.0),
+        )
+    return options
+
+
+_pool_class = None
+
+
+def instrumented_pool_class():
+    """AsyncAdaptedQueuePool feeding occupancy, checkout time and wait time into the pool metrics"""
+    global _pool_class
+    if _pool_class is not None:
+        return _pool_class
+
+    from sqlalchemy.pool import AsyncAdaptedQueuePool
+    from sqlalchemy.util.queue import AsyncAdaptedQueue
+
+    class WaitTimedQueue(AsyncAdaptedQueue):
+        # The pool only blocks on its queue once pool_size + max_overflow connections are out,
+        # so blocking gets are exactly the checkouts that wait, connect latency excluded
+        owner: "InstrumentedAsyncAdaptedQueuePool"
+
+        def get(self, block: bool = True, timeout: Optional[float] = None):
+            if not block:
+                return super().get(block, timeout)
+            start = time.perf_counter()
+            try:
+                return super().get(block, timeout)
+            finally:
+                db_pool_wait_seconds.observe(time.perf_counter() - start, self.owner.metrics_label)
+
+    class InstrumentedAsyncAdaptedQueuePool(AsyncAdaptedQueuePool):
+        metrics_label = "primary"
+        _queue_class = WaitTimedQueue
+
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self._pool.owner = self
+
+        def _do_get(self):
+            start = time.perf_counter()
+            try:
+                return super()._do_get()
+            finally:
+                db_pool_checkout_seconds.observe(time.perf_counter() - start, self.metrics_label)
+                self.update_gauges()
+
+        def _do_return_conn(self, record):
+            super()._do_return_conn(record)
+            self.update_gauges()
+
+        def recreate(self):
+            pool = super().recreate()
+            pool.metrics_label = self.metrics_label
+            return pool
+
+        def update_gauges(self) -> None:
+            label = self.metrics_label
+            db_pool_size.set(self.size(), label)
+            db_pool_checked_out.set(self.checkedout(), label)
+            db_pool_idle.set(self.checkedin(), label)
+            db_pool_overflow.set(self.overflow(), label)
+
+    _pool_class = InstrumentedAsyncAdaptedQueuePool
+    return _pool_class
+
+
+def instrument_pool(engine: 'AsyncEngine', label: str) -> None:
+    """Label the pool metrics of an engine created with engine_options"""
+    pool = engine.sync_engine.pool
+    if isinstance(pool, instrumented_pool_class()):
+        pool.metrics_label = label
+        pool.update_gauges()
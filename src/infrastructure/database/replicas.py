@@ -0,0 +1,115 @@
+import asyncio
+import itertools
+from typing import List, Optional, TYPE_CHECKING
+import logging
+
+from src.core.metrics.registry import metrics_registry
+from src.infrastructure.database.instrumentation import instrument_queries
+from src.infrastructure.database.pool import engine_options, instrument_pool
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+logger = logging.getLogger(__name__)
+
+db_replica_healthy = metrics_registry.gauge(
+    "db_replica_healthy",
+    "Whether the read replica is in rotation (1) or taken out by health checks (0)",
+    ("replica",),
+    multiprocess_mode="min"
+)
+
+
+class Replica:
+    """Read replica engine with its session factory and health state"""
+
+    def __init__(self, name: str, uri: str, engine: 'AsyncEngine', session_factory: 'async_sessionmaker'):
+        self.name = name
+        self.uri = uri
+        self.engine = engine
+        self.session_factory = session_factory
+        self.healthy = True
+
+
+class ReplicaSet:
+    """
+    Round-robin over healthy read replicas.
+    A background task runs ``SELECT 1`` against every replica each ``check_interval`` seconds;
+    a replica failing the check leaves the rotation until it passes again.
+    """
+
+    def __init__(self, uris: List[str], check_interval: float, check_timeout: float, **config):
+        self.uris = uris
+        self.check_interval = check_interval
+        self.check_timeout = check_timeout
+        self.config = config
+        self.replicas: List[Replica] = []
+        self._healthy: List[Replica] = []
+        self._counter = itertools.count()
+        self._health_task: Optional[asyncio.Task] = None
+
+    async def connect(self) -> None:
+        from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+
+        for index, uri in enumerate(self.uris):
+            name = f"replica{index}"
+            engine = create_async_engine(uri, **engine_options(uri, **self.config))
+            instrument_pool(engine, name)
+            instrument_queries(engine)
+            session_factory = async_sessionmaker(engine, expire_on_commit=False)
+            self.replicas.append(Replica(name, uri, engine, session_factory))
+
+        await self.check_health()
+        self._health_task = asyncio.create_task(self._health_loop())
+        logger.info(f"Connected to {len(self.replicas)} SQL read replicas")
+
+    async def disconnect(self) -> None:
+        if self._health_task is not None:
+            self._health_task.cancel()
+            try:
+                await self._health_task
+            except asyncio.CancelledError:
+                pass
+            self._health_task = None
+        for replica in self.replicas:
+            await replica.engine.dispose()
+        self.replicas = []
+        self._healthy = []
+
+    def get_session(self) -> Optional['AsyncSession']:
+        """Session on the next healthy replica, None when no replica is available"""
+        healthy = self._healthy
+        if not healthy:
+            return None
+        replica = healthy[next(self._counter) % len(healthy)]
+        return replica.session_factory()
+
+    async def check_health(self) -> None:
+        results = await asyncio.gather(*(self._check(replica) for replica in self.replicas))
+        for replica, healthy in zip(self.replicas, results):
+            if healthy != replica.healthy:
+                if healthy:
+                    logger.info(f"Read replica {replica.name} is healthy again, back in rotation")
+                else:
+                    logger.warning(f"Read replica {replica.name} failed health check, taken out of rotation")
+            replica.healthy = healthy
+            db_replica_healthy.set(1 if healthy else 0, replica.name)
+        # Swapped as a whole, get_session never sees a partially updated rotation
+        self._healthy = [replica for replica in self.replicas if replica.healthy]
+
+    async def _check(self, replica: Replica) -> bool:
+        from sqlalchemy import text
+
+        try:
+            async with asyncio.timeout(self.check_timeout):
+                async with replica.engine.connect() as connection:
+                    await connection.execute(text("SELECT 1"))
+            return True
+        except Exception as e:
+            logger.debug(f"Read replica {replica.name} health check error: {e}")
+            return False
+
+    async def _health_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.check_interval)
+            await self.check_health()
@@ -0,0 +1,44 @@
+from typing import List, TYPE_CHECKING
+import logging
+
+from src.infrastructure.database.pool import _is_memory_sqlite
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncEngine
+
+logger = logging.getLogger(__name__)
+
+
+def is_file_sqlite(database_uri: str) -> bool:
+    from sqlalchemy.engine import make_url
+
+    return make_url(database_uri).get_backend_name() == "sqlite" and not _is_memory_sqlite(database_uri)
+
+
+def sqlite_pragmas(**config) -> List[str]:
+    """Connection pragmas of the SQLite performance profile"""
+    return [
+        # Readers no longer block the writer and the writer no longer blocks readers
+        "PRAGMA journal_mode=WAL",
+        # Durable at checkpoints instead of every commit, safe against corruption in WAL mode
+        f"PRAGMA synchronous={config.get('sqlite_synchronous', 'NORMAL')}",
+        f"PRAGMA mmap_size={config.get('sqlite_mmap_size', 256 * 1024 * 1024)}",
+        # Negative values are KiB rather than pages
+        f"PRAGMA cache_size=-{config.get('sqlite_cache_size_kib', 64 * 1024)}",
+        f"PRAGMA busy_timeout={config.get('sqlite_busy_timeout_ms', 5000)}",
+        "PRAGMA temp_store=MEMORY",
+    ]
+
+
+def apply_pragmas(engine: 'AsyncEngine', pragmas: List[str]) -> None:
+    """Run the pragmas on every new DBAPI connection of the engine"""
+    from sqlalchemy import event
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma in pragmas:
+                cursor.execute(pragma)
+        finally:
+            cursor.close()
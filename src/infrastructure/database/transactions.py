@@ -0,0 +1,109 @@
+import inspect
+from typing import Any, Awaitable, Callable, Optional, TYPE_CHECKING
+import logging
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+logger = logging.getLogger(__name__)
+
+AFTER_COMMIT_KEY = "after_commit"
+BEFORE_CLOSE_KEY = "before_close"
+READ_ONLY_KEY = "read_only"
+
+AfterCommitCallback = Callable[[], Optional[Awaitable[Any]]]
+
+
+def after_commit(session: 'AsyncSession', callback: AfterCommitCallback) -> None:
+    """
+    Run ``callback`` once the session's transaction is committed by the DB middleware.
+    Dropped when the transaction is rolled back.
+    """
+    session.info.setdefault(AFTER_COMMIT_KEY, []).append(callback)
+
+
+async def run_after_commit(session: 'AsyncSession') -> None:
+    for callback in session.info.pop(AFTER_COMMIT_KEY, ()):
+        try:
+            result = callback()
+            if inspect.isawaitable(result):
+                await result
+        except Exception as e:
+            # The transaction is already committed, a failed callback must not fail the request
+            logger.error(f"After-commit callback failed: {e}")
+
+
+def discard_after_commit(session: 'AsyncSession') -> None:
+    session.info.pop(AFTER_COMMIT_KEY, None)
+
+
+def before_close(session: 'AsyncSession', callback: AfterCommitCallback) -> None:
+    """
+    Run ``callback`` before the DB middleware rolls back or closes the session, e.g. to stop
+    background work (batch loads) still using it after the request was cancelled.
+    """
+    session.info.setdefault(BEFORE_CLOSE_KEY, []).append(callback)
+
+
+async def run_before_close(session: 'AsyncSession') -> None:
+    for callback in session.info.pop(BEFORE_CLOSE_KEY, ()):
+        try:
+            result = callback()
+            if inspect.isawaitable(result):
+                await result
+        except Exception as e:
+            logger.error(f"Before-close callback failed: {e}")
+
+
+class ReadOnlySessionError(RuntimeError):
+    """Write attempted through a read-only session"""
+
+
+_read_only_guard_installed = False
+
+
+def install_read_only_guard() -> None:
+    """
+    Reject writes on sessions marked read-only: ORM INSERT/UPDATE/DELETE and flushes of pending
+    changes, and, through the session's connection, Core and text() writes at cursor level.
+    """
+    global _read_only_guard_installed
+    if _read_only_guard_installed:
+        return
+
+    from sqlalchemy import event
+    from sqlalchemy.engine import Engine
+    from sqlalchemy.orm import Session
+
+    @event.listens_for(Session, "do_orm_execute")
+    def _reject_dml(orm_execute_state):
+        if orm_execute_state.session.info.get(READ_ONLY_KEY) and (
+            orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete
+        ):
+            raise ReadOnlySessionError("Write statement executed on a read-only session, use DbProvider")
+
+    @event.listens_for(Session, "before_flush")
+    def _reject_flush(session, flush_context, instances):
+        if session.info.get(READ_ONLY_KEY) and (session.new or session.dirty or session.deleted):
+            raise ReadOnlySessionError("Changes flushed on a read-only session, use DbProvider")
+
+    @event.listens_for(Session, "after_begin")
+    def _mark_connection(session, transaction, connection):
+        # The session's Connection lives as long as its transaction, the option does not leak into the pool
+        if session.info.get(READ_ONLY_KEY):
+            connection.execution_options(**{READ_ONLY_KEY: True})
+
+    @event.listens_for(Engine, "before_cursor_execute")
+    def _reject_cursor_writes(conn, cursor, statement, parameters, context, executemany):
+        if conn.get_execution_options().get(READ_ONLY_KEY) and _is_write(statement):
+            raise ReadOnlySessionError("Write statement executed on a read-only session, use DbProvider")
+
+    _read_only_guard_installed = True
+
+
+_WRITE_KEYWORDS = frozenset(("INSERT", "UPDATE", "DELETE", "REPLACE", "MERGE", "UPSERT", "CREATE", "DROP", "ALTER", "TRUNCATE"))
+
+
+def _is_write(statement: str) -> bool:
+    words = statement.lstrip(" \t\r\n(").split(None, 1)
+    return bool(words) and words[0].upper() in _WRITE_KEYWORDS
@@ -7,19 +7,22 @@ from starlette.requests import Request
 
 from src.api import api_router
 from src.core.config.settings import settings
-from src.core.middleware import MetricsMiddleware, RequestIdMiddleware, DbMiddlewareFactory
+from src.core.context import get_request_id
+from src.core.logs import setup_logging
+from src.core.metrics import metrics_router
+from src.core.profiling import loop_lag_monitor
+from src.core.security import JwksRefresher, RevocationRefresher, RevocationSourceFactory, jwks_key_set, revocation_list
+from src.core.middleware import (
+    CompressionMiddleware,
+    DbMiddlewareFactory,
+    FusedMiddleware,
+    MetricsMiddleware,
+    RequestIdMiddleware
+)
 from src.infrastructure.database.managers import DbManagerFactory
 
 
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s [%(levelname)s] [%(message)s]",
-    datefmt="%Y-%m-%d %H:%M:%S",
-    handlers=[
-        logging.StreamHandler(),
-        logging.FileHandler("logs.log")
-    ]
-)
+setup_logging(settings)
 logger = logging.getLogger(__name__)
 
 
@@ -32,6 +35,25 @@ async def lifespan(app: FastAPI):
     app.state.db_manager = db_manager
 
     await db_manager.connect()
+    if settings.db_pool_warmup_connections:
+        await db_manager.warm_up(min(settings.db_pool_warmup_connections, settings.db_pool_size))
+
+    if settings.loop_monitor_enabled:
+        loop_lag_monitor.start()
+
+    revocation_refresher = None
+    if settings.jwt_revocation_enabled:
+        revocation_refresher = RevocationRefresher(
+            revocation_list,
+            RevocationSourceFactory.create_source(db_manager, **settings.model_dump()),
+            interval=settings.jwt_revocation_refresh_seconds
+        )
+        await revocation_refresher.start()
+
+    jwks_refresher = None
+    if jwks_key_set is not None:
+        jwks_refresher = JwksRefresher(jwks_key_set, interval=settings.jwt_jwks_check_interval_seconds)
+        await jwks_refresher.start()
 
     try:
         # Optional: Create tables if they don't exist
@@ -44,6 +66,12 @@ async def lifespan(app: FastAPI):
 
     # Shutdown
     logger.info("Application shutting down...")
+    if jwks_refresher is not None:
+        await jwks_refresher.stop()
+    if revocation_refresher is not None:
+        await revocation_refresher.stop()
+    if settings.loop_monitor_enabled:
+        await loop_lag_monitor.stop()
     await db_manager.disconnect()
 
 
@@ -58,7 +86,7 @@ app = FastAPI(
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request: Request, exc: HTTPException):
     """Minimal HTTP exception handler - MetricsMiddleware already logged the details."""
-    request_id = getattr(request.state, 'request_id', 'unknown')
+    request_id = get_request_id()
 
     response = JSONResponse(
         status_code=exc.status_code,
@@ -71,6 +99,7 @@ async def http_exception_handler(request: Request, exc: HTTPException):
 @app.exception_handler(Exception)
 async def general_exception_handler(request: Request, exc: Exception):
     """Minimal general exception handler - MetricsMiddleware already logged the details."""
+    # Runs outside the middleware stack, so the request context is already reset
     request_id = getattr(request.state, 'request_id', 'unknown')
     response = JSONResponse(
         status_code=500,
@@ -82,11 +111,19 @@ async def general_exception_handler(request: Request, exc: Exception):
 
 # # Add the middleware
 DbMiddleware = DbMiddlewareFactory.get_middleware(**settings.model_dump())
-app.add_middleware(DbMiddleware)
-app.add_middleware(MetricsMiddleware)
-app.add_middleware(RequestIdMiddleware)
+if settings.middleware_fused:
+    app.add_middleware(FusedMiddleware, middleware_classes=[RequestIdMiddleware, MetricsMiddleware, DbMiddleware])
+else:
+    app.add_middleware(DbMiddleware)
+    app.add_middleware(MetricsMiddleware)
+    app.add_middleware(RequestIdMiddleware)
+if settings.compression_enabled:
+    # Outermost, so headers set by the inner layers are already in place
+    app.add_middleware(CompressionMiddleware)
 
 app.include_router(api_router, prefix="/api")
+if settings.metrics_enabled and settings.metrics_endpoint_enabled:
+    app.include_router(metrics_router)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,64 @@
+import time
+
+import pytest
+from httpx import AsyncClient, ASGITransport
+from jose import jwt
+
+from src.main import app
+from src.core.config.settings import settings
+from src.core.dependencies import JwtClient, Principal, get_jwt_client
+
+
+def create_token(roles: list) -> str:
+    return jwt.encode(
+        {"sub": "test-client", "roles": roles, "exp": int(time.time()) + 3600},
+        settings.jwt_secret_key,
+        algorithm=settings.jwt_algorithm
+    )
+
+
+class TestAuthRoutes:
+    """Test token validation, role checks and principal conversion"""
+
+    @pytest.mark.asyncio
+    async def test_admin_client_returns_jwt_client(self):
+        headers = {"Authorization": f"Bearer {create_token(['base', 'admin'])}"}
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+            response = await ac.get("/api/admin-client", headers=headers)
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["sub"] == "test-client"
+        assert data["roles"] == ["admin", "base"]
+
+    @pytest.mark.asyncio
+    async def test_overridden_jwt_client_is_returned(self):
+        client = JwtClient(sub="override-client", roles=["admin"], exp=9999999999)
+        app.dependency_overrides[get_jwt_client] = lambda: client
+        try:
+            async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+                jwt_response = await ac.get("/api/jwt-client")
+                admin_response = await ac.get("/api/admin-client")
+        finally:
+            app.dependency_overrides.pop(get_jwt_client, None)
+
+        assert jwt_response.status_code == 200
+        assert jwt_response.json()["sub"] == "override-client"
+        assert admin_response.status_code == 200
+        assert admin_response.json()["roles"] == ["admin"]
+
+    @pytest.mark.asyncio
+    async def test_missing_role_is_forbidden(self):
+        headers = {"Authorization": f"Bearer {create_token(['base'])}"}
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+            response = await ac.get("/api/admin-client", headers=headers)
+
+        assert response.status_code == 403
+
+    def test_principal_is_immutable(self):
+        principal = Principal(sub="client", roles=frozenset(["base"]), exp=0)
+
+        assert principal.has_any_role(frozenset(["admin", "base"]))
+        assert not principal.has_any_role(frozenset(["admin"]))
+        with pytest.raises(AttributeError):
+            principal.sub = "other"
@@ -0,0 +1,118 @@
+import asyncio
+import gzip
+import zlib
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from httpx import AsyncClient, ASGITransport
+
+from src.core.middleware import CompressionMiddleware, no_compression
+
+LARGE_PAYLOAD = [{"id": i, "email": f"user{i}@example.com", "is_active": True} for i in range(200)]
+
+
+def build_app() -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=500, threadpool_min_size=4096)
+
+    @app.get("/large")
+    async def large():
+        return LARGE_PAYLOAD
+
+    @app.get("/small")
+    async def small():
+        return {"status": "ok"}
+
+    @app.get("/opt-out")
+    @no_compression
+    async def opt_out():
+        return LARGE_PAYLOAD
+
+    @app.get("/stream")
+    async def stream():
+        async def lines():
+            for i in range(3):
+                yield f'{{"line": {i}}}\n'.encode()
+        return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+    return app
+
+
+async def call(app: FastAPI, path: str, accept_encoding: str = "gzip"):
+    """Send a request straight to the ASGI app and return the raw messages"""
+    messages = []
+    request_sent = False
+
+    async def receive():
+        nonlocal request_sent
+        if request_sent:
+            # Client stays connected until the response is complete
+            await asyncio.Event().wait()
+        request_sent = True
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {
+        "type": "http", "method": "GET", "path": path, "raw_path": path.encode(), "query_string": b"",
+        "headers": [(b"accept-encoding", accept_encoding.encode())], "root_path": "", "scheme": "http",
+        "server": ("test", 80), "client": ("127.0.0.1", 1234), "http_version": "1.1",
+    }
+    await app(scope, receive, send)
+    return messages
+
+
+class TestCompressionMiddleware:
+    """Test gzip negotiation, size threshold, streaming and per-route opt-out"""
+
+    @pytest.mark.asyncio
+    async def test_large_response_is_compressed(self):
+        async with AsyncClient(transport=ASGITransport(app=build_app()), base_url="http://test") as ac:
+            response = await ac.get("/large", headers={"Accept-Encoding": "gzip"})
+
+        assert response.status_code == 200
+        assert response.headers["content-encoding"] == "gzip"
+        assert "Accept-Encoding" in response.headers["vary"]
+        assert int(response.headers["content-length"]) < len(response.content)
+        assert response.json() == LARGE_PAYLOAD
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("accept_encoding", ["*;q=0, gzip", "br, *", "gzip; q=0.5"])
+    async def test_gzip_allowed_explicitly_or_by_wildcard(self, accept_encoding):
+        async with AsyncClient(transport=ASGITransport(app=build_app()), base_url="http://test") as ac:
+            response = await ac.get("/large", headers={"Accept-Encoding": accept_encoding})
+
+        assert response.headers["content-encoding"] == "gzip"
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("path,accept_encoding", [
+        ("/small", "gzip"),
+        ("/large", "identity"),
+        ("/large", "gzip;q=0"),
+        ("/large", "gzip;q=0, *"),
+        ("/opt-out", "gzip"),
+    ])
+    async def test_response_is_not_compressed(self, path, accept_encoding):
+        async with AsyncClient(transport=ASGITransport(app=build_app()), base_url="http://test") as ac:
+            response = await ac.get(path, headers={"Accept-Encoding": accept_encoding})
+
+        assert response.status_code == 200
+        assert "content-encoding" not in response.headers
+        assert int(response.headers["content-length"]) == len(response.content)
+
+    @pytest.mark.asyncio
+    async def test_streaming_response_is_compressed_incrementally(self):
+        messages = await call(build_app(), "/stream")
+
+        start = messages[0]
+        headers = {k.decode(): v.decode() for k, v in start["headers"]}
+        assert headers["content-encoding"] == "gzip"
+        assert "content-length" not in headers
+
+        # Every chunk is flushed, so each line can be decoded as soon as it arrives
+        decompressor = zlib.decompressobj(zlib.MAX_WBITS | 16)
+        chunks = [m["body"] for m in messages[1:] if m["body"]]
+        assert decompressor.decompress(chunks[0]) == b'{"line": 0}\n'
+        assert gzip.decompress(b"".join(chunks)) == b'{"line": 0}\n{"line": 1}\n{"line": 2}\n'
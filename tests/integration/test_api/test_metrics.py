@@ -0,0 +1,83 @@
+import multiprocessing
+
+import pytest
+from httpx import AsyncClient, ASGITransport
+
+from src.main import app
+from src.core.metrics import MetricsRegistry, generate_latest
+from src.core.metrics.multiprocess import MmapMetricsRegistry
+
+
+class TestMetricsEndpoint:
+    """Test Prometheus metrics aggregation and exposition"""
+
+    @pytest.mark.asyncio
+    async def test_requests_are_aggregated_by_route_template(self):
+        """Test that path parameters are collapsed into the route template"""
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            await client.get("/api/healthcheck")
+            await client.get("/api/does-not-exist")
+            response = await client.get("/metrics")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        body = response.text
+        assert 'http_requests_total{method="GET",route="/api/healthcheck",status="200"}' in body
+        assert 'http_requests_total{method="GET",route="<unmatched>",status="404"}' in body
+        assert 'http_request_duration_seconds_bucket{method="GET",route="/api/healthcheck",status="200",le="+Inf"}' in body
+        assert "# TYPE http_requests_in_progress gauge" in body
+
+
+class TestMetricsRegistry:
+    """Test registry primitives"""
+
+    def test_histogram_buckets_are_cumulative(self):
+        registry = MetricsRegistry()
+        histogram = registry.histogram("latency", "Latency", ("route",), buckets=[0.1, 1.0])
+        for value in (0.05, 0.5, 0.5, 5.0):
+            histogram.observe(value, "/a")
+
+        body = generate_latest(registry)
+
+        assert 'latency_bucket{route="/a",le="0.1"} 1.0' in body
+        assert 'latency_bucket{route="/a",le="1.0"} 3.0' in body
+        assert 'latency_bucket{route="/a",le="+Inf"} 4.0' in body
+        assert 'latency_count{route="/a"} 4.0' in body
+        assert 'latency_sum{route="/a"} 6.05' in body
+
+    def test_label_values_are_escaped(self):
+        registry = MetricsRegistry()
+        registry.counter("hits", "Hits", ("path",)).inc('a"b\\c')
+
+        assert 'hits{path="a\\"b\\\\c"} 1.0' in generate_latest(registry)
+
+
+def _record_in_worker(directory: str):
+    registry = MmapMetricsRegistry(directory)
+    registry.counter("jobs_total", "Jobs", ("kind",)).inc("a", amount=2)
+    registry.histogram("job_seconds", "Job time", buckets=[1.0]).observe(0.5)
+    registry.gauge("jobs_running", "Running jobs").set(7)
+
+
+class TestMultiprocessRegistry:
+    """Test cross-worker aggregation through per-worker metric files"""
+
+    def test_workers_are_merged_on_collect(self, tmp_path):
+        worker = multiprocessing.get_context("fork").Process(target=_record_in_worker, args=(str(tmp_path),))
+        worker.start()
+        worker.join()
+
+        registry = MmapMetricsRegistry(str(tmp_path))
+        registry.counter("jobs_total", "Jobs", ("kind",)).inc("a")
+        registry.histogram("job_seconds", "Job time", buckets=[1.0]).observe(2.0)
+        registry.gauge("jobs_running", "Running jobs").set(1)
+
+        body = generate_latest(registry)
+
+        assert len(list(tmp_path.glob("metrics_*.db"))) == 2
+        assert 'jobs_total{kind="a"} 3.0' in body
+        assert 'job_seconds_bucket{le="1.0"} 1.0' in body
+        assert "job_seconds_count 2.0" in body
+        # Gauges only include live workers
+        assert "jobs_running 1.0" in body
@@ -0,0 +1,147 @@
+import logging
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from httpx import AsyncClient, ASGITransport
+from starlette.requests import Request
+
+from src.main import app
+from src.core.config.settings import settings
+from src.core.context import RequestIdLogFilter, get_request_id
+from src.core.middleware import (
+    FusedMiddleware,
+    MetricsMiddleware,
+    RequestIdMiddleware,
+    SQLAlchemyDbMiddleware
+)
+from src.infrastructure.database.transactions import after_commit, before_close
+
+
+class FakeSession:
+    """Records the calls made by SQLAlchemyDbMiddleware"""
+
+    def __init__(self, events: list):
+        self.events = events
+        self.info = {}
+
+    async def commit(self):
+        self.events.append("commit")
+
+    async def rollback(self):
+        self.events.append("rollback")
+
+    async def close(self):
+        self.events.append("close")
+
+
+def build_app(events: list, fused: bool) -> FastAPI:
+    test_app = FastAPI()
+
+    @test_app.get("/stream")
+    async def stream(request: Request):
+        request.state.db_provider = FakeSession(events)
+        after_commit(request.state.db_provider, lambda: events.append("after_commit"))
+
+        async def body():
+            for chunk in (b"a", b"b", b"c"):
+                events.append(f"chunk:{chunk.decode()}")
+                yield chunk
+
+        return StreamingResponse(body())
+
+    @test_app.get("/fail")
+    async def fail(request: Request):
+        request.state.db_provider = FakeSession(events)
+        after_commit(request.state.db_provider, lambda: events.append("after_commit"))
+        before_close(request.state.db_provider, lambda: events.append("before_close"))
+        raise RuntimeError("boom")
+
+    if fused:
+        test_app.add_middleware(
+            FusedMiddleware,
+            middleware_classes=[RequestIdMiddleware, MetricsMiddleware, SQLAlchemyDbMiddleware]
+        )
+    else:
+        test_app.add_middleware(SQLAlchemyDbMiddleware)
+        test_app.add_middleware(MetricsMiddleware)
+        test_app.add_middleware(RequestIdMiddleware)
+    return test_app
+
+
+class TestMiddleware:
+    """Test the pure-ASGI middleware stack"""
+
+    @pytest.mark.asyncio
+    async def test_request_id_header(self):
+        """Test that every response carries X-Request-ID"""
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.get("/api/healthcheck")
+
+        assert response.status_code == 200
+        assert response.headers["X-Request-ID"]
+
+    @pytest.mark.asyncio
+    async def test_valid_inbound_request_id_is_reused(self):
+        """Test that a safe inbound X-Request-ID is propagated and an unsafe one replaced"""
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            reused = await client.get("/api/healthcheck", headers={"X-Request-ID": "upstream-123"})
+            replaced = await client.get("/api/healthcheck", headers={"X-Request-ID": "bad id\"}"})
+
+        assert reused.headers["X-Request-ID"] == "upstream-123"
+        assert replaced.headers["X-Request-ID"] not in ("bad id\"}", "upstream-123")
+
+    @pytest.mark.asyncio
+    async def test_log_records_are_stamped_with_request_id(self, caplog):
+        """Test that the logging filter picks the request ID from the context"""
+        caplog.handler.addFilter(RequestIdLogFilter())
+        transport = ASGITransport(app=app)
+        with caplog.at_level(logging.INFO):
+            async with AsyncClient(transport=transport, base_url="http://test") as client:
+                response = await client.get("/api/healthcheck")
+
+        request_id = response.headers["X-Request-ID"]
+        completed = [r for r in caplog.records if r.getMessage().startswith("Request completed")]
+        assert completed and completed[-1].request_id == request_id
+        assert get_request_id() == "unknown"
+
+    @pytest.mark.asyncio
+    async def test_server_timing_header(self, monkeypatch):
+        """Test that phase timings are emitted only when enabled"""
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            disabled = await client.get("/api/healthcheck")
+            monkeypatch.setattr(settings, "server_timing_header_enabled", True)
+            enabled = await client.get("/api/healthcheck")
+
+        assert "Server-Timing" not in disabled.headers
+        phases = [entry.split(";")[0] for entry in enabled.headers["Server-Timing"].split(", ")]
+        assert phases == ["deps", "endpoint", "serialize", "total"]
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("fused", [False, True])
+    async def test_streaming_commits_before_body_and_closes_after(self, fused):
+        """Test that the transaction is committed before the body and the session closed after it"""
+        events = []
+        transport = ASGITransport(app=build_app(events, fused))
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.get("/stream")
+
+        assert response.status_code == 200
+        assert response.content == b"abc"
+        assert response.headers["X-Request-ID"]
+        assert events == ["commit", "after_commit", "chunk:a", "chunk:b", "chunk:c", "close"]
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("fused", [False, True])
+    async def test_exception_rolls_back(self, fused):
+        """Test that an unhandled exception stops session work, rolls back, drops after-commit callbacks and closes"""
+        events = []
+        transport = ASGITransport(app=build_app(events, fused), raise_app_exceptions=False)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.get("/fail")
+
+        assert response.status_code == 500
+        assert events == ["before_close", "rollback", "close"]
@@ -0,0 +1,90 @@
+import asyncio
+import threading
+import time
+
+import pytest
+from contextlib import contextmanager
+from httpx import AsyncClient, ASGITransport
+
+from src.main import app
+from src.core.dependencies import JwtClient, get_jwt_client
+from src.core.profiling import SlowRequestProfiler, StackSampler
+
+
+@contextmanager
+def mock_authentication(mock_jwt_client):
+    """Context manager for temporary authentication override"""
+    app.dependency_overrides[get_jwt_client] = lambda: mock_jwt_client
+    try:
+        yield
+    finally:
+        app.dependency_overrides.pop(get_jwt_client, None)
+
+
+def busy_loop(stop: threading.Event):
+    while not stop.is_set():
+        sum(range(1000))
+
+
+class TestProfiling:
+    """Test the sampling profiler and the admin profile endpoint"""
+
+    def test_sampler_collects_collapsed_stacks(self):
+        stop = threading.Event()
+        worker = threading.Thread(target=busy_loop, args=(stop,), name="busy-worker")
+        worker.start()
+        sampler = StackSampler(interval=0.005, thread_ids=[worker.ident])
+        sampler.start()
+        time.sleep(0.1)
+        counts = sampler.stop()
+        stop.set()
+        worker.join()
+
+        assert sampler.samples > 0
+        assert counts
+        assert all(stack.startswith("busy-worker;") for stack in counts)
+        assert any("busy_loop (" in stack for stack in counts)
+
+    @pytest.mark.asyncio
+    async def test_slow_request_profile_only_samples_the_loop_thread(self, tmp_path):
+        stop = threading.Event()
+        worker = threading.Thread(target=busy_loop, args=(stop,), name="busy-worker")
+        worker.start()
+        profiler = SlowRequestProfiler(threshold_ms=10, interval_ms=5, output_dir=str(tmp_path))
+        watch = profiler.watch()
+        await asyncio.sleep(0.02)
+        # Keep the loop thread busy while sampling, as a slow request would
+        deadline = time.perf_counter() + 0.1
+        while time.perf_counter() < deadline:
+            sum(range(1000))
+        path = await profiler.finish(watch)
+        stop.set()
+        worker.join()
+
+        with open(path) as f:
+            stacks = f.read()
+        assert "test_slow_request_profile_only_samples_the_loop_thread" in stacks
+        assert "busy-worker" not in stacks
+
+    @pytest.mark.asyncio
+    async def test_profile_endpoint_requires_admin(self):
+        client = JwtClient(sub="test-client", roles=["base"], exp=9999999999)
+        with mock_authentication(client):
+            async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+                response = await ac.get("/api/admin/profile", params={"seconds": 0.05})
+        assert response.status_code == 403
+
+    @pytest.mark.asyncio
+    async def test_profile_endpoint_returns_collapsed_stacks(self):
+        admin = JwtClient(sub="test-admin", roles=["admin"], exp=9999999999)
+        with mock_authentication(admin):
+            async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+                response = await ac.get("/api/admin/profile", params={"seconds": 0.1})
+
+        assert response.status_code == 200
+        assert "attachment" in response.headers["content-disposition"]
+        lines = response.text.splitlines()
+        assert lines
+        stack, count = lines[0].rsplit(" ", 1)
+        assert int(count) > 0
+        assert ";" in stack
@@ -0,0 +1,57 @@
+import logging
+
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient, ASGITransport
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from src.core.config.settings import settings
+from src.core.metrics.http import http_request_db_queries, http_request_n_plus_one_total
+from src.core.middleware import MetricsMiddleware
+from src.infrastructure.database.instrumentation import instrument_queries
+
+
+def build_app() -> FastAPI:
+    engine = create_async_engine("sqlite+aiosqlite://")
+    instrument_queries(engine)
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware)
+
+    @app.get("/items/{count}")
+    async def items(count: int):
+        async with engine.connect() as connection:
+            for item_id in range(count):
+                await connection.execute(text("SELECT :id"), {"id": item_id})
+        return {"count": count}
+
+    return app
+
+
+class TestQueryStats:
+    """Test per-request SQL statement counting and N+1 detection"""
+
+    @pytest.mark.asyncio
+    async def test_statements_are_counted_and_repeats_flagged(self, caplog, monkeypatch):
+        monkeypatch.setattr(settings, "db_n_plus_one_threshold", 5)
+        route = "/items/{count}"
+        flagged_before = http_request_n_plus_one_total.get("GET", route)
+
+        with caplog.at_level(logging.INFO, logger="src.core.middleware.metrics"):
+            async with AsyncClient(transport=ASGITransport(app=build_app()), base_url="http://test") as ac:
+                assert (await ac.get("/items/3")).status_code == 200
+                assert (await ac.get("/items/8")).status_code == 200
+
+        messages = [record.getMessage() for record in caplog.records]
+        assert any("GET /items/3 - 200" in m and "db:3q/" in m for m in messages)
+        assert any("GET /items/8 - 200" in m and "db:8q/" in m for m in messages)
+
+        n_plus_one = [m for m in messages if "Possible N+1 query" in m]
+        assert len(n_plus_one) == 1
+        assert "ran the same statement 8 times: SELECT ?" in n_plus_one[0]
+        assert http_request_n_plus_one_total.get("GET", route) == flagged_before + 1
+
+        # Bucket counts followed by the sum of observed statement counts
+        values = http_request_db_queries._values(("GET", route))
+        assert sum(values[:-1]) == 2
+        assert values[-1] == 11
@@ -0,0 +1,354 @@
+import asyncio
+import csv
+import io
+import json
+import time
+
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient, ASGITransport
+from jose import jwt
+from sqlalchemy import insert
+
+from src.main import app
+from src.core.config.settings import settings
+from src.core.cache import InMemoryCacheBackend
+from src.core.cache.ttl_cache import cache_hits_total, cache_misses_total
+from src.domains.user import dependencies, service
+from src.domains.user.cache import CachedUserRepository
+from src.domains.user.models import Base, User
+from src.infrastructure.database.managers import SQLAlchemyDbManager
+
+
+def admin_headers() -> dict:
+    token = jwt.encode(
+        {"sub": "test-admin", "roles": ["admin"], "exp": int(time.time()) + 3600},
+        settings.jwt_secret_key,
+        algorithm=settings.jwt_algorithm
+    )
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest_asyncio.fixture
+async def db_manager(tmp_path):
+    """App database manager on a temporary SQLite file with a few users"""
+    db_manager = SQLAlchemyDbManager(database_uri=f"sqlite+aiosqlite:///{tmp_path / 'users.db'}")
+    await db_manager.connect()
+    async with db_manager.engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+        await connection.execute(insert(User), [
+            {"email": f"user{i}@example.com", "name": f"User {i}", "is_admin": i == 1}
+            for i in range(1, 4)
+        ])
+
+    previous = getattr(app.state, "db_manager", None)
+    app.state.db_manager = db_manager
+    service._users_count.invalidate()
+    yield db_manager
+    app.state.db_manager = previous
+    service._users_count.invalidate()
+    await db_manager.disconnect()
+
+
+@pytest.fixture
+def user_cache(monkeypatch):
+    backend = InMemoryCacheBackend("user-test", max_size=100, max_bytes=None, ttl=60)
+    monkeypatch.setattr(dependencies, "user_cache_backend", backend)
+    return backend
+
+
+class TestUserRoutes:
+    """Test user API endpoints"""
+
+    @pytest.mark.asyncio
+    async def test_get_user(self, db_manager):
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+            response = await ac.get("/api/users/1")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["id"] == 1
+        assert data["email"] == "user1@example.com"
+        assert data["is_admin"] is True
+        assert data["created_at"] is not None
+
+    @pytest.mark.asyncio
+    async def test_get_missing_user(self, db_manager):
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+            response = await ac.get("/api/users/999")
+
+        assert response.status_code == 404
+
+    @pytest.mark.asyncio
+    async def test_list_users_walks_pages_by_cursor(self, db_manager):
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+            first = await ac.get("/api/users/", params={"limit": 2}, headers=admin_headers())
+            cursor = first.json()["next_cursor"]
+            second = await ac.get("/api/users/", params={"limit": 2, "cursor": cursor}, headers=admin_headers())
+
+        assert first.status_code == 200
+        assert [user["id"] for user in first.json()["items"]] == [1, 2]
+        assert first.json()["total"] == 3
+        assert cursor is not None
+        assert [user["id"] for user in second.json()["items"]] == [3]
+        assert second.json()["next_cursor"] is None
+
+    @pytest.mark.asyncio
+    async def test_list_users_rejects_malformed_cursor(self, db_manager):
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+            response = await ac.get("/api/users/", params={"cursor": "not-a-cursor"}, headers=admin_headers())
+
+        assert response.status_code == 400
+
+    @pytest.mark.asyncio
+    async def test_list_users_requires_admin(self, db_manager):
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+            response = await ac.get("/api/users/")
+
+        assert response.status_code == 401
+
+    @pytest.mark.asyncio
+    async def test_create_and_delete_adjust_cached_total(self, db_manager):
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+            await ac.get("/api/users/", headers=admin_headers())
+            created = await ac.post("/api/users/", json={"email": "new@example.com", "name": "New"})
+            duplicate = await ac.post("/api/users/", json={"email": "new@example.com", "name": "New"})
+            after_create = await ac.get("/api/users/", headers=admin_headers())
+            deleted = await ac.delete("/api/users/1", headers=admin_headers())
+            missing = await ac.delete("/api/users/1", headers=admin_headers())
+            after_delete = await ac.get("/api/users/", headers=admin_headers())
+
+        assert created.status_code == 201
+        assert created.json()["id"] == 4
+        assert duplicate.status_code == 409
+        assert after_create.json()["total"] == 4
+        assert deleted.status_code == 204
+        assert missing.status_code == 404
+        assert after_delete.json()["total"] == 3
+        assert [user["id"] for user in after_delete.json()["items"]] == [2, 3, 4]
+
+    @pytest.mark.asyncio
+    async def test_export_ndjson(self, db_manager, monkeypatch):
+        monkeypatch.setattr(settings, "user_export_batch_size", 2)
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+            response = await ac.get("/api/users/export", headers=admin_headers())
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-ndjson"
+        users = [json.loads(line) for line in response.text.splitlines()]
+        assert [user["id"] for user in users] == [1, 2, 3]
+        assert users[0]["email"] == "user1@example.com"
+        assert users[0]["created_at"] is not None
+
+    @pytest.mark.asyncio
+    async def test_export_csv(self, db_manager):
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+            response = await ac.get("/api/users/export", params={"format": "csv"}, headers=admin_headers())
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/csv")
+        rows = list(csv.DictReader(io.StringIO(response.text)))
+        assert [row["id"] for row in rows] == ["1", "2", "3"]
+        assert rows[0]["is_admin"] == "True"
+
+    @pytest.mark.asyncio
+    async def test_export_requires_admin(self, db_manager):
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+            response = await ac.get("/api/users/export")
+
+        assert response.status_code == 401
+
+    @pytest.mark.asyncio
+    async def test_update_user(self, db_manager):
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+            updated = await ac.put("/api/users/2", json={"name": "Renamed"}, headers=admin_headers())
+            conflict = await ac.put("/api/users/2", json={"email": "user3@example.com"}, headers=admin_headers())
+            missing = await ac.put("/api/users/999", json={"name": "Nobody"}, headers=admin_headers())
+
+        assert updated.status_code == 200
+        assert updated.json()["name"] == "Renamed"
+        assert updated.json()["email"] == "user2@example.com"
+        assert conflict.status_code == 409
+        assert missing.status_code == 404
+
+
+class TestUserCache:
+    """Test the read-through user cache and its invalidation after commit"""
+
+    @pytest.mark.asyncio
+    async def test_repeated_lookup_is_served_from_cache(self, db_manager, user_cache):
+        hits = cache_hits_total.get("user-test")
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+            first = await ac.get("/api/users/1")
+            second = await ac.get("/api/users/1")
+
+        assert first.json() == second.json()
+        assert cache_hits_total.get("user-test") == hits + 1
+        assert len(user_cache.cache) == 1
+
+    @pytest.mark.asyncio
+    async def test_update_and_delete_invalidate_after_commit(self, db_manager, user_cache):
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+            await ac.get("/api/users/2")
+            await ac.put("/api/users/2", json={"name": "Renamed"}, headers=admin_headers())
+            renamed = await ac.get("/api/users/2")
+            await ac.delete("/api/users/2", headers=admin_headers())
+            deleted = await ac.get("/api/users/2")
+
+        assert renamed.json()["name"] == "Renamed"
+        assert deleted.status_code == 404
+
+    @pytest.mark.asyncio
+    async def test_each_lookup_counts_one_hit_or_miss(self, user_cache):
+        class RowRepository:
+            def __init__(self):
+                self.callbacks = []
+
+            async def get_row_by_id(self, user_id):
+                return (user_id,)
+
+            def on_commit(self, callback):
+                self.callbacks.append(callback)
+
+        repository = RowRepository()
+        cached = CachedUserRepository(repository, user_cache)
+        hits, misses = cache_hits_total.get("user-test"), cache_misses_total.get("user-test")
+
+        await cached.get_row_by_id(7)
+        await cached.get_row_by_id(7)
+        cached._invalidate_on_commit(7)
+        await repository.callbacks[0]()
+        # The tombstone is a miss, not a hit
+        await cached.get_row_by_id(7)
+
+        assert cache_hits_total.get("user-test") == hits + 1
+        assert cache_misses_total.get("user-test") == misses + 2
+
+    @pytest.mark.asyncio
+    async def test_slow_load_does_not_recache_invalidated_row(self, user_cache):
+        class SlowRepository:
+            def __init__(self):
+                self.rows = {2: ("stale",)}
+                self.loading = asyncio.Event()
+                self.release = asyncio.Event()
+                self.callbacks = []
+
+            async def get_row_by_id(self, user_id):
+                row = self.rows[user_id]
+                self.loading.set()
+                await self.release.wait()
+                return row
+
+            def on_commit(self, callback):
+                self.callbacks.append(callback)
+
+        repository = SlowRepository()
+        cached = CachedUserRepository(repository, user_cache)
+        reader = asyncio.create_task(cached.get_row_by_id(2))
+        await repository.loading.wait()
+
+        repository.rows[2] = ("fresh",)
+        cached._invalidate_on_commit(2)
+        for callback in repository.callbacks:
+            await callback()
+        repository.release.set()
+
+        assert await reader == ("stale",)
+        assert await cached.get_row_by_id(2) == ("fresh",)
+        assert await user_cache.get("user:row:2") == ("fresh",)
+
+
+class TestBulkUpsert:
+    """Test bulk user import from JSON arrays and NDJSON streams"""
+
+    @pytest.mark.asyncio
+    async def test_json_array_creates_and_skips_existing(self, db_manager, monkeypatch):
+        monkeypatch.setattr(settings, "user_bulk_chunk_size", 2)
+        payload = [
+            {"email": "user1@example.com", "name": "Existing"},
+            {"email": "bulk1@example.com", "name": "Bulk 1"},
+            {"email": "not-an-email", "name": "Broken"},
+            {"email": "bulk1@example.com", "name": "Duplicate"},
+            {"email": "bulk2@example.com", "name": "Bulk 2"},
+        ]
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+            response = await ac.post("/api/users/bulk", json=payload, headers=admin_headers())
+            existing = await ac.get("/api/users/1")
+            listing = await ac.get("/api/users/", headers=admin_headers())
+
+        assert response.status_code == 200
+        results = [json.loads(line) for line in response.text.splitlines()]
+        assert [result["index"] for result in results] == [0, 1, 2, 3, 4]
+        assert [result["status"] for result in results] == ["skipped", "created", "invalid", "skipped", "created"]
+        assert results[0]["id"] == 1
+        assert results[2]["errors"]
+        assert existing.json()["name"] == "User 1"
+        assert listing.json()["total"] == 5
+
+    @pytest.mark.asyncio
+    async def test_ndjson_stream_updates_existing(self, db_manager):
+        body = b"".join([
+            b'{"email": "user2@example.com", "name": "Synced", "is_admin": true}\n',
+            b'{"email": "bulk@example.com", "name": "Bulk"}\n',
+            b'{"email": "user3@example.com", "name": "  "}\n',
+            b'{not json}\n',
+        ])
+        headers = {**admin_headers(), "Content-Type": "application/x-ndjson"}
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+            response = await ac.post("/api/users/bulk", params={"on_conflict": "update"}, content=body, headers=headers)
+            updated = await ac.get("/api/users/2")
+            created = await ac.get("/api/users/4")
+
+        results = [json.loads(line) for line in response.text.splitlines()]
+        assert [result["status"] for result in results] == ["updated", "created", "invalid", "invalid"]
+        assert updated.json()["name"] == "Synced"
+        assert updated.json()["is_admin"] is True
+        assert updated.json()["updated_at"] is not None
+        assert created.json()["email"] == "bulk@example.com"
+
+    @pytest.mark.asyncio
+    async def test_update_keeps_fields_missing_from_record(self, db_manager):
+        payload = [{"email": "user1@example.com", "name": "Renamed"}]
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+            response = await ac.post(
+                "/api/users/bulk", params={"on_conflict": "update"}, json=payload, headers=admin_headers()
+            )
+            updated = await ac.get("/api/users/1")
+
+        assert json.loads(response.text)["status"] == "updated"
+        assert updated.json()["name"] == "Renamed"
+        assert updated.json()["is_admin"] is True
+        assert updated.json()["is_active"] is True
+
+    @pytest.mark.asyncio
+    async def test_json_array_over_limit_is_rejected(self, db_manager, monkeypatch):
+        monkeypatch.setattr(settings, "user_bulk_json_max_bytes", 64)
+        payload = [{"email": f"bulk{i}@example.com", "name": f"Bulk {i}"} for i in range(5)]
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+            response = await ac.post("/api/users/bulk", json=payload, headers=admin_headers())
+            listing = await ac.get("/api/users/", headers=admin_headers())
+
+        assert response.status_code == 413
+        assert listing.json()["total"] == 3
+
+    @pytest.mark.asyncio
+    async def test_ndjson_line_over_limit_is_invalid(self, db_manager, monkeypatch):
+        monkeypatch.setattr(settings, "user_bulk_ndjson_max_line_bytes", 64)
+        body = b"".join([
+            b'{"email": "long@example.com", "name": "' + b"x" * 100 + b'"}\n',
+            b'{"email": "short@example.com", "name": "Short"}\n',
+        ])
+        headers = {**admin_headers(), "Content-Type": "application/x-ndjson"}
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+            response = await ac.post("/api/users/bulk", content=body, headers=headers)
+
+        results = [json.loads(line) for line in response.text.splitlines()]
+        assert [result["status"] for result in results] == ["invalid", "created"]
+        assert "size limit" in results[0]["errors"][0]
+
+    @pytest.mark.asyncio
+    async def test_bulk_requires_admin(self, db_manager):
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+            response = await ac.post("/api/users/bulk", json=[])
+
+        assert response.status_code == 401
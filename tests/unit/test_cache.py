@@ -0,0 +1,145 @@
+import time
+from types import SimpleNamespace
+
+import pytest
+from jose import jwt
+
+from src.core.cache import CachedCount, TTLCache
+from src.core.cache.ttl_cache import cache_hits_total, cache_misses_total
+from src.core.config.settings import settings
+from src.core.dependencies import jwt as jwt_module
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestTTLCache:
+    """Test the bounded LRU cache with per-entry expiry"""
+
+    def test_entries_expire_after_ttl(self):
+        clock = FakeClock()
+        cache = TTLCache("test-expiry", max_size=10, ttl=10, clock=clock)
+        cache.set("a", 1)
+        cache.set("b", 2, ttl=1)
+
+        clock.now = 5
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+
+        clock.now = 11
+        assert cache.get("a") is None
+        assert len(cache) == 0
+
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = TTLCache("test-lru", max_size=2, ttl=10, clock=FakeClock())
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert cache.get("c") == 3
+
+    def test_memory_budget_evicts_least_recently_used(self):
+        cache = TTLCache("test-bytes", max_size=100, ttl=10, max_bytes=250, sizeof=lambda value: 100)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.set("a", 3)
+        assert cache.bytes == 200
+
+        cache.set("c", 4)
+        assert cache.get("b") is None
+        assert cache.get("a") == 3
+        assert cache.bytes == 200
+
+    def test_hits_and_misses_are_counted(self):
+        cache = TTLCache("test-metrics", max_size=2, ttl=10, clock=FakeClock())
+        cache.set("a", 1)
+        cache.get("a")
+        cache.get("missing")
+
+        assert cache_hits_total.get("test-metrics") == 1
+        assert cache_misses_total.get("test-metrics") == 1
+
+
+class TestCachedCount:
+    """Test the periodically reloaded, incrementally adjusted total"""
+
+    @pytest.mark.asyncio
+    async def test_reloads_after_ttl_and_adjusts_in_between(self):
+        clock = FakeClock()
+        counter = CachedCount("test-count", ttl=10, clock=clock)
+        loads = []
+
+        async def loader() -> int:
+            loads.append(clock.now)
+            return 100
+
+        assert await counter.get(loader) == 100
+        counter.adjust(2)
+        counter.adjust(-1)
+        assert await counter.get(loader) == 101
+        assert len(loads) == 1
+
+        clock.now = 10
+        assert await counter.get(loader) == 100
+        assert len(loads) == 2
+
+
+class TestJwtTokenCache:
+    """Test that verified tokens are reused and never outlive exp"""
+
+    @pytest.fixture
+    def clock(self):
+        return FakeClock()
+
+    @pytest.fixture
+    def decode_calls(self, monkeypatch, clock):
+        calls = []
+        decode = jwt.decode
+
+        def counting_decode(*args, **kwargs):
+            calls.append(args[0])
+            return decode(*args, **kwargs)
+
+        cache = TTLCache("jwt-test", max_size=10, ttl=300, clock=clock)
+        monkeypatch.setattr(jwt_module, "_token_cache", cache)
+        monkeypatch.setattr(jwt_module.jwt, "decode", counting_decode)
+        return calls
+
+    def create_token(self, exp: float) -> str:
+        return jwt.encode(
+            {"sub": "client", "roles": ["base"], "exp": int(exp)},
+            settings.jwt_secret_key,
+            algorithm=settings.jwt_algorithm
+        )
+
+    def test_repeated_token_is_verified_once(self, decode_calls):
+        token = self.create_token(time.time() + 3600)
+
+        first = jwt_module.validate_jwt_token(token)
+        second = jwt_module.validate_jwt_token(token)
+
+        assert first.sub == second.sub == "client"
+        assert len(decode_calls) == 1
+
+    def test_cached_token_expires_with_exp(self, decode_calls, clock, monkeypatch):
+        exp = int(time.time()) + 3600
+        token = self.create_token(exp)
+        # One second before exp when cached: the entry TTL is capped to that second
+        monkeypatch.setattr(jwt_module, "time", SimpleNamespace(time=lambda: exp - 1))
+        jwt_module.validate_jwt_token(token)
+
+        clock.now = 0.5
+        jwt_module.validate_jwt_token(token)
+        assert len(decode_calls) == 1
+
+        clock.now = 1.5
+        jwt_module.validate_jwt_token(token)
+        assert len(decode_calls) == 2
@@ -0,0 +1,165 @@
+import asyncio
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import event, insert
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from src.core.concurrency import DataLoader
+from src.core.config.settings import settings
+from src.domains.user.models import Base, User
+from src.domains.user.repository import UserRepositorySQLAlchemy
+
+
+class BatchRecorder:
+    """Batch function returning key * 10 for keys below 100, recording every batch"""
+
+    def __init__(self, error: Exception = None):
+        self.batches = []
+        self.error = error
+
+    async def __call__(self, keys):
+        self.batches.append(list(keys))
+        if self.error is not None:
+            raise self.error
+        return {key: key * 10 for key in keys if key < 100}
+
+
+class TestDataLoader:
+    """Test per-tick batching, deduplication and batch size limits"""
+
+    @pytest.mark.asyncio
+    async def test_loads_in_one_tick_share_one_deduplicated_batch(self):
+        batch_fn = BatchRecorder()
+        loader = DataLoader(batch_fn, "test-tick")
+
+        results = await asyncio.gather(loader.load(1), loader.load(2), loader.load(1), loader.load(100))
+
+        assert results == [10, 20, 10, None]
+        assert batch_fn.batches == [[1, 2, 100]]
+
+    @pytest.mark.asyncio
+    async def test_batches_are_split_by_max_batch_size(self):
+        batch_fn = BatchRecorder()
+        loader = DataLoader(batch_fn, "test-split", max_batch_size=2)
+
+        assert await loader.load_many([1, 2, 3, 4, 5]) == [10, 20, 30, 40, 50]
+        assert batch_fn.batches == [[1, 2], [3, 4], [5]]
+
+    @pytest.mark.asyncio
+    async def test_batch_error_reaches_every_caller(self):
+        loader = DataLoader(BatchRecorder(error=RuntimeError("db down")), "test-error")
+
+        results = await asyncio.gather(loader.load(1), loader.load(2), return_exceptions=True)
+
+        assert all(isinstance(result, RuntimeError) for result in results)
+
+    @pytest.mark.asyncio
+    async def test_loaders_sharing_a_lock_never_run_batches_concurrently(self):
+        running = []
+        overlaps = []
+
+        async def batch_fn(keys):
+            overlaps.append(bool(running))
+            running.append(keys)
+            await asyncio.sleep(0)
+            running.remove(keys)
+            return {key: key for key in keys}
+
+        lock = asyncio.Lock()
+        first = DataLoader(batch_fn, "test-lock-first", lock=lock)
+        second = DataLoader(batch_fn, "test-lock-second", lock=lock)
+
+        async def later_tick():
+            await asyncio.sleep(0)
+            return await first.load(3)
+
+        assert await asyncio.gather(first.load(1), second.load(2), later_tick()) == [1, 2, 3]
+        assert overlaps == [False, False, False]
+
+
+    @pytest.mark.asyncio
+    async def test_close_cancels_running_batch_of_cancelled_caller(self):
+        started = asyncio.Event()
+        finished = []
+
+        async def batch_fn(keys):
+            started.set()
+            await asyncio.sleep(10)
+            finished.append(keys)
+            return {}
+
+        loader = DataLoader(batch_fn, "test-close")
+        caller = asyncio.create_task(loader.load(1))
+        await started.wait()
+        caller.cancel()
+        queued = asyncio.create_task(loader.load(2))
+        await asyncio.sleep(0)
+
+        await loader.close()
+
+        assert not loader._tasks
+        assert finished == []
+        with pytest.raises(asyncio.CancelledError):
+            await queued
+
+
+@pytest_asyncio.fixture
+async def session_factory(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'users.db'}")
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+        await connection.execute(insert(User), [
+            {"email": f"user{i}@example.com", "name": f"User {i}"} for i in range(1, 11)
+        ])
+    yield async_sessionmaker(engine, expire_on_commit=False)
+    await engine.dispose()
+
+
+class TestUserRepositoryBatching:
+    """Test that concurrent user lookups on one session become one query"""
+
+    @pytest.mark.asyncio
+    async def test_gathered_lookups_issue_one_query(self, session_factory):
+        statements = []
+        engine = session_factory.kw["bind"]
+        event.listen(engine.sync_engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+        async with session_factory() as session:
+            repository = UserRepositorySQLAlchemy(session)
+            by_id = await asyncio.gather(*(repository.get_by_id(user_id) for user_id in (3, 1, 3, 42)))
+            by_email = await asyncio.gather(
+                repository.get_by_email("user2@example.com"), repository.get_by_email("user5@example.com")
+            )
+            many = await repository.get_many_by_ids([5, 6, 99])
+
+        assert [user.id if user else None for user in by_id] == [3, 1, 3, None]
+        assert [user.id for user in by_email] == [2, 5]
+        assert [user.id if user else None for user in many] == [5, 6, None]
+        assert len(statements) == 3
+
+    @pytest.mark.asyncio
+    async def test_users_in_identity_map_are_not_queried(self, session_factory):
+        statements = []
+        engine = session_factory.kw["bind"]
+        event.listen(engine.sync_engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+        async with session_factory() as session:
+            repository = UserRepositorySQLAlchemy(session)
+            user = await repository.get_by_id(4)
+            again = await repository.get_by_id(4)
+            many = await repository.get_many_by_ids([4, 7])
+
+        assert again is user
+        assert [user.id for user in many] == [4, 7]
+        assert len(statements) == 2
+
+    @pytest.mark.asyncio
+    async def test_unbatched_lookup_accepts_a_generator(self, session_factory, monkeypatch):
+        monkeypatch.setattr(settings, "user_batch_loading_enabled", False)
+
+        async with session_factory() as session:
+            repository = UserRepositorySQLAlchemy(session)
+            users = await repository.get_many_by_ids(user_id for user_id in (2, 99, 1))
+
+        assert [user.id if user else None for user in users] == [2, None, 1]
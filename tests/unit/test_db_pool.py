@@ -0,0 +1,92 @@
+import asyncio
+import sys
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import text
+
+from src.infrastructure.database.managers import SQLAlchemyDbManager
+from src.infrastructure.database.pool import db_pool_checked_out, db_pool_idle, db_pool_size, db_pool_wait_seconds
+
+
+def pool_waits(label: str):
+    """Count and sum of the pool wait histogram"""
+    values = db_pool_wait_seconds._values((label,))
+    return sum(values[:-1]), values[-1]
+
+
+class TestSQLAlchemyPool:
+    """Test pool settings, warm-up and pool gauges"""
+
+    @pytest_asyncio.fixture
+    async def db_manager(self, tmp_path):
+        db_manager = SQLAlchemyDbManager(
+            database_uri=f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}",
+            db_pool_size=3,
+            db_max_overflow=1,
+            db_pool_pre_ping=True,
+            sqlite_tuning_enabled=False  # The SQLite profile pins the writer pool to one connection
+        )
+        await db_manager.connect()
+        yield db_manager
+        await db_manager.disconnect()
+
+    @pytest.mark.asyncio
+    async def test_pool_settings_are_applied(self, db_manager):
+        pool = db_manager.engine.sync_engine.pool
+        assert pool.size() == 3
+        assert pool._max_overflow == 1
+        assert pool._pre_ping is True
+
+    @pytest.mark.asyncio
+    async def test_warm_up_opens_connections_and_gauges_follow_checkouts(self, db_manager):
+        await db_manager.warm_up(3)
+        assert db_pool_size.get("primary") == 3
+        assert db_pool_idle.get("primary") == 3
+        assert db_pool_checked_out.get("primary") == 0
+
+        async with db_manager.get_db_provider() as session:
+            await session.execute(text("SELECT 1"))
+            assert db_pool_checked_out.get("primary") == 1
+            assert db_pool_idle.get("primary") == 2
+
+        assert db_pool_checked_out.get("primary") == 0
+        assert db_pool_idle.get("primary") == 3
+
+    @pytest.mark.asyncio
+    async def test_only_checkouts_queued_on_an_exhausted_pool_count_as_waits(self, db_manager):
+        waits, waited = pool_waits("primary")
+        engine = db_manager.engine
+        # pool_size 3 + max_overflow 1: four checkouts open or reuse a connection without waiting
+        connections = [await engine.connect() for _ in range(4)]
+        assert pool_waits("primary")[0] == waits
+
+        async def checkout():
+            return await engine.connect()
+
+        waiting = asyncio.create_task(checkout())
+        await asyncio.sleep(0.05)
+        await connections.pop().close()
+        connections.append(await waiting)
+
+        for connection in connections:
+            await connection.close()
+        count, total = pool_waits("primary")
+        assert count == waits + 1
+        assert total - waited >= 0.04
+
+    @pytest.mark.asyncio
+    async def test_missing_sqlalchemy_fails_in_connect(self, monkeypatch):
+        monkeypatch.setitem(sys.modules, "sqlalchemy.ext.asyncio", None)
+        db_manager = SQLAlchemyDbManager(database_uri="sqlite+aiosqlite:///./missing.db")
+        with pytest.raises(RuntimeError, match="SQLAlchemy is required"):
+            await db_manager.connect()
+
+    @pytest.mark.asyncio
+    async def test_in_memory_sqlite_keeps_static_pool(self):
+        db_manager = SQLAlchemyDbManager(database_uri="sqlite+aiosqlite://", db_pool_size=3)
+        await db_manager.connect()
+        try:
+            assert "pool_size" not in db_manager.engine_options
+        finally:
+            await db_manager.disconnect()
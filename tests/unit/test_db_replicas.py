@@ -0,0 +1,101 @@
+import sqlite3
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import column, insert, table, text
+
+from src.domains.user.models import User
+from src.infrastructure.database.managers import SQLAlchemyDbManager
+from src.infrastructure.database.transactions import ReadOnlySessionError
+
+
+def create_database(path, name: str) -> str:
+    with sqlite3.connect(path) as connection:
+        connection.execute("CREATE TABLE marker (name TEXT)")
+        connection.execute("INSERT INTO marker VALUES (?)", (name,))
+    return f"sqlite+aiosqlite:///{path}"
+
+
+async def served_by(session) -> str:
+    async with session:
+        return (await session.execute(text("SELECT name FROM marker"))).scalar_one()
+
+
+class TestReadReplicas:
+    """Test read/write splitting with SQLite files standing in for a primary and its replicas"""
+
+    @pytest_asyncio.fixture
+    async def db_manager(self, tmp_path):
+        self.missing_dir = tmp_path / "missing"
+        db_manager = SQLAlchemyDbManager(
+            database_uri=create_database(tmp_path / "primary.db", "primary"),
+            database_replica_uris=[
+                create_database(tmp_path / "replica0.db", "replica0"),
+                create_database(tmp_path / "replica1.db", "replica1"),
+                f"sqlite+aiosqlite:///{self.missing_dir / 'replica2.db'}",
+            ],
+            db_replica_health_check_interval_seconds=3600
+        )
+        await db_manager.connect()
+        yield db_manager
+        await db_manager.disconnect()
+
+    @pytest.mark.asyncio
+    async def test_reads_are_balanced_over_healthy_replicas(self, db_manager):
+        served = [await served_by(db_manager.get_read_db_provider()) for _ in range(4)]
+
+        assert sorted(served) == ["replica0", "replica0", "replica1", "replica1"]
+        assert await served_by(db_manager.get_db_provider()) == "primary"
+
+    @pytest.mark.asyncio
+    async def test_recovered_replica_returns_to_rotation(self, db_manager):
+        self.missing_dir.mkdir()
+        create_database(self.missing_dir / "replica2.db", "replica2")
+        await db_manager.replica_set.check_health()
+
+        served = {await served_by(db_manager.get_read_db_provider()) for _ in range(3)}
+        assert served == {"replica0", "replica1", "replica2"}
+
+    @pytest.mark.asyncio
+    async def test_primary_serves_reads_without_healthy_replicas(self, db_manager, monkeypatch):
+        async def failing_check(replica):
+            return False
+
+        monkeypatch.setattr(db_manager.replica_set, "_check", failing_check)
+        await db_manager.replica_set.check_health()
+
+        session = db_manager.get_read_db_provider()
+        assert session.info["read_only"] is True
+        assert await served_by(session) == "primary"
+
+        async with db_manager.get_read_db_provider() as session:
+            with pytest.raises(ReadOnlySessionError):
+                await session.execute(text("INSERT INTO marker VALUES ('written')"))
+        # The primary's pooled connection is not left read-only for writers
+        async with db_manager.get_db_provider() as session:
+            await session.execute(text("INSERT INTO marker VALUES ('written')"))
+
+    @pytest.mark.asyncio
+    async def test_read_session_rejects_writes(self, db_manager):
+        async with db_manager.get_read_db_provider() as session:
+            with pytest.raises(ReadOnlySessionError):
+                await session.execute(insert(table("marker", column("name"))).values(name="written"))
+
+        async with db_manager.get_read_db_provider() as session:
+            session.add(User(email="reader@example.com", name="Reader"))
+            with pytest.raises(ReadOnlySessionError):
+                await session.flush()
+
+        async with db_manager.get_read_db_provider() as session:
+            connection = await session.connection()
+            with pytest.raises(ReadOnlySessionError):
+                await connection.execute(insert(table("marker", column("name"))).values(name="written"))
+            with pytest.raises(ReadOnlySessionError):
+                await session.execute(text("INSERT INTO marker VALUES ('written')"))
+            assert (await session.execute(text("SELECT count(*) FROM marker"))).scalar_one() == 1
+
+        # Pooled connections used by read sessions stay writable for write sessions
+        for _ in range(3):
+            async with db_manager.get_db_provider() as session:
+                await session.execute(text("INSERT INTO marker VALUES ('written')"))
+                await session.execute(insert(table("marker", column("name"))).values(name="written"))
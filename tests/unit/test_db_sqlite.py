@@ -0,0 +1,67 @@
+import asyncio
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import insert, text
+
+from src.domains.user.models import Base, User
+from src.infrastructure.database.managers import SQLAlchemyDbManager
+from src.infrastructure.database.transactions import ReadOnlySessionError
+
+
+class TestSQLiteProfile:
+    """Test the SQLite pragmas, the single writer and the separate reader pool"""
+
+    @pytest_asyncio.fixture
+    async def db_manager(self, tmp_path):
+        db_manager = SQLAlchemyDbManager(
+            database_uri=f"sqlite+aiosqlite:///{tmp_path / 'tuned.db'}",
+            sqlite_busy_timeout_ms=2000,
+            db_pool_timeout=10.0
+        )
+        await db_manager.connect()
+        async with db_manager.engine.begin() as connection:
+            await connection.run_sync(Base.metadata.create_all)
+        yield db_manager
+        await db_manager.disconnect()
+
+    @pytest.mark.asyncio
+    async def test_pragmas_are_applied_on_connect(self, db_manager):
+        async with db_manager.get_read_db_provider() as session:
+            journal_mode = (await session.execute(text("PRAGMA journal_mode"))).scalar()
+            synchronous = (await session.execute(text("PRAGMA synchronous"))).scalar()
+            busy_timeout = (await session.execute(text("PRAGMA busy_timeout"))).scalar()
+
+        assert journal_mode == "wal"
+        assert synchronous == 1  # NORMAL
+        assert busy_timeout == 2000
+
+    @pytest.mark.asyncio
+    async def test_writer_is_single_connection_and_readers_are_read_only(self, db_manager):
+        assert db_manager.engine.sync_engine.pool.size() == 1
+        assert db_manager.read_engine.sync_engine.pool.size() == 5
+
+        async with db_manager.get_read_db_provider() as session:
+            assert session.bind is db_manager.read_engine
+            with pytest.raises(ReadOnlySessionError):
+                await session.execute(insert(User).values(email="reader@example.com", name="Reader"))
+            with pytest.raises(ReadOnlySessionError):
+                await session.execute(text("INSERT INTO users (email, name) VALUES ('reader@example.com', 'Reader')"))
+            assert (await session.execute(text("PRAGMA query_only"))).scalar_one() == 1
+
+    @pytest.mark.asyncio
+    async def test_concurrent_write_transactions_do_not_fail(self, db_manager):
+        async def write(i: int) -> None:
+            async with db_manager.get_db_provider() as session:
+                # Writers queue for the single writer connection instead of the SQLite write lock
+                await session.execute(text("SELECT count(*) FROM user"))
+                await session.execute(insert(User).values(email=f"user{i}@example.com", name=f"User {i}"))
+                await session.commit()
+
+        async def read() -> int:
+            async with db_manager.get_read_db_provider() as session:
+                return (await session.execute(text("SELECT count(*) FROM user"))).scalar()
+
+        await asyncio.gather(*(write(i) for i in range(20)), *(read() for _ in range(20)))
+
+        assert await read() == 20
@@ -0,0 +1,113 @@
+import asyncio
+import json
+import os
+import time
+
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, rsa
+from fastapi import HTTPException
+from jose import jwk, jwt
+
+from src.core.dependencies import jwt as jwt_module
+from src.core.security import JwksKeySet, JwksRefresher
+
+
+def private_pem(private_key) -> bytes:
+    return private_key.private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+    )
+
+
+def public_jwk(private_key, algorithm: str, kid: str) -> dict:
+    public_pem = private_key.public_key().public_bytes(
+        serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo
+    )
+    key_data = jwk.construct(public_pem, algorithm).to_dict()
+    key_data["kid"] = kid
+    return key_data
+
+
+def sign(private_key, algorithm: str, kid: str, sub: str = "client") -> str:
+    claims = {"sub": sub, "roles": ["base"], "exp": int(time.time()) + 3600}
+    return jwt.encode(claims, private_pem(private_key), algorithm=algorithm, headers={"kid": kid})
+
+
+def write_jwks(path, *keys: dict) -> None:
+    path.write_text(json.dumps({"keys": list(keys)}))
+    # Make the change visible even within the same mtime tick
+    os.utime(path, ns=(time.time_ns(), time.time_ns() + len(keys)))
+
+
+class TestJwksKeySet:
+    """Test asymmetric JWT verification against a local JWKS file"""
+
+    @pytest.fixture
+    def rsa_key(self):
+        return rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+    @pytest.fixture
+    def ec_key(self):
+        return ec.generate_private_key(ec.SECP256R1())
+
+    @pytest.fixture
+    def jwks_path(self, tmp_path, rsa_key, ec_key):
+        path = tmp_path / "jwks.json"
+        write_jwks(path, public_jwk(rsa_key, "RS256", "rsa-1"), public_jwk(ec_key, "ES256", "ec-1"))
+        return path
+
+    @pytest.fixture
+    def key_set(self, jwks_path, monkeypatch):
+        key_set = JwksKeySet(str(jwks_path))
+        monkeypatch.setattr(jwt_module, "_jwks_key_set", key_set)
+        monkeypatch.setattr(jwt_module, "_token_cache", None)
+        return key_set
+
+    def test_rs256_and_es256_tokens_are_verified(self, key_set, rsa_key, ec_key):
+        assert jwt_module.validate_jwt_token(sign(rsa_key, "RS256", "rsa-1", "rsa-client")).sub == "rsa-client"
+        assert jwt_module.validate_jwt_token(sign(ec_key, "ES256", "ec-1", "ec-client")).sub == "ec-client"
+
+    @pytest.mark.parametrize("kid", ["unknown", "ec-1"])
+    def test_unknown_or_mismatched_key_is_rejected(self, key_set, rsa_key, kid):
+        with pytest.raises(HTTPException) as exc_info:
+            jwt_module.validate_jwt_token(sign(rsa_key, "RS256", kid))
+        assert exc_info.value.status_code == 401
+
+    @pytest.mark.parametrize("kid", [["rsa-1"], {"kid": "rsa-1"}, 1])
+    def test_non_string_key_id_is_rejected(self, key_set, rsa_key, kid):
+        with pytest.raises(HTTPException) as exc_info:
+            jwt_module.validate_jwt_token(sign(rsa_key, "RS256", kid))
+        assert exc_info.value.status_code == 401
+
+    def test_shared_secret_tokens_are_rejected(self, key_set):
+        token = jwt.encode({"sub": "client", "exp": int(time.time()) + 3600}, "secret", algorithm="HS256",
+                           headers={"kid": "rsa-1"})
+        with pytest.raises(HTTPException):
+            jwt_module.validate_jwt_token(token)
+
+    @pytest.mark.asyncio
+    async def test_rotated_file_is_reloaded_in_background(self, key_set, jwks_path, rsa_key):
+        new_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        write_jwks(jwks_path, public_jwk(new_key, "RS256", "rsa-2"))
+        # Lookups never touch the file
+        assert key_set.get("rsa-2") is None
+
+        refresher = JwksRefresher(key_set, interval=0.01)
+        await refresher.start()
+        try:
+            for _ in range(100):
+                if key_set.get("rsa-2") is not None:
+                    break
+                await asyncio.sleep(0.01)
+        finally:
+            await refresher.stop()
+
+        assert jwt_module.validate_jwt_token(sign(new_key, "RS256", "rsa-2")).sub == "client"
+        assert key_set.get("rsa-1") is None
+
+    def test_invalid_file_keeps_previous_keys(self, key_set, jwks_path, rsa_key):
+        jwks_path.write_text("{not json")
+        os.utime(jwks_path, ns=(time.time_ns(), time.time_ns() + 99))
+        assert key_set.reload_if_changed() is False
+
+        assert jwt_module.validate_jwt_token(sign(rsa_key, "RS256", "rsa-1")).sub == "client"
@@ -0,0 +1,27 @@
+import logging
+import queue
+
+from src.core.logs.handlers import BoundedQueueHandler
+
+
+def make_record(level: int, msg: str) -> logging.LogRecord:
+    return logging.makeLogRecord({"name": "test", "levelno": level, "levelname": logging.getLevelName(level), "msg": msg})
+
+
+class TestBoundedQueueHandler:
+    """Test overflow behaviour of the logging queue"""
+
+    def test_headroom_keeps_errors_and_full_queue_never_blocks(self):
+        log_queue: queue.Queue = queue.Queue(maxsize=2)
+        handler = BoundedQueueHandler(log_queue, warning_headroom=1)
+        handler.enqueue(make_record(logging.INFO, "first"))
+
+        # The last slot is reserved, info is dropped while an error still fits
+        handler.enqueue(make_record(logging.INFO, "dropped"))
+        handler.enqueue(make_record(logging.ERROR, "kept"))
+        assert handler.take_dropped() == (1, 0)
+
+        # Completely full: the error is dropped and counted instead of waiting for the listener
+        handler.enqueue(make_record(logging.ERROR, "overflow"))
+        assert handler.take_dropped() == (0, 1)
+        assert [log_queue.get_nowait().msg for _ in range(2)] == ["first", "kept"]
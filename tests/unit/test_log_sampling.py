@@ -0,0 +1,63 @@
+from src.core.logs.sampling import LogSampler
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestLogSampler:
+    """Test adaptive per-request log sampling"""
+
+    def create_sampler(self, clock: FakeClock, random_value: float = 0.5) -> LogSampler:
+        return LogSampler(
+            enabled=True,
+            default_rate=0.1,
+            route_rates={"/api/healthcheck": 0.0},
+            error_rate_threshold=0.1,
+            slow_threshold_ms=1000,
+            window_seconds=10,
+            min_window_requests=10,
+            random_func=lambda: random_value,
+            clock=clock
+        )
+
+    def test_errors_client_errors_and_slow_requests_are_always_logged(self):
+        sampler = self.create_sampler(FakeClock())
+
+        assert sampler.should_log("/api/healthcheck", 500, 1)
+        assert sampler.should_log("/api/healthcheck", 404, 1)
+        assert sampler.should_log("/api/healthcheck", 200, 1500)
+        assert sampler.should_log("/api/healthcheck", 200, 1, error=RuntimeError("boom"))
+
+    def test_successful_requests_are_sampled_per_route(self):
+        sampler = self.create_sampler(FakeClock(), random_value=0.05)
+
+        assert sampler.should_log("/api/users/{user_id}", 200, 1)
+        assert not sampler.should_log("/api/healthcheck", 200, 1)
+
+    def test_rate_rises_with_error_rate(self):
+        clock = FakeClock()
+        sampler = self.create_sampler(clock, random_value=0.5)
+
+        for _ in range(19):
+            sampler.should_log("/api/items", 200, 1)
+        assert not sampler.should_log("/api/items", 200, 1)
+
+        # 5% server errors is half the threshold: rate moves halfway from 0.1 to 1.0
+        clock.now = 10
+        for status_code in [500] * 2 + [200] * 38:
+            sampler.should_log("/api/items", status_code, 1)
+        clock.now = 20
+        assert sampler.error_rate == 0.05
+        assert sampler.sample_rate("/api/items") == 0.55
+        assert sampler.should_log("/api/items", 200, 1)
+
+        # Back to normal after a clean window
+        for _ in range(40):
+            sampler.should_log("/api/items", 200, 1)
+        clock.now = 30
+        assert not sampler.should_log("/api/items", 200, 1)
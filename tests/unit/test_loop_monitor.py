@@ -0,0 +1,43 @@
+import asyncio
+import logging
+import time
+
+import pytest
+
+from src.core.profiling.loop_monitor import LoopLagMonitor, event_loop_blocked_total
+
+
+def block_the_loop(seconds: float):
+    time.sleep(seconds)
+
+
+class TestLoopLagMonitor:
+    """Test event loop lag measurement and blocking-call reporting"""
+
+    @pytest.mark.asyncio
+    async def test_blocking_call_is_reported_with_stack(self, caplog):
+        monitor = LoopLagMonitor(interval_ms=10, threshold_ms=30)
+        blocked_before = event_loop_blocked_total.get()
+        with caplog.at_level(logging.WARNING, logger="src.core.profiling.loop_monitor"):
+            monitor.start()
+            try:
+                await asyncio.sleep(0.02)
+                block_the_loop(0.15)
+                await asyncio.sleep(0.03)
+            finally:
+                await monitor.stop()
+
+        blocked = [r.getMessage() for r in caplog.records if "Event loop blocked" in r.getMessage()]
+        assert len(blocked) == 1
+        assert "in block_the_loop" in blocked[0]
+        assert event_loop_blocked_total.get() == blocked_before + 1
+
+    @pytest.mark.asyncio
+    async def test_idle_loop_is_not_reported(self, caplog):
+        monitor = LoopLagMonitor(interval_ms=10, threshold_ms=50)
+        with caplog.at_level(logging.WARNING, logger="src.core.profiling.loop_monitor"):
+            monitor.start()
+            await asyncio.sleep(0.1)
+            await monitor.stop()
+
+        assert not [r for r in caplog.records if "Event loop blocked" in r.getMessage()]
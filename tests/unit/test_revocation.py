@@ -0,0 +1,83 @@
+import time
+
+import pytest
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+from jose import jwt
+
+from src.core.config.settings import settings
+from src.core.dependencies import get_jwt_client
+from src.core.security import (
+    BloomFilter,
+    FileRevocationSource,
+    RevocationList,
+    RevocationRefresher,
+    RevocationSourceFactory
+)
+from src.core.dependencies import jwt as jwt_module
+
+
+class TestBloomFilter:
+    """Test Bloom filter membership guarantees"""
+
+    def test_no_false_negatives_and_bounded_false_positives(self):
+        bloom = BloomFilter(capacity=10000, false_positive_rate=0.01)
+        for i in range(10000):
+            bloom.add(f"revoked-{i}")
+
+        assert all(f"revoked-{i}" in bloom for i in range(10000))
+        false_positives = sum(f"valid-{i}" in bloom for i in range(10000))
+        assert false_positives < 300
+
+
+class TestRevocationList:
+    """Test loading and checking revoked tokens"""
+
+    def test_file_source_without_path_is_rejected(self):
+        with pytest.raises(ValueError):
+            RevocationSourceFactory.create_source(None, jwt_revocation_source="file", jwt_revocation_file=None)
+
+    @pytest.mark.asyncio
+    async def test_file_source_is_refreshed(self, tmp_path):
+        path = tmp_path / "revoked.txt"
+        path.write_text("# revoked tokens\njti-1\n\njti-2  # leaked\n")
+        revocation_list = RevocationList()
+        refresher = RevocationRefresher(revocation_list, FileRevocationSource(str(path)), interval=60)
+
+        await refresher.start()
+        try:
+            assert revocation_list.is_revoked("jti-1")
+            assert revocation_list.is_revoked("jti-2")
+            assert not revocation_list.is_revoked("jti-3")
+
+            path.write_text("jti-3\n")
+            await refresher.refresh()
+            assert revocation_list.is_revoked("jti-3")
+            assert not revocation_list.is_revoked("jti-1")
+
+            # A missing file keeps the last loaded list
+            path.unlink()
+            await refresher.refresh()
+            assert revocation_list.is_revoked("jti-3")
+        finally:
+            await refresher.stop()
+
+    @pytest.mark.asyncio
+    async def test_revoked_token_is_rejected_even_when_cached(self, monkeypatch):
+        revocation_list = RevocationList()
+        monkeypatch.setattr(jwt_module, "revocation_list", revocation_list)
+        monkeypatch.setattr(settings, "jwt_revocation_enabled", True)
+        token = jwt.encode(
+            {"sub": "client", "jti": "token-1", "exp": int(time.time()) + 3600},
+            settings.jwt_secret_key,
+            algorithm=settings.jwt_algorithm
+        )
+        credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+        assert (await get_jwt_client(credentials)).token_id == "token-1"
+
+        revocation_list.replace(["token-1"])
+        with pytest.raises(HTTPException) as exc_info:
+            await get_jwt_client(credentials)
+        assert exc_info.value.status_code == 401
+        assert exc_info.value.detail == "Token revoked"
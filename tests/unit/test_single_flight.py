@@ -0,0 +1,108 @@
+import asyncio
+
+import pytest
+
+from src.core.concurrency import SingleFlight
+from src.core.concurrency.single_flight import single_flight_coalesced_total
+
+
+class Lookup:
+    """Slow lookup counting its executions, released by the test"""
+
+    def __init__(self, result="row"):
+        self.calls = 0
+        self.release = asyncio.Event()
+        self.result = result
+
+    async def __call__(self):
+        self.calls += 1
+        await self.release.wait()
+        if isinstance(self.result, Exception):
+            raise self.result
+        return self.result
+
+
+class TestSingleFlight:
+    """Test coalescing of concurrent identical calls"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_share_one_execution(self):
+        flight = SingleFlight("test-share")
+        lookup = Lookup()
+        coalesced = single_flight_coalesced_total.get("test-share")
+
+        tasks = [asyncio.create_task(flight.do(1, lookup)) for _ in range(5)]
+        await asyncio.sleep(0)
+        lookup.release.set()
+
+        assert await asyncio.gather(*tasks) == ["row"] * 5
+        assert lookup.calls == 1
+        assert single_flight_coalesced_total.get("test-share") == coalesced + 4
+        assert len(flight) == 0
+
+    @pytest.mark.asyncio
+    async def test_error_reaches_every_waiter(self):
+        flight = SingleFlight("test-error")
+        lookup = Lookup(result=RuntimeError("db down"))
+
+        tasks = [asyncio.create_task(flight.do(1, lookup)) for _ in range(3)]
+        await asyncio.sleep(0)
+        lookup.release.set()
+
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        assert all(isinstance(result, RuntimeError) for result in results)
+        assert lookup.calls == 1
+
+    @pytest.mark.asyncio
+    async def test_cancelled_follower_does_not_affect_others(self):
+        flight = SingleFlight("test-follower")
+        lookup = Lookup()
+
+        leader = asyncio.create_task(flight.do(1, lookup))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(flight.do(1, lookup))
+        await asyncio.sleep(0)
+        follower.cancel()
+        lookup.release.set()
+
+        assert await leader == "row"
+        with pytest.raises(asyncio.CancelledError):
+            await follower
+
+    @pytest.mark.asyncio
+    async def test_cancelled_leader_hands_over_to_follower(self):
+        flight = SingleFlight("test-leader")
+        lookup = Lookup()
+
+        leader = asyncio.create_task(flight.do(1, lookup))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(flight.do(1, lookup))
+        await asyncio.sleep(0)
+        leader.cancel()
+        await asyncio.sleep(0)
+        lookup.release.set()
+
+        assert await follower == "row"
+        assert leader.cancelled()
+        assert lookup.calls == 2
+
+    @pytest.mark.asyncio
+    async def test_forgotten_call_is_not_joined(self):
+        flight = SingleFlight("test-forget")
+        old = Lookup(result="old row")
+        new = Lookup(result="new row")
+
+        before = asyncio.create_task(flight.do(1, old))
+        await asyncio.sleep(0)
+        flight.forget(1)
+        after = asyncio.create_task(flight.do(1, new))
+        await asyncio.sleep(0)
+        old.release.set()
+        assert await before == "old row"
+        # The detached call finishing must not remove the new one
+        assert len(flight) == 1
+        new.release.set()
+
+        assert await after == "new row"
+        assert new.calls == 1
+        assert len(flight) == 0